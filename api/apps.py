@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from core.metrics import register_collector
+
+        from . import signals  # noqa: F401
+        from .tokens import token_table_metrics
+
+        register_collector(token_table_metrics)
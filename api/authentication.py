@@ -0,0 +1,63 @@
+"""
+JWT authentication that serves the token's user from the cache.
+
+simplejwt's JWTAuthentication looks the user up by its 32-char string
+primary key on every request. This subclass keeps the resolved User in
+the shared cache for AUTH_USER_CACHE_TTL seconds, so read endpoints
+authenticate without touching the users table. api.signals drops the
+entry whenever the user is saved or deleted, which includes
+deactivation, password changes and profile/score updates. Writes that
+bypass save() (queryset .update()) must call invalidate_auth_user(), or
+they stay invisible until the TTL expires.
+
+Only a cache shared by all workers (core.caching) sees those deletes
+everywhere. With per-process LocMemCache a deactivated user would stay
+authenticated on the other workers, so every request loads the user.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.caching import cache_is_shared
+from core.metrics import observe_cache
+
+AUTH_USER_CACHE_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+
+
+def auth_user_cache_key(user_id) -> str:
+    return f"api:auth:user:{user_id}"
+
+
+def invalidate_auth_user(user_id) -> None:
+    cache.delete(auth_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if not cache_is_shared():
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        key = auth_user_cache_key(user_id)
+        user = cache.get(key)
+        observe_cache("auth_user", hit=user is not None)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, AUTH_USER_CACHE_TTL)
+            return user
+
+        # The cached copy answers the same checks the database lookup would.
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return user
@@ -0,0 +1,114 @@
+"""
+Sub-request dispatch for the /api/v1/batch/ endpoint.
+
+The mobile launch path fetches several endpoints at once. A batch sends
+them as one HTTP request. The JWT is decoded once for the batch, and each
+sub-request reaches its view through DRF's forced-authentication hook
+with the same user instance. The sub-requests also share one memo dict
+(see request_memo), so work a view has already done, such as loading
+the product catalogue, is not repeated within the batch.
+"""
+
+import io
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_REQUESTS = 20
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+BATCH_URL_NAME = "api_batch"
+
+_MEMO_ATTR = "_api_request_memo"
+
+
+def request_memo(request, key, factory):
+    """
+    Per-request memo shared by every sub-request of a batch.
+
+    Outside a batch it lives for the single request.
+    """
+    django_request = getattr(request, "_request", request)
+    memo = getattr(django_request, _MEMO_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(django_request, _MEMO_ATTR, memo)
+    if key not in memo:
+        memo[key] = factory()
+    return memo[key]
+
+
+class BatchError(ValueError):
+    pass
+
+
+def build_subrequest(request, spec, memo) -> tuple[HttpRequest, object]:
+    """Turn one batch entry into a Django request plus its resolved view match."""
+    if not isinstance(spec, dict):
+        raise BatchError("Each entry must be an object.")
+    method = str(spec.get("method", "GET")).upper()
+    if method not in BATCH_METHODS:
+        raise BatchError(f"Unsupported method {method}.")
+    url = urlsplit(str(spec.get("path", "")))
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        raise BatchError("Unknown path.")
+    if not (match.url_name or "").startswith("api_") or match.url_name == BATCH_URL_NAME:
+        raise BatchError("Path is not a batchable API endpoint.")
+
+    body = b""
+    if spec.get("body") is not None:
+        body = json.dumps(spec["body"]).encode("utf-8")
+
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = url.path
+    sub.META = {
+        **request.META,
+        "REQUEST_METHOD": method,
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    sub.GET = QueryDict(url.query)
+    sub._stream = io.BytesIO(body)
+    sub._read_started = False
+    sub.resolver_match = match
+    sub.user = request.user
+    # DRF's Request honours these and skips its authenticators, so the
+    # batch's already-decoded token is reused instead of decoded again.
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    setattr(sub, _MEMO_ATTR, memo)
+    return sub, match
+
+
+def dispatch_subrequest(request, spec, memo) -> dict:
+    try:
+        sub, match = build_subrequest(request, spec, memo)
+    except BatchError as exc:
+        return {"status": 400, "body": {"detail": str(exc)}}
+
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed.", sub.method, sub.path)
+        return {"status": 500, "body": {"detail": "Internal server error."}}
+
+    if hasattr(response, "data"):
+        # DRF response: hand over the data so it is rendered once, in the batch.
+        body = response.data
+    else:
+        if hasattr(response, "render"):
+            response.render()
+        try:
+            body = json.loads(response.content or b"null")
+        except ValueError:
+            body = response.content.decode("utf-8", "replace")
+    return {"status": response.status_code, "body": body}
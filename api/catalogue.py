@@ -0,0 +1,116 @@
+"""
+Process-local product catalogue for the recommendation paths.
+
+The catalogue is a handful of rows that change only through the admin,
+so each worker keeps an in-memory copy. The copy is indexed by type and
+by eligibility thresholds, so a recommendation needs no queries. Product
+post_save/post_delete signals (api.signals) bump a generation counter in
+the cache. Each worker compares that counter with the one it built from,
+and reloads on the next call when they differ.
+
+Only a shared cache (core.caching) carries a bump to the other workers;
+with per-process LocMemCache they never see it. So a copy is also
+reloaded once it is CATALOGUE_MAX_AGE seconds old, which bounds how long
+any worker can serve a changed or deactivated product.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from core.metrics import observe_cache
+from core.models import Product
+
+_GENERATION_KEY = "api:catalogue:generation"
+CATALOGUE_MAX_AGE = 30
+
+_lock = threading.Lock()
+_local = {"generation": None, "catalogue": None, "loaded_at": 0.0}
+
+
+@dataclass(frozen=True)
+class CatalogueProduct:
+    name: str
+    type: str
+    min_score_required: float
+    min_balance_required: float
+
+
+class ProductCatalogue:
+    """Active products indexed for zero-query recommendation lookups."""
+
+    def __init__(self, products):
+        # Name order matches Product.Meta.ordering, which the ORM queries returned.
+        products = sorted(products, key=lambda p: p.name)
+        self.names = {p.name for p in products}
+        self.by_type: dict[str, list[CatalogueProduct]] = {}
+        for product in products:
+            self.by_type.setdefault(product.type, []).append(product)
+
+        # Non-resolution products sorted by thresholds; eligibility is a
+        # bisect on the score threshold plus a balance filter on that prefix.
+        self._eligible = sorted(
+            (p for p in products if p.type != Product.TYPE_RESOLUTION),
+            key=lambda p: (p.min_score_required, p.min_balance_required),
+        )
+        self._eligible_scores = [p.min_score_required for p in self._eligible]
+
+    @classmethod
+    def load(cls) -> "ProductCatalogue":
+        rows = Product.objects.filter(is_active=True).values_list(
+            "name", "type", "min_score_required", "min_balance_required"
+        )
+        return cls(CatalogueProduct(*row) for row in rows)
+
+    def first_of_type(self, product_type: str):
+        products = self.by_type.get(product_type)
+        return products[0] if products else None
+
+    def active_names(self, names) -> list[str]:
+        """The active products among names, in catalogue (name) order."""
+        return sorted(name for name in set(names) if name in self.names)
+
+    def eligible(self, credit_score: float, balance: float, limit: int = 2) -> list[str]:
+        """Names of non-resolution products whose thresholds the profile meets."""
+        end = bisect_right(self._eligible_scores, credit_score)
+        names = sorted(p.name for p in self._eligible[:end] if p.min_balance_required <= balance)
+        return names[:limit]
+
+
+def catalogue_generation() -> int:
+    return cache.get_or_set(_GENERATION_KEY, 1, None)
+
+
+def _fresh(generation) -> bool:
+    return (
+        _local["catalogue"] is not None
+        and _local["generation"] == generation
+        and time.monotonic() - _local["loaded_at"] < CATALOGUE_MAX_AGE
+    )
+
+
+def get_catalogue() -> ProductCatalogue:
+    generation = catalogue_generation()
+    catalogue = _local["catalogue"]
+    if _fresh(generation):
+        observe_cache("catalogue", hit=True)
+        return catalogue
+    observe_cache("catalogue", hit=False)
+    with _lock:
+        if not _fresh(generation):
+            _local["catalogue"] = ProductCatalogue.load()
+            _local["generation"] = generation
+            _local["loaded_at"] = time.monotonic()
+        return _local["catalogue"]
+
+
+def invalidate_catalogue() -> None:
+    """Call after any Product change; every worker reloads on its next lookup."""
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.set(_GENERATION_KEY, 1, None)
+    _local["catalogue"] = None
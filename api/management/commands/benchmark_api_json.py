@@ -0,0 +1,73 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONRenderer
+from api.serializer import ComplaintSerializer, GoalSerializer, NotificationSerializer, ProductSerializer
+from core.models import Complaint, Goal, Notification, Product, User
+
+
+def _rows(rows):
+    """Unsaved model instances shaped like a long-lived account's history."""
+    now = timezone.now()
+    user = User(username="bench")
+    return {
+        "notifications": (NotificationSerializer, [
+            Notification(id=i, target_user=user, title=f"Notification {i}",
+                         message="Your monthly statement is ready to view. " * 3,
+                         is_read=i % 3 == 0, created_at=now, updated_at=now)
+            for i in range(rows)
+        ]),
+        "complaints": (ComplaintSerializer, [
+            Complaint(id=i, user=user, text="The card was declined at checkout twice. " * 4,
+                      category=Complaint.CATEGORY_BILLING, created_at=now, updated_at=now)
+            for i in range(rows)
+        ]),
+        "goals": (GoalSerializer, [
+            Goal(id=i, user=user, title=f"Goal {i}", target_amount=5000.0, current_amount=1234.5 + i,
+                 created_at=now, updated_at=now)
+            for i in range(rows)
+        ]),
+        "products": (ProductSerializer, [
+            Product(id=i, name=f"Product {i}", type=Product.TYPE_CARD,
+                    description="Premium card with travel insurance and cashback. " * 2)
+            for i in range(rows)
+        ]),
+    }
+
+
+def _time(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+class Command(BaseCommand):
+    help = "Benchmark payload size and JSON serialization time for the API list endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20, help="Rows per list payload (default: one page).")
+        parser.add_argument("--repeat", type=int, default=200, help="Timing iterations per measurement.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        backend = "orjson" if renderers.orjson is not None else "stdlib fallback"
+        self.stdout.write(f"{rows} rows x {repeat} iterations; fast renderer: {backend}")
+        self.stdout.write(
+            f"{'endpoint':<14}{'serialize ms':>14}{'stdlib ms':>11}{'fast ms':>9}{'bytes':>9}{'gzip bytes':>12}"
+        )
+
+        for name, (serializer_class, instances) in _rows(rows).items():
+            serialize_ms, data = _time(lambda: serializer_class(instances, many=True).data, repeat)
+            stdlib_ms, body = _time(lambda: stdlib.render(data), repeat)
+            fast_ms, _ = _time(lambda: fast.render(data), repeat)
+            self.stdout.write(
+                f"{name:<14}{serialize_ms:>14.3f}{stdlib_ms:>11.3f}{fast_ms:>9.3f}"
+                f"{len(body):>9}{len(gzip.compress(body, compresslevel=6)):>12}"
+            )
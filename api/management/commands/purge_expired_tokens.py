@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from api.tokens import blacklist_filter, bump_blacklist_generation, token_table_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired simplejwt outstanding/blacklisted tokens in bounded batches. "
+        "Schedule daily (cron or a platform job); each batch is its own short delete."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tokens deleted per batch.")
+        parser.add_argument("--max-batches", type=int, default=0, help="Stop after this many batches (0 = no limit).")
+        parser.add_argument("--stats", action="store_true", help="Only report token table sizes.")
+
+    def _write_stats(self, label, stats):
+        self.stdout.write(
+            f"{label}: outstanding={stats['outstanding']} blacklisted={stats['blacklisted']} expired={stats['expired']}"
+        )
+
+    def handle(self, *args, **options):
+        self._write_stats("Token tables", token_table_stats())
+        if options["stats"]:
+            return
+
+        batch_size = max(1, options["batch_size"])
+        cutoff = timezone.now()
+        batches = deleted = 0
+        while not options["max_batches"] or batches < options["max_batches"]:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lt=cutoff)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            batches += 1
+
+        if deleted:
+            # Purged jtis only cost bloom-filter bits; rebuild compactly.
+            blacklist_filter.reset()
+            bump_blacklist_generation()
+        self._write_stats("After purge", token_table_stats())
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired tokens in {batches} batches."))
@@ -0,0 +1,98 @@
+"""
+Cursor pagination and delta-sync helpers for the mobile list endpoints.
+
+List pages are keyset-paginated newest first, so page N costs the same
+as page 1 however long the history grows. Complaints and goals take an
+``updated_since`` timestamp and page through the rows changed after it.
+Notifications use an opaque sync token over (updated_at, id). The client
+stores the token from its last response and sends it back as ``since``
+to receive only rows created or changed after it.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class ChangesCursorPagination(CursorPagination):
+    """Oldest change first, so an updated_since client can resume from any page."""
+    ordering = ("updated_at", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def parse_updated_since(value: str) -> datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValidationError({"updated_since": "Expected an ISO-8601 timestamp."})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def paginate_history(queryset, request, view, serializer_class):
+    """
+    Cursor-paginated response for a per-user history list.
+
+    ?updated_since=<ISO timestamp> narrows it to rows changed after that
+    instant, served in change order.
+    """
+    updated_since = request.query_params.get("updated_since")
+    if updated_since:
+        queryset = queryset.filter(updated_at__gt=parse_updated_since(updated_since))
+        paginator = ChangesCursorPagination()
+    else:
+        paginator = NewestFirstCursorPagination()
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
+
+def sync_token(updated_at: datetime, pk) -> str:
+    raw = f"{updated_at.isoformat()}|{pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def parse_sync_token(token: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+        stamp, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(stamp), int(pk)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError({"since": "Invalid sync token."})
+
+
+def latest_sync_token(queryset) -> str | None:
+    """Token for the newest change in queryset; a later delta starts from here."""
+    latest = queryset.order_by("-updated_at", "-id").values_list("updated_at", "id").first()
+    return sync_token(*latest) if latest else None
+
+
+def changes_since(queryset, token: str, limit: int) -> tuple[list, str, bool]:
+    """
+    Rows of queryset changed after the sync token, oldest change first.
+
+    Returns (rows, next_token, has_more). When has_more is set the client
+    calls again with next_token straight away; otherwise it keeps
+    next_token for its next sync.
+    """
+    updated_at, pk = parse_sync_token(token)
+    rows = list(
+        queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+        .order_by("updated_at", "id")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_token = sync_token(rows[-1].updated_at, rows[-1].pk) if rows else token
+    return rows, next_token, has_more
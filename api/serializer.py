@@ -20,13 +20,13 @@ class RegisterSerializer(serializers.Serializer):
     def validate_username(self, value):
         if len(value) < 3:
             raise serializers.ValidationError("Username must be at least 3 characters.")
-        if User.objects.filter(username__iexact=value).exists():
+        if User.objects.username_ci(value).exists():
             raise serializers.ValidationError("Username already taken.")
         return value
 
     def validate_email(self, value):
         value = value.lower()
-        if User.objects.filter(email__iexact=value).exists():
+        if User.objects.email_ci(value).exists():
             raise serializers.ValidationError("Email already registered.")
         return value
 
@@ -55,7 +55,7 @@ class LoginSerializer(serializers.Serializer):
         request = self.context.get("request")
 
         # Find user by email
-        user_obj = User.objects.filter(email__iexact=email).first()
+        user_obj = User.objects.email_ci(email).first()
         
         if user_obj is None:
             raise serializers.ValidationError({"detail": "Invalid email or password."})
@@ -100,6 +100,14 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = ["first_name", "last_name", "phone_number", "profile_picture"]
 
+    def update(self, instance, validated_data):
+        # The instance may be the cached request.user: write only the
+        # edited columns so stale copies of the others are not saved back.
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
 
 # ---------------------------------------------------------------------------
 # Complaint
@@ -109,12 +117,13 @@ class ComplaintSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source="get_status_display", read_only=True)
     category_display = serializers.CharField(source="get_category_display", read_only=True)
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Complaint
         fields = [
             "id", "text", "category", "category_display",
-            "status", "status_display", "resolution_note", "created_at",
+            "status", "status_display", "resolution_note", "created_at", "updated_at",
         ]
         read_only_fields = fields
 
@@ -153,10 +162,11 @@ class ProductSerializer(serializers.ModelSerializer):
 
 class NotificationSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Notification
-        fields = ["id", "title", "message", "is_read", "created_at"]
+        fields = ["id", "title", "message", "is_read", "created_at", "updated_at"]
         read_only_fields = fields
 
 
@@ -166,12 +176,13 @@ class NotificationSerializer(serializers.ModelSerializer):
 
 class GoalSerializer(serializers.ModelSerializer):
     progress = serializers.FloatField(read_only=True)
-    created_at = serializers.DateField(format="%Y-%m-%d", read_only=True)
+    created_at = serializers.DateTimeField(format="%Y-%m-%d", read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Goal
-        fields = ["id", "title", "target_amount", "current_amount", "progress", "is_completed", "created_at"]
-        read_only_fields = ["id", "progress", "is_completed", "created_at"]
+        fields = ["id", "title", "target_amount", "current_amount", "progress", "is_completed", "created_at", "updated_at"]
+        read_only_fields = ["id", "progress", "is_completed", "created_at", "updated_at"]
 
     def validate_target_amount(self, value):
         if value <= 0:
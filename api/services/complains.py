@@ -8,6 +8,8 @@ Business logic for complaint handling:
 
 import logging
 
+from core.classifier import KeywordClassifier
+
 from ..model import Complaint, InteractionLog
 
 logger = logging.getLogger(__name__)
@@ -35,6 +37,10 @@ _CATEGORY_KEYWORDS: list[tuple[str, list[str]]] = [
     (Complaint.CATEGORY_SERVICE,   ["service", "delay", "support", "agent", "response"]),
 ]
 
+_CLASSIFIER = KeywordClassifier(
+    _POSITIVE_WORDS, _NEGATIVE_WORDS, _CATEGORY_KEYWORDS, Complaint.CATEGORY_SUPPORT, strip_chars=".,!?;:",
+)
+
 
 # ---------------------------------------------------------------------------
 # Sentiment analysis
@@ -47,18 +53,12 @@ def run_sentiment_analysis(complaint: Complaint) -> float:
     Returns the computed sentiment score (positive > 0, negative < 0).
     Called automatically by the post_save signal on new complaints.
     """
-    words = [w.strip(".,!?;:").lower() for w in complaint.text.split()]
-
-    if not words:
+    if not complaint.text.split():
         complaint.sentiment_score = 0.0
         complaint.save(update_fields=["sentiment_score", "updated_at"])
         return 0.0
 
-    positive = sum(1 for w in words if w in _POSITIVE_WORDS)
-    negative = sum(1 for w in words if w in _NEGATIVE_WORDS)
-    score = round((positive - negative) / len(words), 4)
-
-    category = _classify_category(complaint.text)
+    score, category = _CLASSIFIER.classify(complaint.text)
 
     complaint.sentiment_score = score
     complaint.category = category
@@ -71,15 +71,6 @@ def run_sentiment_analysis(complaint: Complaint) -> float:
     return score
 
 
-def _classify_category(text: str) -> str:
-    """Return the best-matching category for the given complaint text."""
-    text_lower = text.lower()
-    for category, keywords in _CATEGORY_KEYWORDS:
-        if any(kw in text_lower for kw in keywords):
-            return category
-    return Complaint.CATEGORY_SUPPORT
-
-
 # ---------------------------------------------------------------------------
 # Resolution
 # ---------------------------------------------------------------------------
@@ -6,6 +6,7 @@ Called from the admin dashboard or a management command — never from the API.
 """
 
 import csv
+import gzip
 import logging
 from pathlib import Path
 
@@ -14,6 +15,7 @@ from ..model import InteractionLog
 logger = logging.getLogger(__name__)
 
 _DEFAULT_EXPORT_FILENAME = "ml_training_export.csv"
+_EXPORT_CHUNK_SIZE = 2000
 
 _CSV_HEADERS = [
     "user_id",
@@ -33,7 +35,8 @@ def generate_training_data(output_path: str | None = None) -> str:
     Export all InteractionLog rows to a CSV file for ML retraining.
 
     Args:
-        output_path: Absolute path for the output file.
+        output_path: Absolute path for the output file. A ".gz" suffix
+                     writes gzip-compressed CSV.
                      Defaults to <services_dir>/ml_training_export.csv.
 
     Returns:
@@ -45,10 +48,13 @@ def generate_training_data(output_path: str | None = None) -> str:
     rows = (
         InteractionLog.objects
         .select_related("user", "user__profile", "product", "complaint")
-        .all()
+        .order_by("pk")
+        .iterator(chunk_size=_EXPORT_CHUNK_SIZE)
     )
 
-    with export_path.open("w", newline="", encoding="utf-8") as handle:
+    opener = gzip.open if export_path.suffix == ".gz" else open
+    written = 0
+    with opener(export_path, "wt", newline="", encoding="utf-8") as handle:
         writer = csv.writer(handle)
         writer.writerow(_CSV_HEADERS)
 
@@ -65,6 +71,7 @@ def generate_training_data(output_path: str | None = None) -> str:
                 row.complaint.category if row.complaint else "",
                 row.created_at.isoformat(),
             ])
+            written += 1
 
-    logger.info("Training data exported to %s (%d rows).", export_path, rows.count())
+    logger.info("Training data exported to %s (%d rows).", export_path, written)
     return str(export_path)
\ No newline at end of file
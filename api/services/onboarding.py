@@ -16,7 +16,8 @@ def ensure_seed_products() -> None:
     """
     Idempotently create the default product catalogue.
     Safe to call multiple times — uses get_or_create under the hood.
-    Called at startup and before any recommendation run.
+    Deployments are seeded by core migration 0003_seed_product_catalogue;
+    this is for restoring the defaults by hand, never the request path.
     """
     defaults = [
         {
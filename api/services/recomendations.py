@@ -11,8 +11,8 @@ Rules (in priority order):
   4. Otherwise → any eligible product that meets score/balance thresholds.
 """
 
+from ..catalogue import get_catalogue
 from ..model import Product, User, UserProfile
-from core.services.onboarding import ensure_seed_products
 
 
 def recommend_for_user(user: User, risk: dict) -> dict:
@@ -30,18 +30,15 @@ def recommend_for_user(user: User, risk: dict) -> dict:
             "suggested_products": [...product names...],
         }
     """
-    ensure_seed_products()
-
     active_resolutions: list[str] = []
     suggested_products: list[str] = []
+    catalogue = get_catalogue()
 
     # ------------------------------------------------------------------
     # Rule 1 — complaint resolution takes priority over everything else
     # ------------------------------------------------------------------
     if user.has_active_complaint:
-        resolution = (
-            Product.objects.filter(type=Product.TYPE_RESOLUTION, is_active=True).first()
-        )
+        resolution = catalogue.first_of_type(Product.TYPE_RESOLUTION)
         if resolution:
             active_resolutions.append(resolution.name)
         return {
@@ -59,30 +56,20 @@ def recommend_for_user(user: User, risk: dict) -> dict:
     # ------------------------------------------------------------------
     if probability > 70 and high_balance:
         names = ["Gold Card Upgrade", "VIP Savings Bonus"]
-        suggested_products.extend(_fetch_by_names(names))
+        suggested_products.extend(_fetch_by_names(catalogue, names))
 
     # ------------------------------------------------------------------
     # Rule 3 — low churn risk + high credit → growth products
     # ------------------------------------------------------------------
     elif probability < 30 and high_credit:
         names = ["Personal Loan", "Investment Portfolio"]
-        suggested_products.extend(_fetch_by_names(names))
+        suggested_products.extend(_fetch_by_names(catalogue, names))
 
     # ------------------------------------------------------------------
     # Rule 4 — general eligibility match
     # ------------------------------------------------------------------
     else:
-        suggested_products.extend(
-            list(
-                Product.objects.filter(
-                    is_active=True,
-                    min_score_required__lte=profile.credit_score,
-                    min_balance_required__lte=profile.balance,
-                )
-                .exclude(type=Product.TYPE_RESOLUTION)
-                .values_list("name", flat=True)[:2]
-            )
-        )
+        suggested_products.extend(catalogue.eligible(profile.credit_score, profile.balance))
 
     return {
         "active_resolutions": active_resolutions,
@@ -99,12 +86,7 @@ def _get_profile(user: User) -> UserProfile:
     return profile
 
 
-def _fetch_by_names(names: list[str]) -> list[str]:
+def _fetch_by_names(catalogue, names: list[str]) -> list[str]:
     """Return active product names from a priority list, preserving order."""
-    products = (
-        Product.objects.filter(name__in=names, is_active=True)
-        .values_list("name", flat=True)
-    )
-    # Preserve the priority order defined in names
-    found = set(products)
+    found = set(catalogue.active_names(names))
     return [n for n in names if n in found]
\ No newline at end of file
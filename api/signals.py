@@ -0,0 +1,33 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from core.models import Product, User
+
+from .authentication import invalidate_auth_user
+from .catalogue import invalidate_catalogue
+from .tokens import bump_blacklist_generation
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    invalidate_catalogue()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_auth_user(instance.pk)
+    # Again after commit: a request in between may have cached the old row.
+    transaction.on_commit(partial(invalidate_auth_user, instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        # After commit, so no worker re-syncs before the row is visible.
+        transaction.on_commit(bump_blacklist_generation)
@@ -1,3 +1,580 @@
-from django.test import TestCase
+import io
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Complaint, Goal, Notification, Product, User
+from core.testing import shared_cache, upload_csv
+from customers import ml_service
+from customers.models import Customer
+from dashboard.rollup import rebuild_rollup
+from data_manager.models import UploadHistory
+
+from .authentication import CachedJWTAuthentication
+from .batch import BATCH_MAX_REQUESTS
+from .catalogue import CATALOGUE_MAX_AGE, get_catalogue, invalidate_catalogue
+from .renderers import FastJSONParser, FastJSONRenderer
+from .tokens import BLACKLIST_FILTER_MAX_AGE, BlacklistFilter, FilteredRefreshToken, blacklist_filter
+from .views import get_recommendations, get_tokens, refresh_scores, score_fingerprint
+
+
+class RecommendationQueryCountTests(TestCase):
+    """The recommendation hot path must never seed or re-read the catalogue."""
+
+    def setUp(self):
+        invalidate_catalogue()
+        self.user = User(username="rec", balance=9_000.0, credit_score=680.0)
+
+    def test_catalogue_is_seeded_by_migration(self):
+        self.assertEqual(Product.objects.count(), 5)
+
+    def test_warm_recommendation_runs_no_queries(self):
+        get_recommendations(self.user, {"probability": 50.0})
+        for probability in (10.0, 50.0, 90.0):
+            with self.assertNumQueries(0):
+                get_recommendations(self.user, {"probability": probability})
+
+    def test_cold_recommendation_loads_catalogue_once(self):
+        with self.assertNumQueries(1):
+            get_recommendations(self.user, {"probability": 50.0})
+
+    def test_product_change_reloads_catalogue(self):
+        get_recommendations(self.user, {"probability": 50.0})
+        Product.objects.filter(name="Gold Card Upgrade").get().delete()
+        with self.assertNumQueries(1):
+            result = get_recommendations(self.user, {"probability": 90.0})
+        self.assertEqual(result["suggested_products"], ["VIP Savings Bonus"])
+
+    def test_unsignalled_change_is_picked_up_after_max_age(self):
+        get_recommendations(self.user, {"probability": 50.0})
+        # .update() fires no signal, like a bump lost in another worker's LocMemCache.
+        Product.objects.filter(name="Gold Card Upgrade").update(is_active=False)
+        self.assertIn("Gold Card Upgrade", get_catalogue().names)
+        later = time.monotonic() + CATALOGUE_MAX_AGE
+        with mock.patch("api.catalogue.time.monotonic", return_value=later):
+            self.assertNotIn("Gold Card Upgrade", get_catalogue().names)
+
+
+SMALL_DATA, LARGE_DATA = 3, 12
+
+# Queries per request at LARGE_DATA, measured with a shared cache (as
+# with REDIS_URL) after a warm-up request, so cached pages count their
+# steady state. Routes not listed must run no queries at all. Raise a
+# budget only together with the change that needs it.
+QUERY_BUDGETS = {
+    "logout_page": 4,
+    "metrics": 7,
+    "dashboard_page": 5,
+    "engagement_hub_page": 4,
+    "risk_level_page": 3,
+    "risk_level_export": 4,
+    "data_management_page": 3,
+    "data_management_upload": 33,
+    "training_data_export": 3,
+    "model_insight_page": 7,
+    "profile_page": 4,
+    "settings_page": 4,
+    "dashboard_search": 2,
+    "dashboard_chart": 6,
+    "clear_dataset": 8,
+    "api_register": 6,
+    "api_login": 3,
+    "api_logout": 8,
+    "api_token_refresh": 13,
+    "api_dashboard": 1,
+    "api_complaints": 1,
+    "api_complaint_detail": 1,
+    "api_products": 1,
+    "api_product_detail": 1,
+    "api_notifications": 3,
+    "api_notification_read": 3,
+    "api_notifications_read_all": 2,
+    "api_goals": 1,
+    "api_goal_detail": 1,
+    "api_survey_submit": 2,
+    "api_batch": 4,
+}
+
+
+def _named_routes(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == "admin":
+                continue
+            yield from _named_routes(pattern.url_patterns, pattern.namespace or namespace)
+        elif pattern.name:
+            yield pattern.name
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    STORAGES={**settings.STORAGES, "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}},
+)
+class ViewQueryCountTests(TestCase):
+    """
+    Every named route runs at two data sizes. Its query count must not
+    grow with the data (that would be an N+1 or per-row write) and must
+    stay within QUERY_BUDGETS. Queries on every database the test uses
+    count, so routed reads are included.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.enterContext(shared_cache())
+
+    def _seed(self, size: int) -> dict:
+        customers = []
+        for i in range(size):
+            customer = Customer(
+                customer_id=100 + i, surname=f"Smith{i}", credit_score=600 + i, geography="France",
+                gender="Male", age=30 + i, tenure=i % 3, balance=1000.0 * i, num_of_products=1 + i % 3,
+                has_cr_card=1, is_active_member=i % 2, churn_risk_score=(15.0, 55.0, 85.0)[i % 3],
+                churn_label=i % 2,
+            )
+            customer.refresh_search_keys()
+            customers.append(customer)
+        Customer.objects.bulk_create(customers)
+        rebuild_rollup()
+
+        staff = User.objects.create_user(
+            username="staff", email="staff@example.com", password="pw", is_staff=True, user_type=User.USER_TYPE_PRO
+        )
+        member = User.objects.create_user(
+            username="member", email="member@example.com", password="pw", balance=5000.0, credit_score=700.0
+        )
+        for i in range(size):
+            UploadHistory.objects.create(file_name=f"f{i}.csv", row_count=i, uploaded_by=staff)
+            Product.objects.create(name=f"Extra {i}", type=Product.TYPE_BONUS)
+            other = User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="pw")
+            Complaint.objects.create(user=other, text="other user's complaint")
+        complaints = Complaint.objects.bulk_create(
+            Complaint(user=member, text=f"the app crashed {i}") for i in range(size)
+        )
+        notifications = Notification.objects.bulk_create(
+            Notification(target_user=member, title=f"n{i}", message="m") for i in range(size)
+        )
+        goals = Goal.objects.bulk_create(Goal(user=member, title=f"g{i}", target_amount=100.0) for i in range(size))
+        return {
+            "size": size,
+            "staff": staff,
+            "member": member,
+            "tokens": get_tokens(member),
+            "complaint": complaints[0].pk,
+            "notification": notifications[0].pk,
+            "goal": goals[0].pk,
+            "product": Product.objects.first().pk,
+        }
+
+    def _scenarios(self, data: dict) -> dict:
+        """url name -> (client kind, method, path, payload); safe methods get a warm-up call."""
+        web, anon, api = "web", "anon", "api"
+        refresh = data["tokens"]["refresh"]
+        batch = {"requests": [{"path": reverse("api_me")}, {"path": reverse("api_dashboard")}, {"path": reverse("api_products")}]}
+        return {
+            "landing": (anon, "get", reverse("landing"), None),
+            "login_page": (anon, "get", reverse("login_page"), None),
+            "register_page": (anon, "get", reverse("register_page"), None),
+            "logout_page": (web, "post", reverse("logout_page"), None),
+            "metrics": (web, "get", reverse("metrics"), None),
+            "dashboard_page": (web, "get", reverse("dashboard_page"), None),
+            "engagement_hub_page": (web, "get", reverse("engagement_hub_page"), None),
+            "risk_level_page": (web, "get", reverse("risk_level_page"), None),
+            "data_management_page": (web, "get", reverse("data_management_page"), None),
+            "data_management_upload": (
+                web, "post", reverse("data_management_upload"),
+                lambda: {"file": SimpleUploadedFile("upload.csv", upload_csv(data["size"]), content_type="text/csv")},
+            ),
+            "training_data_export": (web, "get", reverse("training_data_export"), None),
+            "risk_level_export": (web, "get", reverse("risk_level_export") + "?risk_level=high&q=smith", None),
+            "model_insight_page": (web, "get", reverse("model_insight_page"), None),
+            "profile_page": (web, "get", reverse("profile_page"), None),
+            "settings_page": (web, "get", reverse("settings_page"), None),
+            "dashboard_search": (web, "get", reverse("dashboard_search") + "?q=smith", None),
+            "dashboard_chart": (web, "get", reverse("dashboard_chart", args=["bar"]), None),
+            "clear_dataset": (web, "post", reverse("clear_dataset"), None),
+            "api_register": (api, "post", reverse("api_register"), {
+                "first_name": "New", "last_name": "User", "username": "newuser", "email": "new@example.com",
+                "password": "Str0ng-pass!", "confirm_password": "Str0ng-pass!",
+            }),
+            "api_login": (anon, "post", reverse("api_login"), {"email": "member@example.com", "password": "pw"}),
+            "api_logout": (api, "post", reverse("api_logout"), {"refresh": refresh}),
+            "api_token_refresh": (anon, "post", reverse("api_token_refresh"), {"refresh": refresh}),
+            "api_me": (api, "get", reverse("api_me"), None),
+            "api_dashboard": (api, "get", reverse("api_dashboard"), None),
+            "api_complaints": (api, "get", reverse("api_complaints"), None),
+            "api_complaint_detail": (api, "get", reverse("api_complaint_detail", args=[data["complaint"]]), None),
+            "api_products": (api, "get", reverse("api_products"), None),
+            "api_product_detail": (api, "get", reverse("api_product_detail", args=[data["product"]]), None),
+            "api_notifications": (api, "get", reverse("api_notifications"), None),
+            "api_notification_read": (api, "patch", reverse("api_notification_read", args=[data["notification"]]), None),
+            "api_notifications_read_all": (api, "post", reverse("api_notifications_read_all"), None),
+            "api_goals": (api, "get", reverse("api_goals"), None),
+            "api_goal_detail": (api, "get", reverse("api_goal_detail", args=[data["goal"]]), None),
+            "api_survey_submit": (api, "post", reverse("api_survey_submit"), {"rating": 4, "feedback": "ok"}),
+            "api_batch": (api, "post", reverse("api_batch"), batch),
+        }
+
+    def _client(self, kind: str, data: dict):
+        if kind == "web":
+            client = Client()
+            client.force_login(data["staff"])
+            return client
+        client = APIClient()
+        if kind == "api":
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['tokens']['access']}")
+        return client
+
+    def _reset_caches(self):
+        cache.clear()
+        invalidate_catalogue()
+        blacklist_filter.reset()
+
+    def _measure(self, size: int) -> dict:
+        counts = {}
+        with transaction.atomic():
+            data = self._seed(size)
+            for name, (kind, method, path, payload) in self._scenarios(data).items():
+                with transaction.atomic():
+                    self._reset_caches()
+                    client = self._client(kind, data)
+                    call = getattr(client, method)
+                    kwargs = {"format": "json"} if kind != "web" and payload is not None else {}
+                    if method == "get":
+                        call(path)
+                    with ExitStack() as stack:
+                        captured = [
+                            stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in self.databases
+                        ]
+                        response = call(path, payload() if callable(payload) else payload, **kwargs)
+                        if response.streaming:
+                            b"".join(response.streaming_content)
+                    self.assertLess(response.status_code, 400, f"{name}: {response.status_code}")
+                    counts[name] = sum(len(queries) for queries in captured)
+                    transaction.set_rollback(True)
+            transaction.set_rollback(True)
+        self._reset_caches()
+        return counts
+
+    def test_every_route_has_a_scenario(self):
+        routes = set(_named_routes(get_resolver().url_patterns))
+        self.assertEqual(routes - set(self._scenarios(self._seed(1))), set())
+
+    def test_query_counts_are_flat_and_within_budget(self):
+        small, large = self._measure(SMALL_DATA), self._measure(LARGE_DATA)
+        for name, count in large.items():
+            with self.subTest(name):
+                self.assertEqual(count, small[name], f"{name}: queries grow with data ({small[name]} -> {count})")
+                self.assertLessEqual(count, QUERY_BUDGETS.get(name, 0), f"{name}: over budget")
+
+
+class BlacklistFilterTests(TestCase):
+    """A refresh token blacklisted by one worker must be rejected by every other worker."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        blacklist_filter.reset()
+        self.addCleanup(blacklist_filter.reset)
+
+    def _blacklist_elsewhere(self) -> RefreshToken:
+        # TestCase never runs on_commit hooks, so the generation bump is
+        # lost, as a bump made in another worker's LocMemCache would be.
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        return token
+
+    def test_process_local_cache_checks_the_database(self):
+        self.assertFalse(blacklist_filter.might_contain("warm-up"))
+        token = self._blacklist_elsewhere()
+        with self.assertRaises(TokenError):
+            FilteredRefreshToken(str(token))
+        response = APIClient().post(reverse("api_token_refresh"), {"refresh": str(token)}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("access", response.json())
+
+    def test_shared_generation_bump_reaches_a_separately_built_filter(self):
+        self.enterContext(shared_cache())
+        other_worker = BlacklistFilter()
+        self.assertFalse(other_worker.might_contain("warm-up"))
+        token = RefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+        self.assertTrue(other_worker.might_contain(token[api_settings.JTI_CLAIM]))
+        with self.assertRaises(TokenError):
+            FilteredRefreshToken(str(token))
+
+    def test_filter_resyncs_after_max_age_without_a_bump(self):
+        self.enterContext(shared_cache())
+        other_worker = BlacklistFilter()
+        self.assertFalse(other_worker.might_contain("warm-up"))
+        jti = self._blacklist_elsewhere()[api_settings.JTI_CLAIM]
+        self.assertFalse(other_worker.might_contain(jti))
+        later = time.monotonic() + BLACKLIST_FILTER_MAX_AGE
+        with mock.patch("api.tokens.time.monotonic", return_value=later):
+            self.assertTrue(other_worker.might_contain(jti))
+
+
+class CachedUserAuthenticationTests(TestCase):
+    """Deactivation and password changes must reach every worker at once."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password="old-password")
+        cache.delete(f"api:auth:user:{self.user.pk}")
+
+    def _client(self) -> APIClient:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)['access']}")
+        return client
+
+    def test_process_local_cache_reads_the_user_every_request(self):
+        client = self._client()
+        self.assertEqual(client.get(reverse("api_me")).status_code, 200)
+        self.assertIsNone(cache.get(f"api:auth:user:{self.user.pk}"))
+        # .update() fires no signal, like a save on another worker.
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(client.get(reverse("api_me")).status_code, 401)
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.enterContext(shared_cache())
+        client = self._client()
+        self.assertEqual(client.get(reverse("api_me")).status_code, 200)
+        self.assertIsNotNone(cache.get(f"api:auth:user:{self.user.pk}"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(client.get(reverse("api_me")).status_code, 401)
+
+    def test_password_change_revokes_access_tokens_immediately(self):
+        self.enterContext(shared_cache())
+        # override_settings rebinds simplejwt's api_settings, which modules
+        # that imported it never see, so patch the live object instead.
+        with mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True, create=True):
+            client = self._client()
+            self.assertEqual(client.get(reverse("api_me")).status_code, 200)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.set_password("new-password")
+                self.user.save()
+            self.assertEqual(client.get(reverse("api_me")).status_code, 401)
+
+    def test_profile_update_keeps_columns_changed_elsewhere(self):
+        self.enterContext(shared_cache())
+        client = self._client()
+        self.assertEqual(client.get(reverse("api_me")).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(balance=1234)
+        response = client.patch(reverse("api_me"), {"first_name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.first_name, self.user.balance), ("Renamed", 1234))
+
+
+class NotificationSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        other = User.objects.create_user(username="other", password=None)
+        Notification.objects.create(target_user=other, title="Not yours", message="-")
+        self.ids = [
+            Notification.objects.create(target_user=self.user, title=f"N{i}", message="-").pk for i in range(5)
+        ]
+        # Tied timestamps: page boundaries must fall back to the id.
+        Notification.objects.filter(pk__in=self.ids[1:4]).update(created_at=timezone.now())
+
+    def _get(self, query: str = "", url: str = None) -> dict:
+        response = self.client.get(url or reverse("api_notifications") + query)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_pages_cover_the_history_once(self):
+        body = self._get("?page_size=2")
+        self.assertEqual(body["unread_count"], 5)
+        seen = [row["id"] for row in body["results"]]
+        while body["next"]:
+            body = self._get(url=body["next"])
+            self.assertLessEqual(len(body["results"]), 2)
+            seen += [row["id"] for row in body["results"]]
+        expected = Notification.objects.filter(target_user=self.user).order_by("-created_at", "-id")
+        self.assertEqual(seen, list(expected.values_list("pk", flat=True)))
+
+    def test_page_size_is_capped(self):
+        Notification.objects.bulk_create(
+            Notification(target_user=self.user, title=f"Bulk {i}", message="-") for i in range(110)
+        )
+        self.assertEqual(len(self._get("?page_size=1000")["results"]), 100)
+
+    def test_since_returns_changes_after_the_token_in_pages(self):
+        token = self._get()["next_since"]
+        self.assertEqual(self._get(f"?since={token}")["results"], [])
+        self.client.patch(reverse("api_notification_read", args=[self.ids[0]]))
+        new = Notification.objects.create(target_user=self.user, title="New", message="-")
+
+        body = self._get(f"?since={token}&page_size=1")
+        self.assertEqual(([row["id"] for row in body["results"]], body["has_more"]), ([self.ids[0]], True))
+        self.assertTrue(body["results"][0]["is_read"])
+        body = self._get(f"?since={body['next_since']}&page_size=1")
+        self.assertEqual(([row["id"] for row in body["results"]], body["has_more"]), ([new.pk], False))
+        caught_up = self._get(f"?since={body['next_since']}")
+        self.assertEqual((caught_up["results"], caught_up["next_since"]), ([], body["next_since"]))
+
+    def test_invalid_since_token_is_rejected(self):
+        response = self.client.get(reverse("api_notifications") + "?since=not-a-token")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.json())
+
+    def test_mark_all_read_touches_only_the_users_unread_rows(self):
+        self.client.patch(reverse("api_notification_read", args=[self.ids[0]]))
+        response = self.client.post(reverse("api_notifications_read_all"))
+        self.assertEqual(response.json()["updated"], 4)
+        self.assertEqual(self._get()["unread_count"], 0)
+        self.assertTrue(Notification.objects.filter(target_user__username="other", is_read=False).exists())
+
+
+class HistoryPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        other = User.objects.create_user(username="other", password=None)
+        Goal.objects.create(user=other, title="Not yours")
+        self.goals = [Goal.objects.create(user=self.user, title=f"Goal {i}").pk for i in range(5)]
+        self.cutoff = timezone.now() - timedelta(hours=1)
+        Goal.objects.filter(pk__in=self.goals).update(updated_at=self.cutoff - timedelta(hours=1))
+
+    def _ids(self, name: str, **params) -> list:
+        response = self.client.get(reverse(name) + "?" + urlencode(params))
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_goal_pages_are_newest_first_and_scoped_to_the_user(self):
+        response = self.client.get(reverse("api_goals") + "?page_size=3")
+        body = response.json()
+        self.assertEqual([row["id"] for row in body["results"]], self.goals[:1:-1])
+        body = self.client.get(body["next"]).json()
+        self.assertEqual(([row["id"] for row in body["results"]], body["next"]), (self.goals[1::-1], None))
+
+    def test_updated_since_returns_changed_rows_in_change_order(self):
+        for pk in (self.goals[3], self.goals[1]):
+            response = self.client.patch(reverse("api_goal_detail", args=[pk]), {"title": "Renamed"}, format="json")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._ids("api_goals", updated_since=self.cutoff.isoformat()), [self.goals[3], self.goals[1]])
+        # A naive timestamp is read in the current time zone.
+        naive = timezone.make_naive(self.cutoff).isoformat()
+        self.assertEqual(self._ids("api_goals", updated_since=naive), [self.goals[3], self.goals[1]])
+
+    def test_complaints_delta_sync(self):
+        old = Complaint.objects.create(user=self.user, text="Card blocked")
+        Complaint.objects.filter(pk=old.pk).update(updated_at=self.cutoff - timedelta(hours=1))
+        new = Complaint.objects.create(user=self.user, text="App crashes")
+        self.assertEqual(self._ids("api_complaints"), [new.pk, old.pk])
+        self.assertEqual(self._ids("api_complaints", updated_since=self.cutoff.isoformat()), [new.pk])
+
+    def test_invalid_updated_since_is_rejected(self):
+        response = self.client.get(reverse("api_goals") + "?updated_since=yesterday")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("updated_since", response.json())
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)['access']}")
+
+    def _batch(self, *specs, client=None):
+        return (client or self.client).post(reverse("api_batch"), {"requests": list(specs)}, format="json")
+
+    def test_batch_requires_authentication(self):
+        response = self._batch({"path": reverse("api_me")}, client=APIClient())
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_is_authenticated_once_for_every_sub_request(self):
+        with mock.patch(
+            "api.authentication.CachedJWTAuthentication.authenticate",
+            autospec=True, side_effect=CachedJWTAuthentication.authenticate,
+        ) as authenticate:
+            response = self._batch(
+                {"path": reverse("api_me")},
+                {"method": "POST", "path": reverse("api_goals"), "body": {"title": "Car", "target_amount": 10}},
+                {"path": reverse("api_goals")},
+            )
+        self.assertEqual(authenticate.call_count, 1)
+        me, created, goals = response.json()["responses"]
+        self.assertEqual((me["status"], me["body"]["username"]), (200, "member"))
+        self.assertEqual(created["status"], 201)
+        self.assertEqual(Goal.objects.get(title="Car").user, self.user)
+        self.assertEqual([goal["title"] for goal in goals["body"]["results"]], ["Car"])
+
+    def test_failing_entries_do_not_stop_the_rest(self):
+        other = Goal.objects.create(user=User.objects.create_user(username="other", password=None), title="Other")
+        with mock.patch("api.views.MeView.get", side_effect=RuntimeError("boom")), \
+                self.assertLogs("api.batch", "ERROR"):
+            response = self._batch(
+                {"path": reverse("api_me")},
+                {"path": "/api/v1/nowhere/"},
+                {"path": reverse("dashboard_page")},
+                {"method": "POST", "path": reverse("api_batch"), "body": {"requests": []}},
+                {"method": "TRACE", "path": reverse("api_goals")},
+                {"path": reverse("api_goal_detail", args=[other.pk])},
+                {"path": reverse("api_notifications")},
+            )
+        self.assertEqual(response.status_code, 200)
+        statuses = [entry["status"] for entry in response.json()["responses"]]
+        self.assertEqual(statuses, [500, 400, 400, 400, 400, 404, 200])
+
+    def test_batch_size_is_bounded(self):
+        self.assertEqual(self._batch().status_code, 400)
+        too_many = [{"path": reverse("api_me")}] * (BATCH_MAX_REQUESTS + 1)
+        self.assertEqual(self._batch(*too_many).status_code, 400)
+
+
+class JSONRenderingTests(TestCase):
+    payload = {
+        "amount": Decimal("12.50"),
+        "at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        "label": gettext_lazy("Not found."),
+        "counts": {1: "one"},
+        "rows": [{"id": 1, "ok": True, "note": None}],
+    }
+
+    def _round_trip(self) -> tuple:
+        rendered = FastJSONRenderer().render(self.payload, "application/json")
+        return rendered, FastJSONParser().parse(io.BytesIO(rendered))
+
+    def test_round_trip_matches_the_stock_classes(self):
+        expected = JSONParser().parse(io.BytesIO(JSONRenderer().render(self.payload, "application/json")))
+        rendered, parsed = self._round_trip()
+        self.assertEqual(parsed, expected)
+        self.assertIn(b'"2026-01-02T03:04:05Z"', rendered)
+        with mock.patch("api.renderers.orjson", None):
+            self.assertEqual(self._round_trip()[1], expected)
+
+    def test_malformed_body_is_a_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"a": '))
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="member", password=None))
+        response = client.post(reverse("api_goals"), b'{"title": ', content_type="application/json")
+        self.assertEqual(response.status_code, 400)
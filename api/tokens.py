@@ -0,0 +1,177 @@
+"""
+Refresh-token blacklist checks served from an in-memory bloom filter.
+
+With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION enabled, every
+refresh checks simplejwt's blacklist with a join across two tables that
+only grow. Each worker instead keeps a bloom filter of blacklisted jtis.
+A "not present" answer is definitive and costs no query. A "maybe
+present" answer is confirmed against the database, which happens for
+actually-revoked tokens and rare false positives.
+
+The filter follows new blacklist rows by primary key. It re-syncs when
+the generation counter moves, which api.signals bumps after each
+blacklist insert commits, and at least every BLACKLIST_FILTER_MAX_AGE
+seconds in case a bump was lost (e.g. a cache restart). A miss is only
+final if every worker sees the bumps, so the filter is used only with a
+shared cache (core.caching); with per-process LocMemCache every refresh
+checks the database. purge_expired_tokens keeps the tables bounded.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.caching import cache_is_shared
+
+_GENERATION_KEY = "api:jwt:blacklist:generation"
+
+BLACKLIST_FILTER_CAPACITY = 100_000
+BLACKLIST_FILTER_ERROR_RATE = 0.01
+BLACKLIST_FILTER_MAX_AGE = 30
+# Concurrent inserts can commit out of id order, so each sync re-reads a
+# short stretch below the watermark; re-adding a jti is harmless.
+_WATERMARK_OVERLAP = 256
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class BlacklistFilter:
+    """Process-local view of the token blacklist, refreshed by generation."""
+
+    def __init__(self, capacity: int = BLACKLIST_FILTER_CAPACITY):
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._bloom = None
+        self._generation = None
+        self._watermark = 0
+        self._loaded = 0
+        self._synced_at = 0.0
+
+    def _load_rows(self, bloom, watermark: int) -> tuple[int, int]:
+        """Add rows past watermark to bloom; returns (new watermark, new rows)."""
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=max(0, watermark - _WATERMARK_OVERLAP))
+            .order_by("id")
+            .values_list("id", "token__jti")
+            .iterator(chunk_size=2000)
+        )
+        added, high = 0, watermark
+        for pk, jti in rows:
+            bloom.add(jti)
+            if pk > watermark:
+                added += 1
+            high = max(high, pk)
+        return high, added
+
+    def _fresh(self, generation) -> bool:
+        return (
+            self._bloom is not None
+            and self._generation == generation
+            and time.monotonic() - self._synced_at < BLACKLIST_FILTER_MAX_AGE
+        )
+
+    def _sync(self) -> None:
+        generation = cache.get_or_set(_GENERATION_KEY, 1, None)
+        if self._fresh(generation):
+            return
+        with self._lock:
+            if self._fresh(generation):
+                return
+            bloom, watermark, loaded = self._bloom, self._watermark, self._loaded
+            if bloom is None:
+                bloom, watermark, loaded = BloomFilter(self._capacity, BLACKLIST_FILTER_ERROR_RATE), 0, 0
+            # Adding bits in place is safe for concurrent readers.
+            watermark, added = self._load_rows(bloom, watermark)
+            loaded += added
+            while loaded > self._capacity:
+                # Saturated: false positives climb, so rebuild at twice the
+                # size off to the side and swap it in whole.
+                self._capacity *= 2
+                bloom = BloomFilter(self._capacity, BLACKLIST_FILTER_ERROR_RATE)
+                watermark, loaded = self._load_rows(bloom, 0)
+            self._bloom, self._watermark, self._loaded = bloom, watermark, loaded
+            self._generation = generation
+            self._synced_at = time.monotonic()
+
+    def might_contain(self, jti: str) -> bool:
+        self._sync()
+        return jti in self._bloom
+
+    def reset(self) -> None:
+        """Drop the filter; the next check rebuilds it (e.g. after a purge)."""
+        with self._lock:
+            self._bloom = None
+            self._generation = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def bump_blacklist_generation() -> None:
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.set(_GENERATION_KEY, 1, None)
+
+
+def token_table_stats() -> dict:
+    """Row counts for the simplejwt token tables, for purge reporting and metrics."""
+    return {
+        "outstanding": OutstandingToken.objects.count(),
+        "blacklisted": BlacklistedToken.objects.count(),
+        "expired": OutstandingToken.objects.filter(expires_at__lt=timezone.now()).count(),
+    }
+
+
+def token_table_metrics():
+    """Scrape-time gauges for core.metrics."""
+    return [
+        (
+            "vigilpay_jwt_tokens",
+            "Rows in the simplejwt token tables, by state.",
+            [({"state": state}, count) for state, count in token_table_stats().items()],
+        )
+    ]
+
+
+class FilteredRefreshToken(RefreshToken):
+    def check_blacklist(self) -> None:
+        if not cache_is_shared():
+            # Other workers' blacklist inserts would never reach this filter.
+            super().check_blacklist()
+            return
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if blacklist_filter.might_contain(jti) and BlacklistedToken.objects.filter(token__jti=jti).exists():
+            raise TokenError("Token is blacklisted")
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
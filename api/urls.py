@@ -5,9 +5,10 @@ from .views import (
     MeView, DashboardView,
     ComplaintListCreateView, ComplaintDetailView,
     ProductListView, ProductDetailView,
-    NotificationListView, NotificationMarkReadView,
+    NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView,
     GoalListCreateView, GoalDetailView,
     SurveySubmitView,
+    BatchView,
 )
 
 urlpatterns = [
@@ -32,6 +33,7 @@ urlpatterns = [
     # Notifications
     path("notifications/",                NotificationListView.as_view(),     name="api_notifications"),
     path("notifications/<int:pk>/read/",  NotificationMarkReadView.as_view(), name="api_notification_read"),
+    path("notifications/read-all/",       NotificationMarkAllReadView.as_view(), name="api_notifications_read_all"),
 
     # Goals
     path("goals/",          GoalListCreateView.as_view(), name="api_goals"),
@@ -39,4 +41,7 @@ urlpatterns = [
 
     # Surveys
     path("surveys/", SurveySubmitView.as_view(), name="api_survey_submit"),
+
+    # Batch
+    path("batch/", BatchView.as_view(), name="api_batch"),
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import random
 
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -8,12 +10,16 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from core.models import Complaint, Goal, Notification, Product, Survey, User
+from .batch import BATCH_MAX_REQUESTS, dispatch_subrequest, request_memo
+from .catalogue import get_catalogue
+from .pagination import NewestFirstCursorPagination, changes_since, latest_sync_token, paginate_history
 from .serializer import (
     ComplaintCreateSerializer, ComplaintSerializer,
     GoalSerializer, LoginSerializer, NotificationSerializer,
     ProductSerializer, RegisterSerializer, SurveySerializer,
     UserSerializer, UserUpdateSerializer,
 )
+from .tokens import FilteredRefreshToken
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +63,6 @@ def compute_credit_score(user):
 
     score = int(round(max(300, min(base + loyalty_pts + activity_pts + balance_pts + consistency + penalty, 850))))
     user.credit_score = float(score)
-    user.save(update_fields=["credit_score"])
 
     if score >= 760:
         summary = "Excellent score."
@@ -83,6 +88,17 @@ def compute_credit_score(user):
     }
 
 
+def score_fingerprint(user):
+    """Digest of every input compute_credit_score and compute_risk read."""
+    raw = "|".join((
+        repr(float(user.balance)),
+        repr(float(user.loyalty_score)),
+        repr(float(user.activity_rate)),
+        str(int(bool(user.has_active_complaint))),
+    ))
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
 def compute_risk(user):
     """Rule-based churn risk — no ML dependency."""
     probability = round(max(0, min(100, 100 - (user.credit_score - 300) / 5.5)), 2)
@@ -91,17 +107,34 @@ def compute_risk(user):
 
     tier = "high" if probability >= 70 else "medium" if probability >= 40 else "low"
     user.churn_probability = probability
-    user.save(update_fields=["churn_probability"])
 
     return {"probability": probability, "tier": tier}
 
 
-def get_recommendations(user, risk):
+def refresh_scores(user):
+    """
+    Compute credit and risk, persisting them only when their inputs changed.
+
+    Both computations are pure functions of the fingerprinted fields, so an
+    unchanged fingerprint means the stored values are already current and
+    the request stays a pure read.
+    """
+    fingerprint = score_fingerprint(user)
+    credit = compute_credit_score(user)
+    risk = compute_risk(user)
+    if fingerprint != user.score_fingerprint:
+        user.score_fingerprint = fingerprint
+        user.save(update_fields=["credit_score", "churn_probability", "score_fingerprint"])
+    return credit, risk
+
+
+def get_recommendations(user, risk, catalogue=None):
     """Product recommendations based on user profile and risk tier."""
     resolutions, products = [], []
+    catalogue = catalogue or get_catalogue()
 
     if user.has_active_complaint:
-        offer = Product.objects.filter(type=Product.TYPE_RESOLUTION, is_active=True).first()
+        offer = catalogue.first_of_type(Product.TYPE_RESOLUTION)
         if offer:
             resolutions.append(offer.name)
         return {"active_resolutions": resolutions, "suggested_products": products}
@@ -111,15 +144,9 @@ def get_recommendations(user, risk):
     elif risk["probability"] < 30 and user.credit_score >= 700:
         names = ["Personal Loan", "Investment Portfolio"]
     else:
-        names = list(
-            Product.objects.filter(
-                is_active=True,
-                min_score_required__lte=user.credit_score,
-                min_balance_required__lte=user.balance,
-            ).exclude(type=Product.TYPE_RESOLUTION).values_list("name", flat=True)[:2]
-        )
+        names = catalogue.eligible(user.credit_score, user.balance)
 
-    products = list(Product.objects.filter(name__in=names, is_active=True).values_list("name", flat=True))
+    products = catalogue.active_names(names)
     return {"active_resolutions": resolutions, "suggested_products": products}
 
 
@@ -163,7 +190,7 @@ class LogoutView(APIView):
         if not refresh_token:
             return Response({"detail": "Refresh token required."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            RefreshToken(refresh_token).blacklist()
+            FilteredRefreshToken(refresh_token).blacklist()
         except Exception:
             return Response({"detail": "Invalid or expired token."}, status=status.HTTP_400_BAD_REQUEST)
         return Response({"detail": "Logged out."})
@@ -192,9 +219,9 @@ class DashboardView(APIView):
 
     def get(self, request):
         user = request.user
-        credit = compute_credit_score(user)
-        risk = compute_risk(user)
-        recommendations = get_recommendations(user, risk)
+        credit, risk = refresh_scores(user)
+        catalogue = request_memo(request, "catalogue", get_catalogue)
+        recommendations = get_recommendations(user, risk, catalogue)
         return Response({
             "credit_analysis": credit,
             "risk_analysis": risk,
@@ -211,7 +238,7 @@ class ComplaintListCreateView(APIView):
 
     def get(self, request):
         complaints = Complaint.objects.filter(user=request.user)
-        return Response(ComplaintSerializer(complaints, many=True).data)
+        return paginate_history(complaints, request, self, ComplaintSerializer)
 
     def post(self, request):
         serializer = ComplaintCreateSerializer(data=request.data)
@@ -263,11 +290,39 @@ class ProductDetailView(APIView):
 # ---------------------------------------------------------------------------
 
 class NotificationListView(APIView):
+    """
+    Newest-first cursor pages of the user's notifications.
+
+    With ?since=<sync token> it instead returns only notifications created
+    or changed after that token, oldest change first.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         notifications = Notification.objects.filter(target_user=request.user)
-        return Response(NotificationSerializer(notifications, many=True).data)
+        unread_count = notifications.filter(is_read=False).count()
+        paginator = NewestFirstCursorPagination()
+
+        since = request.query_params.get("since")
+        if since:
+            rows, next_since, has_more = changes_since(
+                notifications, since, paginator.get_page_size(request)
+            )
+            return Response({
+                "results": NotificationSerializer(rows, many=True).data,
+                "next_since": next_since,
+                "has_more": has_more,
+                "unread_count": unread_count,
+            })
+
+        page = paginator.paginate_queryset(notifications, request, view=self)
+        return Response({
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": NotificationSerializer(page, many=True).data,
+            "next_since": latest_sync_token(notifications),
+            "unread_count": unread_count,
+        })
 
 
 class NotificationMarkReadView(APIView):
@@ -279,10 +334,20 @@ class NotificationMarkReadView(APIView):
         except Notification.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         notification.is_read = True
-        notification.save(update_fields=["is_read"])
+        notification.save(update_fields=["is_read", "updated_at"])
         return Response({"detail": "Marked as read."})
 
 
+class NotificationMarkAllReadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        updated = Notification.objects.filter(target_user=request.user, is_read=False).update(
+            is_read=True, updated_at=timezone.now()
+        )
+        return Response({"detail": "All notifications marked as read.", "updated": updated})
+
+
 # ---------------------------------------------------------------------------
 # Goals
 # ---------------------------------------------------------------------------
@@ -292,7 +357,7 @@ class GoalListCreateView(APIView):
 
     def get(self, request):
         goals = Goal.objects.filter(user=request.user)
-        return Response(GoalSerializer(goals, many=True).data)
+        return paginate_history(goals, request, self, GoalSerializer)
 
     def post(self, request):
         serializer = GoalSerializer(data=request.data)
@@ -350,4 +415,31 @@ class SurveySubmitView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         serializer.save(user=request.user)
-        return Response({"detail": "Thank you for your feedback."}, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        return Response({"detail": "Thank you for your feedback."}, status=status.HTTP_201_CREATED)
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+
+class BatchView(APIView):
+    """
+    Run several API calls in one round trip.
+
+    Body: {"requests": [{"method": "GET", "path": "/api/v1/users/me/"}, ...]}
+    Each entry may also carry a JSON "body". Responses come back in order
+    as {"status": ..., "body": ...}; one failing entry does not stop the rest.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        specs = request.data.get("requests") if isinstance(request.data, dict) else None
+        if not isinstance(specs, list) or not specs:
+            return Response({"detail": "A non-empty 'requests' list is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(specs) > BATCH_MAX_REQUESTS:
+            return Response(
+                {"detail": f"At most {BATCH_MAX_REQUESTS} requests per batch."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        memo = {}
+        return Response({"responses": [dispatch_subrequest(request, spec, memo) for spec in specs]})
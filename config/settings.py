@@ -48,8 +48,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.JSONGZipMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -57,13 +60,14 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.timing.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -97,6 +101,18 @@ except Exception:
         }
     }
 
+# Optional read replica for dashboard analytics (core.replica), e.g.
+# REPLICA_DATABASE_URL=sqlite:///db_replica.sqlite3 against a copy of
+# db.sqlite3 locally. Tests read it through "default".
+if os.getenv("REPLICA_DATABASE_URL"):
+    import dj_database_url
+
+    DATABASES["replica"] = dj_database_url.parse(os.environ["REPLICA_DATABASE_URL"], conn_max_age=600)
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["core.replica.ReplicaRouter"]
+# Seconds a browser reads from the primary after one of its requests writes.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "15"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -145,15 +161,60 @@ SECURE_HSTS_PRELOAD = os.getenv("SECURE_HSTS_PRELOAD", "True").lower() in {
 # ── Django REST Framework ─────────────────────────────────────────────────────
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed when installed, stock DRF JSON otherwise.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
+# Cache shared by every worker (core.caching). Without REDIS_URL each process
+# gets its own LocMemCache, and features that need cross-worker
+# invalidation (the JWT user cache, the blacklist filter) stay off.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+
+# Seconds an authenticated API user is served from the cache (api.authentication).
+AUTH_USER_CACHE_TTL = 60
+
+# JSON responses at or above this size are gzipped for clients that accept it.
+JSON_GZIP_MIN_BYTES = 1024
+
+# Server-Timing header and per-request timing log (core.middleware).
+# The header exposes SQL timings: off by default outside DEBUG, where only
+# staff sessions receive it. Requests at or above SLOW_REQUEST_MS also log
+# their slowest queries.
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", str(DEBUG)).lower() in {"1", "true", "yes", "on"}
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_TOP_QUERIES = 5
+
+# /metrics (core.metrics). With a token set, scrapers send
+# "Authorization: Bearer <token>"; without one only staff sessions may read it.
+# Set METRICS_MULTIPROC_DIR to an empty, writable directory to aggregate
+# metrics across gunicorn workers and management commands.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+
+# Staff request profiles kept for the settings page (core.profiling).
+PROFILE_BUFFER_SIZE = 20
+
 # ── CORS ──────────────────────────────────────────────────────────────────────
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True  # 👈 allows emulator + any dev client freely
@@ -214,6 +275,7 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION':     True,   
     'AUTH_HEADER_TYPES':            ('Bearer',),
     'AUTH_TOKEN_CLASSES':           ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_REFRESH_SERIALIZER':     'api.tokens.FilteredTokenRefreshSerializer',
 }
 
 
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .metrics import register_collector
+        from .tasks import complaint_backlog_metrics
+
+        register_collector(complaint_backlog_metrics)
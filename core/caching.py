@@ -0,0 +1,20 @@
+"""
+Whether the default cache is shared between worker processes.
+
+Without CACHES configured Django falls back to LocMemCache, which each
+gunicorn worker holds privately: a key deleted or incremented on one
+worker is unchanged on the others. Features that rely on the cache to
+invalidate other workers (the JWT user cache, the blacklist filter)
+check cache_is_shared() and fall back to the database otherwise. Set
+REDIS_URL to share one cache between all workers.
+"""
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def cache_is_shared(alias: str = DEFAULT_CACHE_ALIAS) -> bool:
+    return not isinstance(caches[alias], PROCESS_LOCAL_CACHE_BACKENDS)
@@ -0,0 +1,47 @@
+"""
+Compiled keyword classifier for complaint text.
+
+Keyword matching used to be per-token Python work: split(), strip() and
+lower() on every word, then a separate any(kw in text) sweep for each
+category. Here all of it runs inside precompiled regexes:
+
+- One alternation finds every whole-token sentiment word (strip
+  characters allowed around it) in a single findall.
+- One alternation per category, tried in precedence order, keeps the
+  substring semantics of the old "any(kw in text)" checks.
+
+Results match the old implementation exactly (benchmark_complaint_classifier
+checks this).
+"""
+
+import re
+
+
+class KeywordClassifier:
+    def __init__(self, positive, negative, categories, default_category, strip_chars=".,!?"):
+        self.default_category = default_category
+        self._sentiment = {**{w: 1 for w in positive}, **{w: -1 for w in negative}}
+        strip = "[" + re.escape(strip_chars) + "]*"
+        words = "|".join(map(re.escape, sorted(self._sentiment, key=lambda w: (-len(w), w))))
+        # A token is a maximal non-whitespace run; the word must be all of it
+        # once the strip characters on either side are ignored.
+        self._token_re = re.compile(rf"(?<!\S){strip}({words}){strip}(?!\S)")
+        self._category_res = [
+            (category, re.compile("|".join(map(re.escape, keywords))))
+            for category, keywords in categories
+        ]
+
+    def classify(self, text: str) -> tuple[float, str]:
+        """Return (sentiment_score, category) for one text."""
+        text = (text or "").lower()
+        tokens = len(text.split())
+        score = 0.0
+        if tokens:
+            score = round(sum(map(self._sentiment.__getitem__, self._token_re.findall(text))) / tokens, 4)
+        for category, pattern in self._category_res:
+            if pattern.search(text):
+                return score, category
+        return score, self.default_category
+
+    def classify_many(self, texts) -> list[tuple[float, str]]:
+        return [self.classify(text) for text in texts]
@@ -28,13 +28,13 @@ class RegistrationForm(forms.Form):
         username = self.cleaned_data["username"].strip()
         if len(username) < 3:
             raise forms.ValidationError("Username must be at least 3 characters long.")
-        if User.objects.filter(username__iexact=username).exists():
+        if User.objects.username_ci(username).exists():
             raise forms.ValidationError("Username already exists.")
         return username
 
     def clean_email(self):
         email = self.cleaned_data["email"].strip().lower()
-        if User.objects.filter(email__iexact=email).exists():
+        if User.objects.email_ci(email).exists():
             raise forms.ValidationError("Email already exists.")
         return email
 
@@ -72,7 +72,7 @@ class ForgotPasswordForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data["email"].strip().lower()
-        if not User.objects.filter(email__iexact=email, is_verified=True).exists():
+        if not User.objects.email_ci(email).filter(is_verified=True).exists():
             raise forms.ValidationError("No verified account found with this email.")
         return email
 
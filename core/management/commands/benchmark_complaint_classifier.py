@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Complaint
+from core.tasks import CATEGORY_KEYWORDS, NEGATIVE_WORDS, POSITIVE_WORDS, classifier
+
+_FILLER = (
+    "the my was it and to a for on card account bank branch yesterday today again please "
+    "happy apple support feedback chargeback errors logins delays agents"
+).split()
+
+
+def _legacy_analyse(text: str) -> tuple[float, str]:
+    """The split()/strip() + per-category any(kw in text) implementation this replaced."""
+    words = [w.strip(".,!?").lower() for w in text.split()]
+    score = 0.0
+    if words:
+        pos = sum(1 for w in words if w in POSITIVE_WORDS)
+        neg = sum(1 for w in words if w in NEGATIVE_WORDS)
+        score = round((pos - neg) / max(len(words), 1), 4)
+    text = text.lower()
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(kw in text for kw in keywords):
+            return score, category
+    return score, Complaint.CATEGORY_SUPPORT
+
+
+def _synthetic_texts(count: int, words: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = _FILLER + sorted(POSITIVE_WORDS | NEGATIVE_WORDS)
+    vocabulary += [kw for _, keywords in CATEGORY_KEYWORDS for kw in keywords]
+    punctuation = ["", "", "", ".", ",", "!", "?", "..."]
+    texts = []
+    for _ in range(count):
+        tokens = [rng.choice(vocabulary) + rng.choice(punctuation) for _ in range(rng.randint(5, words))]
+        texts.append(" ".join(t.capitalize() if rng.random() < 0.1 else t for t in tokens))
+    return texts
+
+
+class Command(BaseCommand):
+    help = "Benchmark the compiled complaint classifier against the previous split()/any() implementation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--texts", type=int, default=20000)
+        parser.add_argument("--words", type=int, default=60, help="Maximum words per synthetic complaint.")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        texts = _synthetic_texts(options["texts"], options["words"], options["seed"])
+
+        start = time.perf_counter()
+        legacy = [_legacy_analyse(text) for text in texts]
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = classifier.classify_many(texts)
+        compiled_s = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+        self.stdout.write(f"{len(texts)} texts, up to {options['words']} words each")
+        self.stdout.write(f"  legacy split()/any():  {legacy_s * 1000:9.1f} ms  ({legacy_s / len(texts) * 1e6:6.1f} us/text)")
+        self.stdout.write(f"  compiled classifier:   {compiled_s * 1000:9.1f} ms  ({compiled_s / len(texts) * 1e6:6.1f} us/text)")
+        style = self.style.SUCCESS if not mismatches else self.style.ERROR
+        self.stdout.write(style(f"  result mismatches:     {mismatches}"))
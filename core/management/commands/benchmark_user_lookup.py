@@ -0,0 +1,74 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark case-insensitive email/username lookups (iexact vs the Lower() indexes) "
+        "against N synthetic users. Rows are inserted in a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000, help="Synthetic users to insert.")
+        parser.add_argument("--probes", type=int, default=200, help="Lookups timed per variant.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def _explain(self, queryset) -> str:
+        sql, params = queryset.query.sql_with_params()
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return " | ".join(str(row[-1]) for row in cursor.fetchall())
+
+    def _time(self, label, build, values):
+        start = time.perf_counter()
+        for value in values:
+            build(value).exists()
+        elapsed = (time.perf_counter() - start) / len(values) * 1000
+        self.stdout.write(f"  {label:<22}{elapsed:>10.3f} ms/lookup   plan: {self._explain(build(values[0]))}")
+
+    def handle(self, *args, **options):
+        total, batch_size = options["users"], options["batch_size"]
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                for offset in range(0, total, batch_size):
+                    User.objects.bulk_create(
+                        [
+                            User(
+                                id=f"bench{i:027d}",
+                                username=f"Bench_User_{i}",
+                                email=f"Bench.User{i}@Example.com",
+                                password="!",
+                            )
+                            for i in range(offset, min(offset + batch_size, total))
+                        ],
+                        batch_size=batch_size,
+                    )
+                self.stdout.write(f"Inserted {total} users in {time.perf_counter() - start:.1f}s")
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE "users"')
+
+                picks = [random.randrange(total) for _ in range(options["probes"])]
+                emails = [f"bench.user{i}@example.COM" for i in picks]
+                usernames = [f"BENCH_user_{i}" for i in picks]
+
+                self.stdout.write("email")
+                self._time("email__iexact", lambda v: User.objects.filter(email__iexact=v), emails)
+                self._time("email_ci (Lower idx)", User.objects.email_ci, emails)
+                self.stdout.write("username")
+                self._time("username__iexact", lambda v: User.objects.filter(username__iexact=v), usernames)
+                self._time("username_ci (Lower idx)", User.objects.username_ci, usernames)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write(self.style.SUCCESS("Benchmark rows rolled back."))
@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import platform
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from api.views import get_tokens
+from core.models import User
+from customers.ml_service import iter_synthetic_customers
+from customers.search import invalidate_search_cache
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+# A p95 this close to the baseline is noise, whatever the ratio.
+_LATENCY_FLOOR_MS = 5.0
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the dashboard pages, search, CSV upload and mobile API endpoints against "
+        "synthetic datasets (seed_synthetic_customers) and compare with a JSON baseline, "
+        "which must first be recorded on the same machine with --save-baseline. "
+        "All rows are inserted in a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated customer counts.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per endpoint.")
+        parser.add_argument("--upload-rows", type=int, default=200, help="Rows in the benchmark CSV upload.")
+        parser.add_argument("--upload-repeat", type=int, default=3, help="Timed uploads (each adds rows).")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--save-baseline", action="store_true", help="Write these results as the baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95/memory growth (0.25 = 25%%).")
+
+    def _targets(self, upload_csv):
+        def upload():
+            return {"file": SimpleUploadedFile("benchmark.csv", upload_csv, content_type="text/csv")}
+
+        return [
+            ("dashboard_page", "web", "get", reverse("dashboard_page"), None),
+            ("risk_level_page", "web", "get", reverse("risk_level_page"), None),
+            ("model_insight_page", "web", "get", reverse("model_insight_page"), None),
+            ("dashboard_search", "web", "get", reverse("dashboard_search") + "?q=sm", None),
+            ("upload_data", "web", "post", reverse("data_management_upload"), upload),
+            ("api_me", "api", "get", reverse("api_me"), None),
+            ("api_dashboard", "api", "get", reverse("api_dashboard"), None),
+            ("api_products", "api", "get", reverse("api_products"), None),
+            ("api_notifications", "api", "get", reverse("api_notifications"), None),
+            ("api_complaints", "api", "get", reverse("api_complaints"), None),
+            ("api_goals", "api", "get", reverse("api_goals"), None),
+        ]
+
+    def _upload_csv(self, rows: int) -> bytes:
+        # No Exited column, so the upload ingests and scores without retraining.
+        columns = ["CustomerId", "Surname", "CreditScore", "Geography", "Gender", "Age", "Tenure",
+                   "Balance", "NumOfProducts", "HasCrCard", "IsActiveMember"]
+        fields = ["customer_id", "surname", "credit_score", "geography", "gender", "age", "tenure",
+                  "balance", "num_of_products", "has_cr_card", "is_active_member"]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for frame in iter_synthetic_customers(rows, random_state=7):
+            for record in frame[fields].itertuples(index=False):
+                writer.writerow(record)
+        return buffer.getvalue().encode("utf-8")
+
+    def _measure(self, client, method, url, data, repeat, headers) -> dict:
+        def call():
+            response = getattr(client, method)(url, data() if data else None, secure=True, **headers)
+            if response.status_code >= 400:
+                raise CommandError(f"{method.upper()} {url} returned {response.status_code}.")
+            return response
+
+        # Warm-up run, which also counts queries; later runs are timed bare.
+        # The query log is capped, so empty it or a full log counts zero.
+        reset_queries()
+        with CaptureQueriesContext(connection) as captured:
+            call()
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            latencies.append((time.perf_counter() - start) * 1000)
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "queries": len(captured),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def _run_size(self, size: int, options, upload_csv) -> dict:
+        results = {}
+        try:
+            with transaction.atomic():
+                call_command("seed_synthetic_customers", rows=size, replace=True, stdout=io.StringIO())
+                suffix = uuid.uuid4().hex[:8]
+                staff = User.objects.create_user(
+                    username=f"benchmark_staff_{suffix}", password=None, is_staff=True, user_type=User.USER_TYPE_PRO
+                )
+                customer = User.objects.create_user(
+                    username=f"benchmark_customer_{suffix}", password=None, user_type=User.USER_TYPE_CUSTOMER
+                )
+                web = Client()
+                web.force_login(staff)
+                clients = {
+                    "web": (web, {}),
+                    "api": (Client(), {"HTTP_AUTHORIZATION": f"Bearer {get_tokens(customer)['access']}"}),
+                }
+                for name, kind, method, url, data in self._targets(upload_csv):
+                    client, headers = clients[kind]
+                    repeat = options["upload_repeat"] if method == "post" else options["repeat"]
+                    results[name] = self._measure(client, method, url, data, repeat, headers)
+                    self._print_row(name, results[name])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            invalidate_search_cache()
+        return results
+
+    def _print_row(self, name, row):
+        self.stdout.write(
+            f"  {name:<20}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['queries']:>9}{row['peak_kib']:>11.0f}"
+        )
+
+    def _regressions(self, results, baseline, tolerance) -> list:
+        found = []
+        for size, rows in results.items():
+            for name, row in rows.items():
+                base = baseline.get("sizes", {}).get(size, {}).get(name)
+                if not base:
+                    continue
+                if row["p95_ms"] > base["p95_ms"] * (1 + tolerance) and row["p95_ms"] - base["p95_ms"] > _LATENCY_FLOOR_MS:
+                    found.append(f"{size} {name}: p95 {base['p95_ms']} -> {row['p95_ms']} ms")
+                if row["queries"] > base["queries"]:
+                    found.append(f"{size} {name}: queries {base['queries']} -> {row['queries']}")
+                if row["peak_kib"] > base["peak_kib"] * (1 + tolerance):
+                    found.append(f"{size} {name}: peak {base['peak_kib']} -> {row['peak_kib']} KiB")
+        return found
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        upload_csv = self._upload_csv(options["upload_rows"])
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for size in sizes:
+                self.stdout.write(f"{size} customers")
+                self.stdout.write(f"  {'endpoint':<20}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KiB':>11}")
+                results[str(size)] = self._run_size(size, options, upload_csv)
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                "recorded_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "repeat": options["repeat"],
+                "sizes": results,
+            }, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}."))
+            return
+
+        if not baseline_path.exists():
+            # Baselines are machine-specific, so none is checked in; a
+            # comparison run without one must not pass as "no regressions".
+            raise CommandError(
+                f"No baseline at {baseline_path}. Record one on this machine with --save-baseline "
+                "(or pass --baseline), then rerun to compare."
+            )
+        regressions = self._regressions(results, json.loads(baseline_path.read_text()), options["tolerance"])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"  REGRESSION {regression}"))
+            raise CommandError(f"{len(regressions)} regression(s) against {baseline_path}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.tasks import COMPLAINT_BATCH_SIZE, complaint_backlog_stats, process_complaint_backlog
+
+
+class Command(BaseCommand):
+    help = "Score and categorise queued complaints in batches (run with --loop as a worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=COMPLAINT_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when drained.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--stats", action="store_true", help="Only report the backlog.")
+
+    def _write_stats(self):
+        stats = complaint_backlog_stats()
+        self.stdout.write(f"Complaint backlog: pending={stats['pending']} oldest_age_seconds={stats['oldest_age_seconds']}")
+
+    def handle(self, *args, **options):
+        self._write_stats()
+        if options["stats"]:
+            return
+
+        total = 0
+        while True:
+            processed = process_complaint_backlog(options["batch_size"])
+            total += processed
+            if processed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self._write_stats()
+        self.stdout.write(self.style.SUCCESS(f"Enriched {total} complaints."))
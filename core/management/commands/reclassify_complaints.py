@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Complaint
+from core.tasks import classifier
+
+
+class Command(BaseCommand):
+    help = "Re-score and re-categorise every complaint with the current keyword classifier."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Count changes without writing them.")
+
+    def _flush(self, batch, dry_run):
+        if batch and not dry_run:
+            Complaint.objects.bulk_update(batch, ["sentiment_score", "category", "enriched_at", "updated_at"])
+        batch.clear()
+
+    def handle(self, *args, **options):
+        batch_size, dry_run = options["batch_size"], options["dry_run"]
+        now = timezone.now()
+        scanned = changed = 0
+        batch, chunk = [], []
+
+        rows = Complaint.objects.only("id", "text", "sentiment_score", "category", "enriched_at").iterator(
+            chunk_size=batch_size
+        )
+        for complaint in rows:
+            chunk.append(complaint)
+            if len(chunk) < batch_size:
+                continue
+            changed += self._classify(chunk, batch, now)
+            scanned += len(chunk)
+            chunk = []
+            self._flush(batch, dry_run)
+        changed += self._classify(chunk, batch, now)
+        scanned += len(chunk)
+        self._flush(batch, dry_run)
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(self.style.SUCCESS(f"Scanned {scanned} complaints. {verb} {changed}."))
+
+    def _classify(self, chunk, batch, now) -> int:
+        before = len(batch)
+        for complaint, (score, category) in zip(chunk, classifier.classify_many(c.text for c in chunk)):
+            if complaint.enriched_at and complaint.sentiment_score == score and complaint.category == category:
+                continue
+            complaint.sentiment_score, complaint.category = score, category
+            complaint.enriched_at = complaint.enriched_at or now
+            complaint.updated_at = now
+            batch.append(complaint)
+        return len(batch) - before
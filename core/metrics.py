@@ -0,0 +1,339 @@
+"""
+Lightweight Prometheus-style metrics: counters, histograms and
+scrape-time gauges, exposed in the text format by core.views.metrics_view.
+
+By default values live in process memory. With METRICS_MULTIPROC_DIR set,
+each process (every gunicorn worker, and management commands such as
+rescore_customers) writes its counters into its own mmap-backed file in
+that directory. A scrape sums the files, so any worker that serves
+/metrics reports totals for all of them. Clear the directory when the
+service starts, as prometheus_client's multiprocess mode also requires.
+
+Gauges are not stored. Collectors registered with register_collector()
+compute them in the scraping process, e.g. from database counts.
+"""
+
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HEADER = struct.Struct("<I4x")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_FILE_SIZE = 1 << 16
+
+
+class _LocalValues:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+
+def _read_entries(data, used: int):
+    """Yield (key, value offset) for each entry in a metrics file."""
+    pos = _HEADER.size
+    while pos < used:
+        (length,) = _KEY_LENGTH.unpack_from(data, pos)
+        key = bytes(data[pos + _KEY_LENGTH.size:pos + _KEY_LENGTH.size + length]).decode("utf-8")
+        pos += (_KEY_LENGTH.size + length + 7) // 8 * 8
+        yield key, pos
+        pos += _VALUE.size
+
+
+class _FileValues:
+    """
+    One append-only mmap file of (key, float) entries per process.
+
+    Updates are in-place float writes. New keys are appended, and the
+    header's used-bytes count moves only after the entry is complete, so
+    readers never see a partial entry.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _open(self) -> None:
+        # Also runs after a fork, so a preloaded master's file is not shared.
+        self._pid = os.getpid()
+        path = os.path.join(self._directory, f"metrics_{self._pid}.db")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(fd).st_size
+        if size < _INITIAL_FILE_SIZE:
+            os.ftruncate(fd, _INITIAL_FILE_SIZE)
+            size = _INITIAL_FILE_SIZE
+        self._fd = fd
+        self._mmap = mmap.mmap(fd, size)
+        (used,) = _HEADER.unpack_from(self._mmap, 0)
+        self._used = used or _HEADER.size
+        self._positions = dict(_read_entries(self._mmap, self._used))
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        value_pos = self._used + (_KEY_LENGTH.size + len(encoded) + 7) // 8 * 8
+        end = value_pos + _VALUE.size
+        if end > len(self._mmap):
+            size = len(self._mmap)
+            while end > size:
+                size *= 2
+            os.ftruncate(self._fd, size)
+            self._mmap.close()
+            self._mmap = mmap.mmap(self._fd, size)
+        _KEY_LENGTH.pack_into(self._mmap, self._used, len(encoded))
+        self._mmap[self._used + _KEY_LENGTH.size:self._used + _KEY_LENGTH.size + len(encoded)] = encoded
+        _VALUE.pack_into(self._mmap, value_pos, 0.0)
+        self._used = end
+        _HEADER.pack_into(self._mmap, 0, end)
+        self._positions[key] = value_pos
+        return value_pos
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            pos = self._positions.get(key)
+            if pos is None:
+                pos = self._append(key)
+            (value,) = _VALUE.unpack_from(self._mmap, pos)
+            _VALUE.pack_into(self._mmap, pos, value + amount)
+
+    def snapshot(self) -> dict:
+        totals = {}
+        for path in glob.glob(os.path.join(self._directory, "metrics_*.db")):
+            try:
+                with open(path, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            if len(data) < _HEADER.size:
+                continue
+            (used,) = _HEADER.unpack_from(data, 0)
+            for key, pos in _read_entries(data, min(used, len(data))):
+                totals[key] = totals.get(key, 0.0) + _VALUE.unpack_from(data, pos)[0]
+        return totals
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._values = None
+        self._values_lock = threading.Lock()
+
+    @property
+    def values(self):
+        # Created on first use so settings are loaded by then.
+        if self._values is None:
+            with self._values_lock:
+                if self._values is None:
+                    directory = getattr(settings, "METRICS_MULTIPROC_DIR", "")
+                    self._values = _FileValues(directory) if directory else _LocalValues()
+        return self._values
+
+    def register(self, metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def register_collector(self, collector) -> None:
+        """collector() returns [(name, help, [(labels dict, value), ...]), ...] of gauges."""
+        self._collectors.append(collector)
+
+    def expose(self) -> str:
+        samples = {}
+        for key, value in self.values.snapshot().items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((tuple(map(tuple, labels)), value))
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose(samples))
+        for collector in self._collectors:
+            for name, documentation, gauge_samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(_sample(name, labels.items(), value) for labels, value in gauge_samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def register_collector(collector) -> None:
+    REGISTRY.register_collector(collector)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, labels, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+        return f"{name}{{{rendered}}} {value!r}"
+    return f"{name} {value!r}"
+
+
+def _key(name: str, labels) -> str:
+    return json.dumps([name, labels], separators=(",", ":"))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._children = {}
+        self._children_lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, **labels):
+        values = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            with self._children_lock:
+                child = self._children.setdefault(
+                    values, self._child(list(zip(self.labelnames, values)))
+                )
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} needs labels {self.labelnames}.")
+        return self.labels()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _CounterChild:
+    def __init__(self, metric, labels):
+        self._values = metric._registry.values
+        self._key = _key(metric.name, labels)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._values.inc(self._key, amount)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _child(self, labels):
+        return _CounterChild(self, labels)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def expose(self, all_samples: dict) -> list[str]:
+        samples = all_samples.get(self.name, [])
+        if not samples and not self.labelnames:
+            samples = [((), 0.0)]
+        return self._header() + [_sample(self.name, labels, value) for labels, value in sorted(samples)]
+
+
+class _HistogramChild:
+    def __init__(self, metric, labels):
+        self._values = metric._registry.values
+        self._buckets = metric.buckets
+        # Buckets are stored non-cumulative (one write per observation)
+        # and summed up at exposition.
+        self._bucket_keys = [
+            _key(metric.name + "_bucket", labels + [["le", _le(bound)]]) for bound in metric.buckets
+        ] + [_key(metric.name + "_bucket", labels + [["le", "+Inf"]])]
+        self._sum_key = _key(metric.name + "_sum", labels)
+        self._count_key = _key(metric.name + "_count", labels)
+
+    def observe(self, value: float) -> None:
+        index = len(self._buckets)
+        for i, bound in enumerate(self._buckets):
+            if value <= bound:
+                index = i
+                break
+        self._values.inc(self._bucket_keys[index], 1.0)
+        self._values.inc(self._sum_key, value)
+        self._values.inc(self._count_key, 1.0)
+
+    @contextmanager
+    def time(self):
+        """Observe the elapsed seconds; works as a context manager or decorator."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+def _le(bound: float) -> str:
+    return repr(float(bound))
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _child(self, labels):
+        return _HistogramChild(self, labels)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+    def expose(self, all_samples: dict) -> list[str]:
+        lines = self._header()
+        order = {_le(bound): i for i, bound in enumerate(self.buckets)}
+        order["+Inf"] = len(self.buckets)
+        series = {}
+        for labels, value in all_samples.get(self.name + "_bucket", []):
+            base = tuple(item for item in labels if item[0] != "le")
+            buckets = series.setdefault(base, [0.0] * len(order))
+            le = dict(labels)["le"]
+            if le in order:
+                buckets[order[le]] += value
+        sums = dict(all_samples.get(self.name + "_sum", []))
+        counts = dict(all_samples.get(self.name + "_count", []))
+        for base in sorted(series):
+            running = 0.0
+            for le, i in order.items():
+                running += series[base][i]
+                lines.append(_sample(self.name + "_bucket", base + (("le", le),), running))
+            lines.append(_sample(self.name + "_sum", base, sums.get(base, 0.0)))
+            lines.append(_sample(self.name + "_count", base, counts.get(base, 0.0)))
+        return lines
+
+
+def observe_cache(cache_name: str, hit: bool) -> None:
+    cache_requests.labels(cache=cache_name, result="hit" if hit else "miss").inc()
+
+
+cache_requests = Counter(
+    "vigilpay_cache_requests_total",
+    "Cache lookups by cache and result; hit ratio is hit / (hit + miss).",
+    ["cache", "result"],
+)
@@ -0,0 +1,157 @@
+import heapq
+import logging
+import time
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+from .profiling import profile_request, profile_requested
+from .replica import REPLICA_PIN_COOKIE, REPLICA_PIN_SECONDS, end_track_writes, replica_alias, track_writes
+from .timing import current_timings, end_request_timings, record_queries, start_request_timings
+
+logger = logging.getLogger(__name__)
+
+JSON_GZIP_MIN_BYTES = getattr(settings, "JSON_GZIP_MIN_BYTES", 1024)
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    Gzip JSON responses (API and dashboard endpoints) above a size threshold.
+
+    Only application/json bodies are touched: HTML pages carry CSRF tokens
+    and stay uncompressed, and small payloads are not worth the CPU.
+    Accept-Encoding negotiation and Vary handling are GZipMiddleware's.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or not response.get("Content-Type", "").startswith("application/json"):
+            return response
+        if len(response.content) < JSON_GZIP_MIN_BYTES:
+            return response
+        return super().process_response(request, response)
+
+
+SERVER_TIMING_HEADER = getattr(settings, "SERVER_TIMING_HEADER", settings.DEBUG)
+SLOW_REQUEST_MS = getattr(settings, "SLOW_REQUEST_MS", 500)
+SLOW_REQUEST_TOP_QUERIES = getattr(settings, "SLOW_REQUEST_TOP_QUERIES", 5)
+
+# Server-Timing metric name -> span recorded through core.timing.timed().
+_TIMING_SPANS = (
+    ("ml-load", "ml_load"),
+    ("ml-predict", "ml_predict"),
+    ("render", "render"),
+)
+
+
+class ServerTimingMiddleware:
+    """
+    Report where request time goes in a Server-Timing header and a log line.
+
+    SQL is measured with execute wrappers on every configured connection.
+    ML load/predict time and template/response rendering come from
+    core.timing spans. The header goes to every response when
+    SERVER_TIMING_HEADER is on, otherwise to staff sessions only. Requests
+    slower than SLOW_REQUEST_MS also log their slowest queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings, token = start_request_timings()
+        start = time.perf_counter()
+        try:
+            with record_queries(timings):
+                response = self.get_response(request)
+        finally:
+            end_request_timings(token)
+        total_ms = (time.perf_counter() - start) * 1000
+        self._report(request, response, timings, total_ms)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses and TemplateResponses render after the view returns.
+        timings = current_timings()
+        if timings is not None:
+            start = timings.begin("render")
+            response.add_post_render_callback(lambda r: timings.end("render", start))
+        return response
+
+    def _report(self, request, response, timings, total_ms):
+        db_ms = sum(seconds for seconds, _ in timings.queries) * 1000
+        metrics = {"db": (db_ms, len(timings.queries))}
+        for metric, span in _TIMING_SPANS:
+            if span in timings.spans:
+                metrics[metric] = (timings.spans[span] * 1000, timings.counts[span])
+
+        if SERVER_TIMING_HEADER or getattr(getattr(request, "user", None), "is_staff", False):
+            parts = [f'{name};dur={ms:.1f};desc="{count}x"' for name, (ms, count) in metrics.items()]
+            parts.append(f"total;dur={total_ms:.1f}")
+            response["Server-Timing"] = ", ".join(parts)
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": len(timings.queries),
+            **{f"{name.replace('-', '_')}_ms": round(ms, 1) for name, (ms, _) in metrics.items()},
+            "total_ms": round(total_ms, 1),
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if SLOW_REQUEST_MS is not None and total_ms >= SLOW_REQUEST_MS:
+            slowest = heapq.nlargest(SLOW_REQUEST_TOP_QUERIES, timings.queries, key=lambda q: q[0])
+            logger.warning(
+                "Slow request %s\n%s",
+                message,
+                "\n".join(f"  {seconds * 1000:.1f}ms {sql}" for seconds, sql in slowest),
+                extra={"timing": fields},
+            )
+        else:
+            logger.debug("Request %s", message, extra={"timing": fields})
+
+
+class ProfilerMiddleware:
+    """
+    Profile a request for a staff user who adds ?_profile=1 or an X-Profile header.
+
+    Reports go to core.profiling's ring buffer and are listed on the
+    settings page. The response carries X-Profile-Id. Untriggered requests
+    pay only for the trigger check. Keep this after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profile_requested(request) or not request.user.is_staff:
+            return self.get_response(request)
+        response, report_id = profile_request(request, self.get_response)
+        response["X-Profile-Id"] = str(report_id)
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Pin a browser's analytics reads to the primary for REPLICA_PIN_SECONDS
+    after any request of theirs writes, so an upload shows up at once
+    despite replica lag (see core.replica). Keep this before
+    SessionMiddleware so session saves count as writes too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if replica_alias() is None:
+            return self.get_response(request)
+        writes, token = track_writes()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_track_writes(token)
+        if writes:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, "1", max_age=REPLICA_PIN_SECONDS,
+                secure=request.is_secure(), httponly=True, samesite="Lax",
+            )
+        return response
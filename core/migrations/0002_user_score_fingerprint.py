@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='score_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
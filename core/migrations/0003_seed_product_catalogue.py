@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:05
+
+from django.db import migrations
+
+# Catalogue version 1. This migration's row in django_migrations is the
+# "catalogue seeded" marker; a revised catalogue ships as a new migration.
+DEFAULT_PRODUCTS = [
+    {
+        "name": "Gold Card Upgrade",
+        "type": "card",
+        "min_score_required": 650,
+        "min_balance_required": 6_000,
+        "description": "Upgrade to our premium Gold Card with exclusive rewards.",
+    },
+    {
+        "name": "VIP Savings Bonus",
+        "type": "bonus",
+        "min_score_required": 620,
+        "min_balance_required": 8_000,
+        "description": "Earn bonus interest on your savings with VIP status.",
+    },
+    {
+        "name": "Personal Loan",
+        "type": "loan",
+        "min_score_required": 700,
+        "min_balance_required": 3_000,
+        "description": "Flexible personal loan with competitive rates.",
+    },
+    {
+        "name": "Investment Portfolio",
+        "type": "bonus",
+        "min_score_required": 720,
+        "min_balance_required": 10_000,
+        "description": "Diversified investment options managed by our advisors.",
+    },
+    {
+        "name": "Resolution Offer - Fee Waiver",
+        "type": "resolution",
+        "min_score_required": 0,
+        "min_balance_required": 0,
+        "description": "We are waiving your fees as a goodwill gesture.",
+    },
+]
+
+
+def seed_products(apps, schema_editor):
+    Product = apps.get_model("core", "Product")
+    existing = set(
+        Product.objects.filter(name__in=[row["name"] for row in DEFAULT_PRODUCTS])
+        .values_list("name", flat=True)
+    )
+    Product.objects.bulk_create(
+        [Product(**row) for row in DEFAULT_PRODUCTS if row["name"] not in existing]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_score_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_products, migrations.RunPython.noop),
+    ]
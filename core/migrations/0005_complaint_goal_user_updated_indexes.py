@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_notification_updated_at_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['user', 'updated_at'], name='complaint_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'updated_at'], name='goal_user_updated_idx'),
+        ),
+    ]
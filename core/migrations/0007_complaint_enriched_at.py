@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_user_lower_email_username_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='enriched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('enriched_at__isnull', True)), fields=['created_at'], name='complaint_pending_idx'),
+        ),
+    ]
@@ -1,9 +1,22 @@
 import uuid
-from django.contrib.auth.models import AbstractUser, Group, Permission
+from django.contrib.auth.models import AbstractUser, Group, Permission, UserManager as BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
+class UserManager(BaseUserManager):
+    """Case-insensitive lookups that match the Lower(...) indexes on users."""
+
+    def email_ci(self, email):
+        return self.alias(email_lower=Lower("email")).filter(email_lower=Lower(models.Value(email or "")))
+
+    def username_ci(self, username):
+        return self.alias(username_lower=Lower("username")).filter(
+            username_lower=Lower(models.Value(username or ""))
+        )
+
+
 class User(AbstractUser):
     USER_TYPE_PRO = "PRO"
     USER_TYPE_CUSTOMER = "CUSTOMER"
@@ -29,6 +42,8 @@ class User(AbstractUser):
     activity_rate = models.FloatField(default=0.0)
     credit_score = models.FloatField(default=600.0)
     churn_probability = models.FloatField(default=0.0)
+    # Digest of the inputs credit_score/churn_probability were last computed from.
+    score_fingerprint = models.CharField(max_length=32, blank=True, default="")
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -36,8 +51,16 @@ class User(AbstractUser):
     groups = models.ManyToManyField(Group, blank=True, related_name="custom_users", db_table="users_groups")
     user_permissions = models.ManyToManyField(Permission, blank=True, related_name="custom_users", db_table="users_user_permissions")
 
+    objects = UserManager()
+
     class Meta:
         db_table = "users"
+        indexes = [
+            # email__iexact / username__iexact can't use an index; route
+            # case-insensitive lookups through User.objects.email_ci/username_ci.
+            models.Index(Lower("email"), name="users_email_lower_idx"),
+            models.Index(Lower("username"), name="users_username_lower_idx"),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.user_type})"
@@ -72,12 +95,22 @@ class Complaint(models.Model):
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_OPEN)
     sentiment_score = models.FloatField(default=0.0)
     resolution_note = models.TextField(blank=True, default="")
+    # NULL until the enrichment worker has scored and categorised the text.
+    enriched_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "complaints"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="complaint_user_updated_idx"),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(enriched_at__isnull=True),
+                name="complaint_pending_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Complaint #{self.pk} by {self.user} [{self.status}]"
@@ -117,10 +150,16 @@ class Notification(models.Model):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "notifications"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["target_user", "-created_at", "-id"], name="notif_user_created_idx"),
+            models.Index(fields=["target_user", "updated_at", "id"], name="notif_user_updated_idx"),
+            models.Index(fields=["target_user", "is_read"], name="notif_user_unread_idx"),
+        ]
 
     def __str__(self):
         return f"Notification → {self.target_user}: {self.title}"
@@ -138,6 +177,9 @@ class Goal(models.Model):
     class Meta:
         db_table = "goals"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="goal_user_updated_idx"),
+        ]
 
     def __str__(self):
         return f"'{self.title}' — {self.user}"
@@ -0,0 +1,136 @@
+"""
+On-demand request profiling for staff, see core.middleware.ProfilerMiddleware.
+
+A profiled request runs its view under cProfile. Its report (top
+functions, slowest SQL, ML calls) goes into a ring buffer of
+PROFILE_BUFFER_SIZE slots in the default cache, listed on the settings
+page. Slot n holds report ids n, n + size, n + 2*size, and so on, so new
+reports overwrite the oldest ones.
+
+The buffer is only as shared as the cache. With the default per-process
+LocMemCache each worker keeps its own buffer and report ids, so the
+settings page lists just the reports recorded by the worker that serves
+it; set REDIS_URL (core.caching) to collect every worker's reports.
+"""
+
+import cProfile
+import pstats
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .timing import current_timings, end_request_timings, record_queries, start_request_timings
+
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_HEADER = "X-Profile"
+PROFILE_BUFFER_SIZE = getattr(settings, "PROFILE_BUFFER_SIZE", 20)
+PROFILE_REPORT_TTL = 60 * 60 * 24
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_QUERIES = 25
+PROFILE_SORT_KEYS = ("cumtime_ms", "tottime_ms", "calls")
+
+_SEQ_KEY = "core:profile:seq"
+_SQL_MAX_CHARS = 2000
+_ML_MODULE = str(Path(__file__).resolve().parents[1] / "customers" / "ml_service.py")
+_ROOT = str(Path(__file__).resolve().parents[1]) + "/"
+
+
+def _slot_key(report_id: int) -> str:
+    return f"core:profile:slot:{report_id % PROFILE_BUFFER_SIZE}"
+
+
+def profile_requested(request) -> bool:
+    return PROFILE_QUERY_PARAM in request.GET or PROFILE_HEADER in request.headers
+
+
+def _function_rows(profiler) -> list[dict]:
+    rows = []
+    for (filename, lineno, name), (primitive, calls, tottime, cumtime, _) in pstats.Stats(profiler).stats.items():
+        rows.append({
+            "function": f"{filename.removeprefix(_ROOT)}:{lineno}({name})",
+            "ml": filename == _ML_MODULE,
+            "calls": calls,
+            "primitive_calls": primitive,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        })
+    return rows
+
+
+def _build_report(request, response, profiler, queries, timings, elapsed) -> dict:
+    rows = _function_rows(profiler)
+    # Keep the rows that lead either ordering so the report stays sortable.
+    top = {}
+    for key in ("cumtime_ms", "tottime_ms"):
+        for row in sorted(rows, key=lambda r: r[key], reverse=True)[:PROFILE_TOP_FUNCTIONS]:
+            top[row["function"]] = row
+    slowest = sorted(queries, key=lambda q: q[0], reverse=True)[:PROFILE_TOP_QUERIES]
+    return {
+        "method": request.method,
+        "path": request.get_full_path(),
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "created_at": timezone.now().isoformat(),
+        "total_ms": round(elapsed * 1000, 1),
+        "functions": list(top.values()),
+        "query_count": len(queries),
+        "query_ms": round(sum(seconds for seconds, _ in queries) * 1000, 1),
+        "queries": [{"ms": round(seconds * 1000, 2), "sql": sql[:_SQL_MAX_CHARS]} for seconds, sql in slowest],
+        "ml_calls": sorted((row for row in rows if row["ml"]), key=lambda r: r["cumtime_ms"], reverse=True),
+        "ml_spans": {
+            name: {"ms": round(seconds * 1000, 2), "calls": timings.counts[name]}
+            for name, seconds in timings.spans.items()
+            if name.startswith("ml_")
+        },
+    }
+
+
+def profile_request(request, get_response):
+    """Run get_response under cProfile; returns (response, stored report id)."""
+    timings = current_timings()
+    token = None
+    if timings is None:
+        timings, token = start_request_timings()
+    first_query = len(timings.queries)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        with record_queries(timings) if token is not None else nullcontext():
+            response = profiler.runcall(get_response, request)
+    finally:
+        if token is not None:
+            end_request_timings(token)
+    elapsed = time.perf_counter() - start
+    report = _build_report(request, response, profiler, timings.queries[first_query:], timings, elapsed)
+    return response, store_report(report)
+
+
+def store_report(report: dict) -> int:
+    try:
+        report_id = cache.incr(_SEQ_KEY)
+    except ValueError:
+        cache.add(_SEQ_KEY, 0, None)
+        report_id = cache.incr(_SEQ_KEY)
+    report["id"] = report_id
+    cache.set(_slot_key(report_id), report, PROFILE_REPORT_TTL)
+    return report_id
+
+
+def recent_reports() -> list[dict]:
+    """Stored reports, newest first."""
+    keys = [_slot_key(slot) for slot in range(PROFILE_BUFFER_SIZE)]
+    return sorted(cache.get_many(keys).values(), key=lambda r: r["id"], reverse=True)
+
+
+def get_report(report_id: int, sort: str = "cumtime_ms"):
+    report = cache.get(_slot_key(report_id))
+    if report is None or report["id"] != report_id:
+        return None
+    if sort not in PROFILE_SORT_KEYS:
+        sort = "cumtime_ms"
+    report["functions"] = sorted(report["functions"], key=lambda r: r[sort], reverse=True)
+    return report
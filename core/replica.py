@@ -0,0 +1,109 @@
+"""
+Optional read replica for dashboard analytics.
+
+With REPLICA_DATABASE_URL set, settings add a "replica" database and
+ReplicaRouter routes reads there only inside views wrapped with
+read_from_replica (the dashboard pages, search, charts and exports).
+Everything else, and every write, uses "default".
+
+Replicas lag. A request that writes (an upload, a dataset clear) gets a
+REPLICA_PIN_COOKIE from core.middleware.ReplicaPinMiddleware, and for
+REPLICA_PIN_SECONDS afterwards that browser's analytics reads stay on
+the primary, so it sees its own writes.
+"""
+
+import contextvars
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+REPLICA_PIN_COOKIE = "vigilpay_primary_pin"
+REPLICA_PIN_SECONDS = getattr(settings, "REPLICA_PIN_SECONDS", 15)
+
+_read_alias = contextvars.ContextVar("replica_read_alias", default=None)
+_writes = contextvars.ContextVar("replica_writes", default=None)
+
+_DONE = object()
+
+
+def _target(alias) -> tuple:
+    settings_dict = connections[alias].settings_dict
+    return settings_dict["ENGINE"], settings_dict["HOST"], settings_dict["PORT"], str(settings_dict["NAME"])
+
+
+def replica_alias():
+    """
+    The replica's alias, or None when none is configured or it is the
+    primary's own database (a test MIRROR), which a second connection
+    would only lock against.
+    """
+    if REPLICA_DB_ALIAS not in connections.databases:
+        return None
+    if _target(REPLICA_DB_ALIAS) == _target(DEFAULT_DB_ALIAS):
+        return None
+    return REPLICA_DB_ALIAS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None:
+            writes.add(model._meta.label)
+        # Explicit, or a row read from the replica would be saved back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors the primary, so rows from either may relate.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def track_writes():
+    """Start recording written models for this request; returns (models, token)."""
+    writes = set()
+    return writes, _writes.set(writes)
+
+
+def end_track_writes(token) -> None:
+    _writes.reset(token)
+
+
+def _streamed_from(alias, content):
+    # Streaming bodies are read after the view returns, so route each chunk.
+    iterator = iter(content)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator, _DONE)
+        finally:
+            _read_alias.reset(token)
+        if chunk is _DONE:
+            return
+        yield chunk
+
+
+def read_from_replica(view_func):
+    """Route the view's reads, including a streamed body, to the replica unless pinned."""
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or REPLICA_PIN_COOKIE in request.COOKIES:
+            return view_func(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            response = view_func(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+        if response.streaming:
+            response.streaming_content = _streamed_from(alias, response.streaming_content)
+        return response
+
+    return _wrapped
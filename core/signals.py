@@ -2,14 +2,14 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from core.models import Complaint
-from core.tasks import sentiment_analysis
 
 
 @receiver(post_save, sender=Complaint)
 def complaint_saved(sender, instance, created, **kwargs):
+    # Enrichment is queued (enriched_at stays NULL for the worker); the
+    # request only pays for flagging the user, and only once.
     if created:
         user = instance.user
-        user.has_active_complaint = True
-        user.has_complain = True
-        user.save(update_fields=["has_active_complaint", "has_complain"])
-        sentiment_analysis(instance)
+        if not user.has_active_complaint:
+            user.has_active_complaint = True
+            user.save(update_fields=["has_active_complaint"])
@@ -1,5 +1,22 @@
+"""
+Complaint enrichment: sentiment score and category.
+
+Creating a complaint stores the row with enriched_at NULL; that NULL is
+the queue. process_complaint_queue (a management command run as a
+worker) drains it in batches with process_complaint_backlog(). The
+handlers are idempotent: the result is a pure function of the text and a
+row leaves the queue only by being written, so a batch re-run after a
+crash, or by two workers at once, writes identical values.
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.classifier import KeywordClassifier
 from core.models import Complaint
 
+COMPLAINT_BATCH_SIZE = 200
+
 
 POSITIVE_WORDS = {
     "good",
@@ -25,25 +42,70 @@ NEGATIVE_WORDS = {
 }
 
 
+CATEGORY_KEYWORDS = [
+    (Complaint.CATEGORY_BILLING, ["fee", "charge", "billing", "refund"]),
+    (Complaint.CATEGORY_TECHNICAL, ["app", "login", "crash", "error"]),
+    (Complaint.CATEGORY_SERVICE, ["service", "delay", "support", "agent"]),
+]
+
+classifier = KeywordClassifier(POSITIVE_WORDS, NEGATIVE_WORDS, CATEGORY_KEYWORDS, Complaint.CATEGORY_SUPPORT)
+
+
+def analyse_complaint_text(text: str) -> tuple[float, str]:
+    """Return (sentiment_score, category) for a complaint body."""
+    return classifier.classify(text)
+
+
 def sentiment_analysis(complaint: Complaint) -> float:
-    words = [w.strip(".,!?").lower() for w in complaint.text.split()]
-    if not words:
-        return 0.0
-
-    pos = sum(1 for w in words if w in POSITIVE_WORDS)
-    neg = sum(1 for w in words if w in NEGATIVE_WORDS)
-    score = (pos - neg) / max(len(words), 1)
-    complaint.sentiment_score = round(score, 4)
-
-    text = complaint.text.lower()
-    if any(x in text for x in {"fee", "charge", "billing", "refund"}):
-        complaint.category = Complaint.CATEGORY_BILLING
-    elif any(x in text for x in {"app", "login", "crash", "error"}):
-        complaint.category = Complaint.CATEGORY_TECHNICAL
-    elif any(x in text for x in {"service", "delay", "support", "agent"}):
-        complaint.category = Complaint.CATEGORY_SERVICE
-    else:
-        complaint.category = Complaint.CATEGORY_SUPPORT
-
-    complaint.save(update_fields=["sentiment_score", "category", "updated_at"])
+    """Enrich one complaint immediately (admin/shell use; requests use the queue)."""
+    enrich_complaints([complaint])
     return complaint.sentiment_score
+
+
+def enrich_complaints(complaints) -> int:
+    """Score, categorise and dequeue complaints with a single bulk UPDATE."""
+    now = timezone.now()
+    results = classifier.classify_many(complaint.text for complaint in complaints)
+    for complaint, (score, category) in zip(complaints, results):
+        complaint.sentiment_score, complaint.category = score, category
+        complaint.enriched_at = now
+        # bulk_update skips auto_now; delta-syncing clients key off updated_at.
+        complaint.updated_at = now
+    Complaint.objects.bulk_update(complaints, ["sentiment_score", "category", "enriched_at", "updated_at"])
+    return len(complaints)
+
+
+def process_complaint_backlog(batch_size: int = COMPLAINT_BATCH_SIZE) -> int:
+    """Enrich up to batch_size pending complaints, oldest first; returns how many."""
+    with transaction.atomic():
+        pending = Complaint.objects.filter(enriched_at__isnull=True).order_by("created_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            # Parallel workers take disjoint batches instead of queueing on locks.
+            pending = pending.select_for_update(skip_locked=True)
+        batch = list(pending.only("id", "text")[:batch_size])
+        if not batch:
+            return 0
+        return enrich_complaints(batch)
+
+
+def complaint_backlog_stats() -> dict:
+    """Queue depth and the age of its oldest entry, in seconds."""
+    pending = Complaint.objects.filter(enriched_at__isnull=True)
+    oldest = pending.order_by("created_at").values_list("created_at", flat=True).first()
+    return {
+        "pending": pending.count(),
+        "oldest_age_seconds": round((timezone.now() - oldest).total_seconds(), 1) if oldest else 0.0,
+    }
+
+
+def complaint_backlog_metrics():
+    """Scrape-time gauges for core.metrics."""
+    stats = complaint_backlog_stats()
+    return [
+        ("vigilpay_complaint_backlog", "Complaints waiting for enrichment.", [({}, stats["pending"])]),
+        (
+            "vigilpay_complaint_backlog_oldest_age_seconds",
+            "Age of the oldest complaint waiting for enrichment.",
+            [({}, stats["oldest_age_seconds"])],
+        ),
+    ]
@@ -0,0 +1,31 @@
+"""Helpers shared by the apps' tests.py modules."""
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.test import override_settings
+
+UPLOAD_CSV_HEADER = (
+    "CustomerId,Surname,CreditScore,Geography,Gender,Age,Tenure,Balance,NumOfProducts,HasCrCard,IsActiveMember"
+)
+
+
+@contextmanager
+def shared_cache():
+    """A file-based default cache: shared between processes, unlike the default LocMemCache."""
+    location = tempfile.mkdtemp()
+    try:
+        with override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location},
+        }):
+            yield
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
+
+
+def upload_csv(rows: int) -> bytes:
+    """A dataset upload of `rows` unlabelled customers."""
+    lines = [UPLOAD_CSV_HEADER]
+    lines += [f"{900000 + i},Upload{i},610,Spain,Female,41,3,1200.5,2,1,0" for i in range(rows)]
+    return "\n".join(lines).encode("utf-8")
@@ -0,0 +1,290 @@
+import gzip
+import io
+import re
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from customers import ml_service
+from customers.models import Customer
+
+from . import middleware, profiling, replica
+from .management.commands.benchmark_complaint_classifier import _legacy_analyse, _synthetic_texts
+from .middleware import JSON_GZIP_MIN_BYTES
+from .models import Complaint, Notification, User
+from .tasks import analyse_complaint_text, classifier, complaint_backlog_stats, process_complaint_backlog
+from .testing import upload_csv
+
+
+class ReplicaRoutingTests(TestCase):
+    """The replica is faked as "default" so routing is observable without a second database."""
+
+    def setUp(self):
+        for target in ("core.replica.replica_alias", "core.middleware.replica_alias"):
+            patcher = mock.patch(target, return_value="default")
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.router = replica.ReplicaRouter()
+
+    def test_only_wrapped_views_read_from_the_replica(self):
+        @replica.read_from_replica
+        def view(request):
+            return HttpResponse(str(self.router.db_for_read(Customer)))
+
+        @replica.read_from_replica
+        def streaming_view(request):
+            return StreamingHttpResponse(str(self.router.db_for_read(Customer)) for _ in range(2))
+
+        factory = RequestFactory()
+        self.assertIsNone(self.router.db_for_read(Customer))
+        self.assertEqual(view(factory.get("/")).content, b"default")
+        self.assertEqual(b"".join(streaming_view(factory.get("/")).streaming_content), b"defaultdefault")
+        pinned = factory.get("/")
+        pinned.COOKIES[replica.REPLICA_PIN_COOKIE] = "1"
+        self.assertEqual(view(pinned).content, b"None")
+        self.assertEqual(self.router.db_for_write(Customer, instance=Customer()), "default")
+
+    def test_writing_request_pins_reads_to_the_primary(self):
+        client = Client()
+        client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+        with mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib")):
+            response = client.post(reverse("data_management_upload"), {
+                "file": SimpleUploadedFile("upload.csv", upload_csv(2), content_type="text/csv"),
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[replica.REPLICA_PIN_COOKIE]["max-age"], replica.REPLICA_PIN_SECONDS)
+        client.cookies.pop(replica.REPLICA_PIN_COOKIE)
+        self.assertNotIn(replica.REPLICA_PIN_COOKIE, client.get(reverse("risk_level_page")).cookies)
+
+
+class JSONGZipTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Notification.objects.bulk_create(
+            Notification(target_user=self.user, title=f"Notice {i}", message="x" * 80) for i in range(30)
+        )
+
+    def test_large_json_is_gzipped_only_when_accepted(self):
+        url = reverse("api_notifications")
+        plain = self.client.get(url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertGreaterEqual(len(plain.content), JSON_GZIP_MIN_BYTES)
+        zipped = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(zipped["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", zipped["Vary"])
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+
+    def test_small_json_and_html_stay_uncompressed(self):
+        small = self.client.get(reverse("api_me"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertLess(len(small.content), JSON_GZIP_MIN_BYTES)
+        self.assertFalse(small.has_header("Content-Encoding"))
+        web = Client()
+        web.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+        page = web.get(reverse("settings_page"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(page.status_code, 200)
+        self.assertFalse(page.has_header("Content-Encoding"))
+
+
+
+class ServerTimingTests(TestCase):
+    HEADER = re.compile(r'^db;dur=\d+\.\d;desc="\d+x"(, [a-z-]+;dur=\d+\.\d;desc="\d+x")*, total;dur=\d+\.\d$')
+
+    def _get(self, user=None):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        return client.get(reverse("login_page") if user is None else reverse("settings_page"))
+
+    def test_header_is_staff_only_when_disabled(self):
+        member = User.objects.create_user(username="member", password=None)
+        staff = User.objects.create_user(username="staff", password=None, is_staff=True)
+        with mock.patch.object(middleware, "SERVER_TIMING_HEADER", False):
+            self.assertFalse(self._get().has_header("Server-Timing"))
+            self.assertFalse(self._get(member).has_header("Server-Timing"))
+            self.assertRegex(self._get(staff)["Server-Timing"], self.HEADER)
+
+    def test_header_goes_to_everyone_when_enabled(self):
+        with mock.patch.object(middleware, "SERVER_TIMING_HEADER", True):
+            self.assertRegex(self._get()["Server-Timing"], self.HEADER)
+
+    def test_request_log_is_debug_level(self):
+        with mock.patch.object(middleware, "SLOW_REQUEST_MS", None), \
+                self.assertLogs("core.middleware", level="DEBUG") as logs:
+            self._get()
+        self.assertEqual([record.levelname for record in logs.records], ["DEBUG"])
+        self.assertIn("path=/login/", logs.output[0])
+
+
+
+class ProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        patcher = mock.patch.object(profiling, "PROFILE_BUFFER_SIZE", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _client(self, **fields):
+        client = Client()
+        client.force_login(User.objects.create_user(password=None, **fields))
+        return client
+
+    def test_non_staff_triggers_are_ignored(self):
+        client = self._client(username="member")
+        for response in (client.get(reverse("settings_page"), {"_profile": "1"}),
+                         client.get(reverse("settings_page"), HTTP_X_PROFILE="1")):
+            self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(profiling.recent_reports(), [])
+
+    def test_staff_request_is_stored_in_the_ring_buffer(self):
+        client = self._client(username="staff", is_staff=True)
+        response = client.get(reverse("login_page"), HTTP_X_PROFILE="1")
+        report = profiling.get_report(int(response["X-Profile-Id"]))
+        self.assertEqual((report["path"], report["user"], report["status"]), ("/login/", "staff", response.status_code))
+        self.assertTrue(report["functions"])
+        self.assertEqual([r["id"] for r in profiling.recent_reports()], [report["id"]])
+
+    def test_ring_buffer_keeps_only_the_newest_reports(self):
+        client = self._client(username="staff", is_staff=True)
+        ids = [int(client.get(reverse("login_page"), {"_profile": "1"})["X-Profile-Id"]) for _ in range(5)]
+        self.assertEqual([report["id"] for report in profiling.recent_reports()], ids[:1:-1])
+        self.assertIsNone(profiling.get_report(ids[0]))
+
+
+
+class CaseInsensitiveUserLookupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="AdaLovelace", email="Ada.Lovelace@Example.com", password="s3cret-Pass!",
+        )
+
+    def test_managers_match_any_case(self):
+        self.assertEqual(list(User.objects.email_ci("ada.lovelace@EXAMPLE.com")), [self.user])
+        self.assertEqual(list(User.objects.username_ci("adalovelace")), [self.user])
+        self.assertFalse(User.objects.email_ci("ada@example.com").exists())
+        self.assertFalse(User.objects.username_ci(None).exists())
+
+    def test_mixed_case_api_login_and_duplicate_registration(self):
+        client = APIClient()
+        login = client.post(reverse("api_login"), {"email": "ADA.lovelace@example.COM", "password": "s3cret-Pass!"})
+        self.assertEqual(login.status_code, 200, login.content)
+        register = client.post(reverse("api_register"), {
+            "username": "adalovelace", "email": "ADA.LOVELACE@example.com", "first_name": "Ada", "last_name": "King",
+            "password": "An0ther-Pass!", "confirm_password": "An0ther-Pass!",
+        })
+        self.assertEqual(register.status_code, 400)
+        self.assertEqual(set(register.json()), {"username", "email"})
+
+    def test_lower_indexes_exist_and_serve_the_lookups(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+        for name in ("users_email_lower_idx", "users_username_lower_idx"):
+            with self.subTest(name):
+                self.assertTrue(constraints[name]["index"])
+        if connection.vendor == "sqlite":
+            self.assertIn("users_email_lower_idx", User.objects.email_ci("a@b.com").explain())
+            self.assertIn("users_username_lower_idx", User.objects.username_ci("ada").explain())
+
+
+class ComplaintQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="member", password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _post(self, text: str) -> list[str]:
+        with CaptureQueriesContext(connections["default"]) as captured:
+            response = self.client.post(reverse("api_complaints"), {"text": text}, format="json")
+        self.assertEqual(response.status_code, 201)
+        return [q["sql"] for q in captured if q["sql"].startswith(("INSERT", "UPDATE"))]
+
+    def test_posting_queues_the_complaint_and_flags_the_user_once(self):
+        writes = self._post("The app login failed again!")
+        self.assertEqual(len(writes), 2)
+        self.assertIn("has_active_complaint", writes[1])
+        complaint = Complaint.objects.get()
+        self.assertEqual((complaint.enriched_at, complaint.sentiment_score), (None, 0.0))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.has_active_complaint)
+        self.assertEqual(len(self._post("Another one")), 1)
+
+    def test_backlog_is_drained_oldest_first_and_idempotently(self):
+        texts = ["Refund the fee please", "Great and helpful agent", "App crash on login"]
+        complaints = [Complaint.objects.create(user=self.user, text=text) for text in texts]
+        self.assertEqual(complaint_backlog_stats()["pending"], 3)
+
+        self.assertEqual(process_complaint_backlog(batch_size=2), 2)
+        self.assertEqual(
+            list(Complaint.objects.filter(enriched_at__isnull=True).values_list("pk", flat=True)), [complaints[2].pk]
+        )
+        out = io.StringIO()
+        call_command("process_complaint_queue", stdout=out)
+        self.assertIn("Enriched 1 complaints.", out.getvalue())
+        self.assertEqual(complaint_backlog_stats(), {"pending": 0, "oldest_age_seconds": 0.0})
+
+        results = Complaint.objects.order_by("pk").values_list("sentiment_score", "category")
+        enriched = list(results)
+        self.assertEqual(enriched, [analyse_complaint_text(text) for text in texts])
+        Complaint.objects.update(enriched_at=None)
+        self.assertEqual(process_complaint_backlog(), 3)
+        self.assertEqual(list(results.all()), enriched)
+
+    def test_enrichment_bumps_updated_at_for_delta_sync(self):
+        complaint = Complaint.objects.create(user=self.user, text="Slow service")
+        Complaint.objects.filter(pk=complaint.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        since = timezone.now() - timedelta(minutes=1)
+        process_complaint_backlog()
+        complaint.refresh_from_db()
+        self.assertGreater(complaint.updated_at, since)
+        self.assertEqual(complaint.category, Complaint.CATEGORY_SERVICE)
+
+
+class ComplaintClassifierTests(TestCase):
+    def test_matches_the_previous_implementation(self):
+        texts = _synthetic_texts(2000, 40, seed=11) + ["", "   ", "Terrible!!! charge?", "...good..."]
+        self.assertEqual(classifier.classify_many(texts), [_legacy_analyse(text) for text in texts])
+
+    def test_tokens_and_category_precedence(self):
+        # Whole tokens only for sentiment; strip characters around them are ignored.
+        self.assertEqual(classifier.classify("TERRIBLE!! badly"), (-0.5, Complaint.CATEGORY_SUPPORT))
+        # Categories keep substring matching, and billing outranks technical.
+        self.assertEqual(classifier.classify("chargeback via the app")[1], Complaint.CATEGORY_BILLING)
+        self.assertEqual(classifier.classify("support apps")[1], Complaint.CATEGORY_TECHNICAL)
+        self.assertEqual(classifier.classify(None), (0.0, Complaint.CATEGORY_SUPPORT))
+
+    def test_reclassify_writes_only_changed_rows(self):
+        user = User.objects.create_user(username="member", password=None)
+        current = Complaint.objects.create(user=user, text="Refund the fee")
+        stale = Complaint.objects.create(user=user, text="App crash")
+        process_complaint_backlog()
+        Complaint.objects.filter(pk=stale.pk).update(category=Complaint.CATEGORY_SERVICE)
+
+        out = io.StringIO()
+        call_command("reclassify_complaints", "--dry-run", stdout=out)
+        self.assertIn("Would update 1", out.getvalue())
+        self.assertEqual(Complaint.objects.get(pk=stale.pk).category, Complaint.CATEGORY_SERVICE)
+
+        before = Complaint.objects.get(pk=current.pk).updated_at
+        call_command("reclassify_complaints", stdout=io.StringIO())
+        self.assertEqual(Complaint.objects.get(pk=stale.pk).category, Complaint.CATEGORY_TECHNICAL)
+        self.assertEqual(Complaint.objects.get(pk=current.pk).updated_at, before)
+
+
+class BenchmarkBaselineTests(TestCase):
+    def test_comparison_without_a_baseline_fails_loudly(self):
+        missing = Path("/nonexistent/benchmarks/baseline.json")
+        with self.assertRaisesMessage(CommandError, f"No baseline at {missing}"):
+            call_command("benchmark_views", sizes="", upload_rows=1, baseline=str(missing), stdout=io.StringIO())
@@ -0,0 +1,107 @@
+"""
+Per-request timing spans, reported by core.middleware.ServerTimingMiddleware.
+
+The middleware opens a RequestTimings for each request. Code anywhere in
+the request path adds to it with timed("name"), as a context manager or a
+decorator. Outside a request, for example in management commands or the
+complaint worker, timed() does nothing.
+
+A span that is already open is not counted again when it nests, so a
+template rendered by a DRF renderer counts once toward "render".
+"""
+
+import contextvars
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.spans = {}
+        self.counts = {}
+        self.queries = []
+        self._open = set()
+
+    def begin(self, name: str):
+        """Open a span; returns its start time, or None if it is already open."""
+        if name in self._open:
+            return None
+        self._open.add(name)
+        return time.perf_counter()
+
+    def end(self, name: str, start) -> None:
+        if start is None:
+            return
+        self._open.discard(name)
+        self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+
+def current_timings():
+    return _current.get()
+
+
+def start_request_timings() -> tuple[RequestTimings, contextvars.Token]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request_timings(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name: str):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = timings.begin(name)
+    try:
+        yield
+    finally:
+        timings.end(name, start)
+
+
+@contextmanager
+def record_queries(timings: RequestTimings):
+    """Append (seconds, sql) to timings.queries for every query on any connection."""
+
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            timings.queries.append((time.perf_counter() - start, sql))
+
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(wrapper))
+        yield
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self._wrapped = template
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def render(self, context=None, request=None):
+        with timed("render"):
+            return self._wrapped.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports template rendering as "render"."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
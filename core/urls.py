@@ -7,4 +7,5 @@ urlpatterns = [
     path("login/",    views.login_page,    name="login_page"),
     path("register/", views.register_page, name="register_page"),
     path("logout/",   views.logout_page,   name="logout_page"),
+    path("metrics",   views.metrics_view,  name="metrics"),
 ]
\ No newline at end of file
@@ -1,13 +1,19 @@
 import logging
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
+from django.http import HttpResponse
 from django.shortcuts import redirect, render
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
 
+from core.metrics import METRICS_CONTENT_TYPE, REGISTRY
 from core.models import User
 
 logger = logging.getLogger(__name__)
@@ -80,7 +86,7 @@ def _resolve_username(identifier: str) -> str | None:
             validate_email(identifier)
         except ValidationError:
             return None
-        user = User.objects.filter(email__iexact=identifier).first()
+        user = User.objects.email_ci(identifier).first()
         return user.username if user else None
     return identifier
 
@@ -112,7 +118,7 @@ def register_page(request):
             messages.error(request, "Username must be at least 3 characters.")
             return render(request, "core/register.html")
 
-        if User.objects.filter(username__iexact=username).exists():
+        if User.objects.username_ci(username).exists():
             messages.error(request, "That username is already taken.")
             return render(request, "core/register.html")
 
@@ -122,7 +128,7 @@ def register_page(request):
             messages.error(request, "Enter a valid email address.")
             return render(request, "core/register.html")
 
-        if User.objects.filter(email__iexact=email).exists():
+        if User.objects.email_ci(email).exists():
             messages.error(request, "An account with that email already exists.")
             return render(request, "core/register.html")
 
@@ -169,3 +175,24 @@ def logout_page(request):
         return redirect("login_page")
     # GET requests just redirect back — no logout without a form POST
     return redirect("dashboard_page")
+
+
+# ---------------------------------------------------------------------------
+# Metrics (Prometheus text exposition)
+# ---------------------------------------------------------------------------
+
+def _metrics_authorized(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        header = request.headers.get("Authorization", "")
+        return constant_time_compare(header, f"Bearer {token}")
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@require_GET
+def metrics_view(request):
+    if not _metrics_authorized(request):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    response = HttpResponse(REGISTRY.expose(), content_type=METRICS_CONTENT_TYPE)
+    patch_cache_control(response, no_store=True)
+    return response
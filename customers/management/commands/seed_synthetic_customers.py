@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from customers.ml_service import iter_synthetic_customers, predict_churn_many
+from customers.models import Customer
+from customers.search import invalidate_search_cache
+from dashboard.reservoir import ScatterReservoir
+from dashboard.rollup import RollupDelta, reset_rollup
+from dashboard.scoring import safe_score
+
+_PAYLOAD_FIELDS = (
+    "credit_score",
+    "geography",
+    "gender",
+    "age",
+    "tenure",
+    "balance",
+    "num_of_products",
+    "has_cr_card",
+    "is_active_member",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert N synthetic customers bootstrapped from customers/dataset/Bank_Churn.csv "
+        "(same jitter as the training pool), scored and folded into the dashboard rollup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, required=True, help="Customers to generate.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--replace", action="store_true", help="Delete existing customers first.")
+
+    def handle(self, *args, **options):
+        rows, batch_size = options["rows"], options["batch_size"]
+        if rows <= 0:
+            raise CommandError("--rows must be positive.")
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            if options["replace"]:
+                Customer.objects.all().delete()
+                reset_rollup()
+            next_id = max(Customer.objects.aggregate(top=Max("customer_id"))["top"] or 0, 10_000_000) + 1
+            rollup = RollupDelta()
+            reservoir = ScatterReservoir(fresh=options["replace"])
+            created = 0
+
+            for frame in iter_synthetic_customers(rows, random_state=options["seed"], chunk_size=batch_size):
+                records = frame.to_dict(orient="records")
+                scores = predict_churn_many(records)
+                customers = []
+                for record, score in zip(records, scores):
+                    customer = Customer(
+                        customer_id=next_id,
+                        surname=str(record["surname"]),
+                        churn_risk_score=score,
+                        churn_label=int(record["label"]),
+                        **{field: record[field] for field in _PAYLOAD_FIELDS},
+                    )
+                    # bulk_create skips save(), which keeps the search keys current.
+                    customer.refresh_search_keys()
+                    customers.append(customer)
+                    next_id += 1
+                Customer.objects.bulk_create(customers, batch_size=batch_size)
+                for customer in customers:
+                    score = safe_score(customer)
+                    rollup.add(customer, score)
+                    reservoir.offer(customer, score)
+                created += len(customers)
+                self.stdout.write(f"  {created}/{rows} customers")
+
+            reservoir.save()
+            rollup.apply()
+        invalidate_search_cache()
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded {created} synthetic customers in {time.perf_counter() - start:.1f}s.")
+        )
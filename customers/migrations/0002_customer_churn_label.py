@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+def copy_legacy_labels(apps, schema_editor):
+    # Legacy uploads stored the 0/1 label in churn_risk_score; keep it as a label.
+    Customer = apps.get_model("customers", "Customer")
+    for label in (0, 1):
+        Customer.objects.filter(churn_risk_score=float(label)).update(churn_label=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='churn_label',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_legacy_labels, migrations.RunPython.noop),
+    ]
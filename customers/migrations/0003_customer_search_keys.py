@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+def backfill_search_keys(apps, schema_editor):
+    Customer = apps.get_model("customers", "Customer")
+    batch = []
+    for customer in Customer.objects.only("id", "customer_id", "surname").iterator(chunk_size=2000):
+        customer.customer_id_key = str(customer.customer_id).lower()
+        customer.surname_key = (customer.surname or "").strip().lower()[:100]
+        batch.append(customer)
+        if len(batch) >= 2000:
+            Customer.objects.bulk_update(batch, ["customer_id_key", "surname_key"])
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, ["customer_id_key", "surname_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_customer_churn_label'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='customer_id_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='surname_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=100),
+        ),
+        migrations.RunPython(backfill_search_keys, migrations.RunPython.noop),
+    ]
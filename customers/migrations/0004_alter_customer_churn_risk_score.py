@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0003_customer_search_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='churn_risk_score',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+    ]
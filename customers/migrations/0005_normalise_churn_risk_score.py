@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def normalise_churn_risk_scores(apps, schema_editor):
+    """Store every score on the 0-100 scale so SQL can order by the indexed column."""
+    Customer = apps.get_model("customers", "Customer")
+    Customer.objects.filter(churn_risk_score__gt=0, churn_risk_score__lt=1).update(
+        churn_risk_score=F("churn_risk_score") * 100.0
+    )
+    Customer.objects.filter(churn_risk_score__gt=100).update(churn_risk_score=100.0)
+    Customer.objects.filter(churn_risk_score__lt=0).update(churn_risk_score=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0004_alter_customer_churn_risk_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_churn_risk_scores, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,10 @@
 import logging
+import time
 from pathlib import Path
 
+from core.metrics import Counter, Histogram, observe_cache
+from core.timing import timed
+
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -34,6 +38,41 @@ NUMERIC_COLUMNS = [
 ]
 CATEGORICAL_COLUMNS = ["geography", "gender"]
 
+PREDICTIONS = Counter(
+    "vigilpay_predictions_total",
+    "Churn predictions served, by source (model or fallback heuristic).",
+    ["source"],
+)
+PREDICTION_SECONDS = Histogram(
+    "vigilpay_prediction_seconds",
+    "Time to score one customer, excluding model loading.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+PREDICTION_BATCH_SECONDS = Histogram(
+    "vigilpay_prediction_batch_seconds",
+    "Time per predict_churn_many batch, excluding model loading.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+PREDICTION_BATCH_ROWS = Counter(
+    "vigilpay_prediction_batch_rows_total",
+    "Customers scored through predict_churn_many.",
+)
+MODEL_RELOADS = Counter(
+    "vigilpay_model_reloads_total",
+    "Churn model artifact loads from disk, by result.",
+    ["result"],
+)
+TRAINING_RUNS = Counter(
+    "vigilpay_training_runs_total",
+    "Churn model training runs, by result.",
+    ["result"],
+)
+TRAINING_SECONDS = Histogram(
+    "vigilpay_training_seconds",
+    "Wall time of churn model training runs that fitted a model.",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800),
+)
+
 
 def _to_float(value, default=0.0):
     try:
@@ -82,6 +121,7 @@ def _fallback_predict(payload: dict) -> float:
     return round(max(0.0, min(100.0, score)), 2)
 
 
+@timed("ml_load")
 def _load_model_bundle():
     global _MODEL_CACHE, _MODEL_CACHE_MTIME
     if not MODEL_PATH.exists():
@@ -91,14 +131,18 @@ def _load_model_bundle():
     try:
         current_mtime = MODEL_PATH.stat().st_mtime
         if _MODEL_CACHE is not None and _MODEL_CACHE_MTIME == current_mtime:
+            observe_cache("model", hit=True)
             return _MODEL_CACHE
 
+        observe_cache("model", hit=False)
         import joblib
 
         _MODEL_CACHE = joblib.load(MODEL_PATH)
         _MODEL_CACHE_MTIME = current_mtime
+        MODEL_RELOADS.labels(result="success").inc()
         return _MODEL_CACHE
     except Exception:
+        MODEL_RELOADS.labels(result="error").inc()
         logger.exception("Failed to load churn model artifact: %s", MODEL_PATH)
         return None
 
@@ -202,20 +246,15 @@ def _load_bank_churn_dataframe(dataset_dir: Path):
     return base
 
 
-def _build_expanded_training_pool(df, target_rows: int, random_state: int):
+def _bootstrap_rows(pool, n: int, random_state: int):
+    """Sample n rows from pool with replacement and jitter them within realistic ranges."""
     import numpy as np
-    import pandas as pd
-
-    pool = df.copy()
-    if len(pool) >= target_rows:
-        return pool
 
     rng = np.random.default_rng(random_state)
-    needed = target_rows - len(pool)
 
     # Bootstrap rows and apply small numeric jitter for variability while
     # preserving realistic ranges.
-    boot = pool.sample(n=needed, replace=True, random_state=random_state).reset_index(drop=True)
+    boot = pool.sample(n=n, replace=True, random_state=random_state).reset_index(drop=True)
 
     boot["credit_score"] = (
         boot["credit_score"]
@@ -240,11 +279,31 @@ def _build_expanded_training_pool(df, target_rows: int, random_state: int):
 
     flip_card = rng.uniform(0, 1, size=len(boot)) < 0.05
     boot.loc[flip_card, "has_cr_card"] = 1 - boot.loc[flip_card, "has_cr_card"]
+    return boot
+
+
+def _build_expanded_training_pool(df, target_rows: int, random_state: int):
+    import pandas as pd
 
+    pool = df.copy()
+    if len(pool) >= target_rows:
+        return pool
+
+    boot = _bootstrap_rows(pool, target_rows - len(pool), random_state)
     pool = pd.concat([pool, boot], ignore_index=True)
     return pool
 
 
+def iter_synthetic_customers(rows: int, random_state: int = 42, chunk_size: int = 50_000):
+    """
+    Yield DataFrame chunks of customers bootstrapped from Bank_Churn.csv
+    with the same jitter as the training pool; `rows` in total.
+    """
+    df = _load_bank_churn_dataframe(DATASET_DIR)
+    for index, offset in enumerate(range(0, rows, chunk_size)):
+        yield _bootstrap_rows(df, min(chunk_size, rows - offset), random_state + index)
+
+
 def train_churn_model_from_datasets(min_rows=5000, random_state=42, tune=True):
     df = _load_bank_churn_dataframe(DATASET_DIR)
     expanded = _build_expanded_training_pool(df, target_rows=min_rows, random_state=random_state)
@@ -260,6 +319,19 @@ def train_churn_model_from_datasets(min_rows=5000, random_state=42, tune=True):
 
 
 def train_churn_model(samples: list[dict], labels: list[int], source="upload", random_state=42, tune=True) -> dict:
+    started = time.perf_counter()
+    result = _train_churn_model(samples, labels, source, random_state, tune)
+    if result.get("trained"):
+        TRAINING_RUNS.labels(result="trained").inc()
+        TRAINING_SECONDS.observe(time.perf_counter() - started)
+    elif result.get("reason") == "training error":
+        TRAINING_RUNS.labels(result="error").inc()
+    else:
+        TRAINING_RUNS.labels(result="skipped").inc()
+    return result
+
+
+def _train_churn_model(samples, labels, source, random_state, tune) -> dict:
     if not samples or not labels or len(samples) != len(labels):
         return {"trained": False, "reason": "invalid training payload"}
 
@@ -390,18 +462,43 @@ def get_model_metrics():
 
 def predict_churn(payload: dict) -> float:
     bundle = _load_model_bundle()
-    if bundle and "pipeline" in bundle:
-        try:
-            import pandas as pd
-
-            row = _payload_to_row(payload)
-            X = pd.DataFrame([row], columns=FEATURE_COLUMNS)
-            proba = float(bundle["pipeline"].predict_proba(X)[0][1]) * 100.0
-            return round(max(0.0, min(100.0, proba)), 2)
-        except Exception:
-            logger.warning("Model prediction failed. Falling back to heuristic scoring.")
-
-    return _fallback_predict(payload)
+    with timed("ml_predict"), PREDICTION_SECONDS.time():
+        if bundle and "pipeline" in bundle:
+            try:
+                import pandas as pd
+
+                row = _payload_to_row(payload)
+                X = pd.DataFrame([row], columns=FEATURE_COLUMNS)
+                proba = float(bundle["pipeline"].predict_proba(X)[0][1]) * 100.0
+                PREDICTIONS.labels(source="model").inc()
+                return round(max(0.0, min(100.0, proba)), 2)
+            except Exception:
+                logger.warning("Model prediction failed. Falling back to heuristic scoring.")
+
+        PREDICTIONS.labels(source="fallback").inc()
+        return _fallback_predict(payload)
+
+
+def predict_churn_many(payloads: list[dict]) -> list[float]:
+    """Batch form of predict_churn: one predict_proba call for all payloads."""
+    if not payloads:
+        return []
+    bundle = _load_model_bundle()
+    PREDICTION_BATCH_ROWS.inc(len(payloads))
+    with timed("ml_predict"), PREDICTION_BATCH_SECONDS.time():
+        if bundle and "pipeline" in bundle:
+            try:
+                import pandas as pd
+
+                X = pd.DataFrame([_payload_to_row(payload) for payload in payloads], columns=FEATURE_COLUMNS)
+                probas = bundle["pipeline"].predict_proba(X)[:, 1] * 100.0
+                PREDICTIONS.labels(source="model").inc(len(payloads))
+                return [round(max(0.0, min(100.0, float(proba))), 2) for proba in probas]
+            except Exception:
+                logger.warning("Batch model prediction failed. Falling back to heuristic scoring.")
+
+        PREDICTIONS.labels(source="fallback").inc(len(payloads))
+        return [_fallback_predict(payload) for payload in payloads]
 
 
 def get_primary_churn_driver(payload: dict) -> str:
@@ -13,8 +13,24 @@ class Customer(models.Model):
     num_of_products = models.IntegerField()
     has_cr_card = models.IntegerField()
     is_active_member = models.IntegerField()
-    churn_risk_score = models.FloatField(null=True, blank=True)
+    churn_risk_score = models.FloatField(null=True, blank=True, db_index=True)
+    # Observed outcome (Exited) from labelled uploads; drives live model metrics.
+    churn_label = models.SmallIntegerField(null=True, blank=True)
+    # Lower-cased copies used for indexed prefix search (see customers.search).
+    customer_id_key = models.CharField(max_length=20, blank=True, default="", db_index=True)
+    surname_key = models.CharField(max_length=100, blank=True, default="", db_index=True)
 
     class Meta:
         db_table = "customers_customer"
 
+    def refresh_search_keys(self):
+        self.customer_id_key = str(self.customer_id if self.customer_id is not None else "").lower()
+        self.surname_key = (self.surname or "").strip().lower()[:100]
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_keys()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"customer_id", "surname"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "customer_id_key", "surname_key"}
+        super().save(*args, **kwargs)
+
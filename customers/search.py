@@ -0,0 +1,102 @@
+"""
+Indexed customer search for the dashboard search box.
+
+Customers carry lower-cased copies of customer_id and surname
+(customer_id_key / surname_key, maintained in Customer.save and by the
+0003 migration) so prefix lookups are served from a b-tree index instead
+of a LIKE '%q%' scan. Results are cached per dataset generation for a
+short TTL, which absorbs the burst of near-identical requests a
+debounced search box produces.
+
+invalidate_search_cache() bumps the generation in the default cache,
+which reaches the other workers only if that cache is shared
+(core.caching). With per-process LocMemCache they keep their cached
+results, so the TTLs drop to LOCAL_SEARCH_CACHE_TTL, which bounds how
+stale search can be after an upload or clear.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from core.caching import cache_is_shared
+
+SEARCH_CACHE_TTL = 30
+LOCAL_SEARCH_CACHE_TTL = 5
+SEARCH_RESULT_LIMIT = 8
+
+_GENERATION_KEY = "customers:search:generation"
+_FACET_CACHE_TTL = 600
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").split()).lower()
+
+
+def search_generation() -> int:
+    return cache.get_or_set(_GENERATION_KEY, 1, None)
+
+
+def invalidate_search_cache() -> None:
+    """Call after customers are inserted, rescored or deleted."""
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.set(_GENERATION_KEY, 1, None)
+
+
+def search_cache_ttl() -> int:
+    return SEARCH_CACHE_TTL if cache_is_shared() else LOCAL_SEARCH_CACHE_TTL
+
+
+def search_cache_key(query: str) -> str:
+    digest = hashlib.md5(normalize_query(query).encode("utf-8")).hexdigest()
+    return f"customers:search:{search_generation()}:{digest}"
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    """Prefix predicate on a *_key column that the backend can answer from its index."""
+    if connection.vendor == "sqlite":
+        # SQLite only uses an index for LIKE under NOCASE collation; a
+        # half-open range on the already lower-cased key works with BINARY.
+        return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + "\U0010ffff"})
+    # PostgreSQL answers LIKE 'q%' from the varchar_pattern_ops index Django
+    # creates for db_index CharFields; other backends get a plain LIKE.
+    return Q(**{f"{field}__startswith": prefix})
+
+
+def _facet_values() -> dict:
+    """Distinct geography/gender values, cached per dataset generation."""
+    from customers.models import Customer
+
+    key = f"customers:search:{search_generation()}:facets"
+    facets = cache.get(key)
+    if facets is None:
+        facets = {
+            field: sorted(
+                value for value in Customer.objects.order_by().values_list(field, flat=True).distinct()
+                if value
+            )
+            for field in ("geography", "gender")
+        }
+        cache.set(key, facets, _FACET_CACHE_TTL if cache_is_shared() else LOCAL_SEARCH_CACHE_TTL)
+    return facets
+
+
+def search_customers(query: str, limit: int = SEARCH_RESULT_LIMIT):
+    """
+    Customers whose id or surname starts with the query, plus those whose
+    geography/gender starts with it, ordered by churn risk.
+    """
+    from customers.models import Customer
+
+    prefix = normalize_query(query)
+    condition = prefix_q("customer_id_key", prefix) | prefix_q("surname_key", prefix)
+    for field, values in _facet_values().items():
+        matches = [value for value in values if value.lower().startswith(prefix)]
+        if matches:
+            condition |= Q(**{f"{field}__in": matches})
+
+    return Customer.objects.filter(condition).order_by("-churn_risk_score", "surname")[:limit]
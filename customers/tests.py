@@ -0,0 +1,72 @@
+import io
+from importlib import import_module
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+
+from dashboard.models import DashboardRollup
+
+from . import ml_service
+from .models import Customer
+
+
+class PredictionMetricsTests(TestCase):
+    def test_batch_prediction_is_timed_once_apart_from_single_rows(self):
+        payload = {"credit_score": 600, "age": 40, "balance": 100.0, "num_of_products": 1, "is_active_member": 1}
+        batch, single = ml_service.PREDICTION_BATCH_SECONDS, ml_service.PREDICTION_SECONDS
+        with mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib")), \
+                mock.patch.object(batch, "time", wraps=batch.time) as batch_timed, \
+                mock.patch.object(single, "time", wraps=single.time) as single_timed, \
+                mock.patch.object(ml_service.PREDICTION_BATCH_ROWS, "inc") as rows:
+            self.assertEqual(len(ml_service.predict_churn_many([payload] * 3)), 3)
+            batch_timed.assert_called_once_with()
+            single_timed.assert_not_called()
+            rows.assert_called_once_with(3)
+
+            ml_service.predict_churn(payload)
+        single_timed.assert_called_once_with()
+        batch_timed.assert_called_once_with()
+
+
+class ScoreNormalisationMigrationTests(TestCase):
+    def test_scores_are_moved_onto_the_0_100_scale(self):
+        stored = [0.72, 0.0, 1.0, 55.0, 140.0, -3.0, None]
+        for i, score in enumerate(stored):
+            Customer.objects.create(
+                customer_id=800 + i, surname=f"Scale {i}", credit_score=600, geography="France", gender="Male",
+                age=40, tenure=2, balance=100.0, num_of_products=1, has_cr_card=1, is_active_member=1,
+                churn_risk_score=score,
+            )
+        migration = import_module("customers.migrations.0005_normalise_churn_risk_score")
+        migration.normalise_churn_risk_scores(apps, None)
+
+        scores = list(Customer.objects.order_by("customer_id").values_list("churn_risk_score", flat=True))
+        # Legacy 0/1 labels are left for rescore_customers to replace.
+        self.assertEqual(scores, [72.0, 0.0, 1.0, 55.0, 100.0, 0.0, None])
+
+
+class SyntheticCustomerTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_iter_synthetic_customers_yields_rows_in_chunks(self):
+        frames = list(ml_service.iter_synthetic_customers(25, chunk_size=10))
+        self.assertEqual([len(frame) for frame in frames], [10, 10, 5])
+        self.assertTrue(set(ml_service.FEATURE_COLUMNS) - {"has_active_complaint"} <= set(frames[0].columns))
+
+    def test_seed_inserts_scored_rows_with_search_keys(self):
+        call_command("seed_synthetic_customers", rows=25, batch_size=10, stdout=io.StringIO())
+
+        customers = list(Customer.objects.all())
+        self.assertEqual(len(customers), 25)
+        for customer in customers:
+            self.assertEqual(customer.customer_id_key, str(customer.customer_id))
+            self.assertEqual(customer.surname_key, customer.surname.strip().lower()[:100])
+            self.assertIsNotNone(customer.churn_risk_score)
+        total = DashboardRollup.objects.get(dimension=DashboardRollup.DIMENSION_TOTAL)
+        self.assertEqual(total.customers, 25)
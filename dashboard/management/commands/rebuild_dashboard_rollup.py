@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dashboard rollup table from the full Customer table."
+
+    def handle(self, *args, **options):
+        total = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f"Dashboard rollup rebuilt from {total} customers."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('risk_band', 'Risk band'), ('geography', 'Geography'), ('tenure', 'Tenure')], max_length=16)),
+                ('key', models.CharField(blank=True, default='', max_length=50)),
+                ('customers', models.IntegerField(default=0)),
+                ('high_risk', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('active_members', models.IntegerField(default=0)),
+                ('at_risk_balance', models.FloatField(default=0.0)),
+                ('inactive_low_balance', models.IntegerField(default=0)),
+                ('multi_product_stable', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'dashboard_rollup',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='dashboard_rollup_bucket_unique')],
+            },
+        ),
+    ]
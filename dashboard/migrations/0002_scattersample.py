@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScatterSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('risk_class', models.CharField(choices=[('high', 'High (score >= 50)'), ('low', 'Low (score < 50)')], max_length=8, unique=True)),
+                ('seen', models.BigIntegerField(default=0)),
+                ('points', models.BinaryField(default=b'')),
+            ],
+            options={
+                'db_table': 'dashboard_scatter_sample',
+            },
+        ),
+    ]
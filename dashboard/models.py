@@ -0,0 +1,64 @@
+from django.db import models
+
+
+class DashboardRollup(models.Model):
+    """
+    Pre-aggregated dashboard KPIs, one row per (dimension, key) bucket.
+    Kept current as deltas by dashboard.rollup; rebuild from scratch with
+    `manage.py rebuild_dashboard_rollup`.
+    """
+
+    DIMENSION_TOTAL = "total"
+    DIMENSION_RISK_BAND = "risk_band"
+    DIMENSION_GEOGRAPHY = "geography"
+    DIMENSION_TENURE = "tenure"
+    DIMENSION_CHOICES = [
+        (DIMENSION_TOTAL, "Total"),
+        (DIMENSION_RISK_BAND, "Risk band"),
+        (DIMENSION_GEOGRAPHY, "Geography"),
+        (DIMENSION_TENURE, "Tenure"),
+    ]
+
+    dimension = models.CharField(max_length=16, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=50, blank=True, default="")
+    customers = models.IntegerField(default=0)
+    high_risk = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    active_members = models.IntegerField(default=0)
+    at_risk_balance = models.FloatField(default=0.0)
+    inactive_low_balance = models.IntegerField(default=0)
+    multi_product_stable = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "dashboard_rollup"
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "key"], name="dashboard_rollup_bucket_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key or '-'} ({self.customers})"
+
+
+class ScatterSample(models.Model):
+    """
+    Fixed-size reservoir sample of (age, balance) points for one risk class,
+    packed by dashboard.reservoir. `seen` counts every customer offered to
+    the reservoir so later inserts keep the sample uniform.
+    """
+
+    RISK_HIGH = "high"
+    RISK_LOW = "low"
+    RISK_CHOICES = [
+        (RISK_HIGH, "High (score >= 50)"),
+        (RISK_LOW, "Low (score < 50)"),
+    ]
+
+    risk_class = models.CharField(max_length=8, choices=RISK_CHOICES, unique=True)
+    seen = models.BigIntegerField(default=0)
+    points = models.BinaryField(default=b"")
+
+    class Meta:
+        db_table = "dashboard_scatter_sample"
+
+    def __str__(self):
+        return f"{self.risk_class} sample ({self.seen} seen)"
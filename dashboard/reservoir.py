@@ -0,0 +1,95 @@
+"""
+Per-risk-class reservoir samples backing the dashboard scatter charts.
+
+Each class keeps at most RESERVOIR_SIZE (age, balance) points chosen
+with Algorithm R, so every customer offered so far has the same chance
+of being plotted regardless of insertion order. Points are packed as
+uint16 age + float32 balance (6 bytes each) in ScatterSample.points.
+"""
+
+import random
+import struct
+
+from django.db import transaction
+
+from dashboard.models import ScatterSample
+
+RESERVOIR_SIZE = 300
+
+_POINT = struct.Struct("<Hf")
+_RISK_CLASSES = (ScatterSample.RISK_HIGH, ScatterSample.RISK_LOW)
+
+
+def risk_class(score: float) -> str:
+    return ScatterSample.RISK_HIGH if score >= 50 else ScatterSample.RISK_LOW
+
+
+def pack_points(points: list) -> bytes:
+    return b"".join(_POINT.pack(age, balance) for age, balance in points)
+
+
+def unpack_points(blob) -> list:
+    return [tuple(point) for point in _POINT.iter_unpack(bytes(blob or b""))]
+
+
+class ScatterReservoir:
+    """
+    Loads the stored reservoirs on first use, absorbs offered customers and
+    writes both classes back on save(). Pass fresh=True to start from empty
+    samples, e.g. when re-streaming the whole table.
+    """
+
+    def __init__(self, size: int = RESERVOIR_SIZE, fresh: bool = False, rng=None):
+        self.size = size
+        self._fresh = fresh
+        self._rng = rng or random.Random()
+        self._state = None
+
+    def _load(self) -> dict:
+        if self._state is None:
+            self._state = {cls: {"seen": 0, "points": []} for cls in _RISK_CLASSES}
+            if not self._fresh:
+                samples = ScatterSample.objects.all()
+                if transaction.get_connection().in_atomic_block:
+                    samples = samples.select_for_update()
+                for sample in samples:
+                    self._state[sample.risk_class] = {
+                        "seen": sample.seen,
+                        "points": unpack_points(sample.points),
+                    }
+        return self._state
+
+    def offer(self, customer, score: float) -> None:
+        state = self._load()[risk_class(score)]
+        point = (max(0, min(65535, int(customer.age or 0))), float(customer.balance or 0))
+        state["seen"] += 1
+        if len(state["points"]) < self.size:
+            state["points"].append(point)
+            return
+        slot = self._rng.randrange(state["seen"])
+        if slot < self.size:
+            state["points"][slot] = point
+
+    def save(self) -> None:
+        if self._state is None:
+            return
+        for cls, state in self._state.items():
+            ScatterSample.objects.update_or_create(
+                risk_class=cls,
+                defaults={"seen": state["seen"], "points": pack_points(state["points"])},
+            )
+
+
+def scatter_points(limit: int = RESERVOIR_SIZE) -> dict:
+    """Return {"high": [...], "low": [...]} chart points, at most `limit` per class."""
+    points = {cls: [] for cls in _RISK_CLASSES}
+    for sample in ScatterSample.objects.all():
+        points[sample.risk_class] = [
+            {"x": age, "y": round(balance, 2)}
+            for age, balance in unpack_points(sample.points)[:limit]
+        ]
+    return points
+
+
+def reset_reservoir() -> None:
+    ScatterSample.objects.all().delete()
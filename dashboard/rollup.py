@@ -0,0 +1,156 @@
+"""
+Incremental maintenance of the DashboardRollup table.
+
+Every customer contributes one metrics vector to four buckets: the grand
+total, its risk band, its geography and its tenure year. Write paths
+(upload, rescore, clear) collect +/- contributions in a RollupDelta and
+apply them as F() updates, so the dashboard reads a handful of rows
+instead of scoring the whole Customer table.
+"""
+
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from customers.ml_service import predict_churn_many
+from customers.models import Customer
+from dashboard.models import DashboardRollup
+from dashboard.reservoir import ScatterReservoir, reset_reservoir
+from dashboard.scoring import customer_payload, risk_level, safe_score
+
+METRIC_FIELDS = (
+    "customers",
+    "high_risk",
+    "score_sum",
+    "active_members",
+    "at_risk_balance",
+    "inactive_low_balance",
+    "multi_product_stable",
+)
+TENURE_BUCKETS = 11
+RESCORE_CHUNK_SIZE = 2000
+
+
+def tenure_bucket(tenure) -> str:
+    return str(max(0, min(TENURE_BUCKETS - 1, int(tenure or 0))))
+
+
+def customer_metrics(customer, score: float) -> dict:
+    balance = float(customer.balance or 0)
+    active = int(customer.is_active_member or 0) == 1
+    return {
+        "customers": 1,
+        "high_risk": int(score >= 70),
+        "score_sum": score,
+        "active_members": int(active),
+        "at_risk_balance": balance if score >= 80 else 0.0,
+        "inactive_low_balance": int(not active and balance < 10000),
+        "multi_product_stable": int((customer.num_of_products or 0) >= 2 and score < 40),
+    }
+
+
+def customer_buckets(customer, score: float) -> list:
+    return [
+        (DashboardRollup.DIMENSION_TOTAL, ""),
+        (DashboardRollup.DIMENSION_RISK_BAND, risk_level(score).lower()),
+        (DashboardRollup.DIMENSION_GEOGRAPHY, (customer.geography or "")[:50]),
+        (DashboardRollup.DIMENSION_TENURE, tenure_bucket(customer.tenure)),
+    ]
+
+
+class RollupDelta:
+    """Accumulates per-bucket metric deltas and writes them in one pass."""
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: dict.fromkeys(METRIC_FIELDS, 0))
+
+    def add(self, customer, score: float) -> None:
+        self._merge(customer, score, 1)
+
+    def remove(self, customer, score: float) -> None:
+        self._merge(customer, score, -1)
+
+    def _merge(self, customer, score: float, sign: int) -> None:
+        score = round(float(score), 2)
+        metrics = customer_metrics(customer, score)
+        for bucket in customer_buckets(customer, score):
+            row = self._deltas[bucket]
+            for field, value in metrics.items():
+                row[field] += sign * value
+
+    def apply(self) -> None:
+        if not DashboardRollup.objects.filter(dimension=DashboardRollup.DIMENSION_TOTAL).exists():
+            # Never built (or just cleared): deltas have no baseline to apply to.
+            self._deltas.clear()
+            rebuild_rollup()
+            return
+        self._write()
+
+    def _write(self) -> None:
+        with transaction.atomic():
+            for (dimension, key), values in self._deltas.items():
+                changes = {field: F(field) + value for field, value in values.items() if value}
+                if not changes:
+                    continue
+                bucket = DashboardRollup.objects.filter(dimension=dimension, key=key)
+                if not bucket.update(**changes):
+                    DashboardRollup.objects.get_or_create(dimension=dimension, key=key)
+                    bucket.update(**changes)
+        self._deltas.clear()
+
+
+def rebuild_rollup() -> int:
+    """
+    Recompute every bucket and the scatter reservoirs from the Customer
+    table in a single pass. Returns the row count.
+    """
+    delta = RollupDelta()
+    reservoir = ScatterReservoir(fresh=True)
+    total = 0
+    # Read the primary even inside a replica view: a lagging copy would be persisted.
+    for customer in Customer.objects.using(DEFAULT_DB_ALIAS).iterator(chunk_size=2000):
+        score = safe_score(customer)
+        delta.add(customer, score)
+        reservoir.offer(customer, score)
+        total += 1
+    with transaction.atomic():
+        DashboardRollup.objects.all().delete()
+        delta._write()
+        reservoir.save()
+    return total
+
+
+def rescore_all_customers() -> dict:
+    """
+    Re-predict every stored score with the current model, in pk-ordered
+    batches, then rebuild the rollup from the new scores. Runs in one
+    transaction so readers never see scores and rollup out of step.
+    Returns the customer count per risk level.
+    """
+    counts = dict.fromkeys(("High", "Medium", "Low"), 0)
+    customers = Customer.objects.using(DEFAULT_DB_ALIAS).order_by("pk")
+    with transaction.atomic():
+        last_pk = 0
+        while chunk := list(customers.filter(pk__gt=last_pk)[:RESCORE_CHUNK_SIZE]):
+            scores = predict_churn_many([customer_payload(customer) for customer in chunk])
+            for customer, score in zip(chunk, scores):
+                customer.churn_risk_score = round(score, 2)
+                counts[risk_level(score)] += 1
+            Customer.objects.bulk_update(chunk, ["churn_risk_score"])
+            last_pk = chunk[-1].pk
+        rebuild_rollup()
+    return counts
+
+
+def reset_rollup() -> None:
+    DashboardRollup.objects.all().delete()
+    reset_reservoir()
+
+
+def read_rollup() -> dict:
+    """Return {dimension: {key: DashboardRollup}} for buckets that still hold customers."""
+    buckets = defaultdict(dict)
+    for row in DashboardRollup.objects.filter(customers__gt=0):
+        buckets[row.dimension][row.key] = row
+    return buckets
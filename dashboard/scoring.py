@@ -0,0 +1,85 @@
+"""
+Churn score helpers shared by the dashboard views, the rollup table and
+the customer management commands.
+
+`safe_score` is the per-row definition of a customer's 0-100 score;
+`scored_customers` is its SQL counterpart for rows whose stored score can
+be used as-is, so aggregates and per-row code always agree. Stored scores
+are written on the 0-100 scale (migration customers 0005 converted old
+0-1 probabilities), so SQL can filter and order on the indexed column.
+"""
+
+import logging
+
+from django.db.models import F, Q
+
+from customers.ml_service import predict_churn
+from customers.models import Customer
+
+logger = logging.getLogger(__name__)
+
+# Legacy uploads stored the 0/1 label in churn_risk_score instead of a probability.
+LEGACY_LABEL_SCORES = (0.0, 1.0)
+
+
+def risk_level(score: float) -> str:
+    if score >= 70:
+        return "High"
+    if score >= 40:
+        return "Medium"
+    return "Low"
+
+
+def customer_payload(customer) -> dict:
+    return {
+        "credit_score": customer.credit_score,
+        "geography": customer.geography,
+        "gender": customer.gender,
+        "age": customer.age,
+        "tenure": customer.tenure,
+        "balance": float(customer.balance or 0),
+        "num_of_products": customer.num_of_products,
+        "has_cr_card": customer.has_cr_card,
+        "is_active_member": customer.is_active_member,
+    }
+
+
+def safe_score(customer) -> float:
+    """
+    Return a 0-100 churn score. Uses the saved score if available,
+    falls back to the ML model, then falls back to 0.0.
+    Avoids calling predict_churn when we already have a stored value.
+    """
+    saved = customer.churn_risk_score
+    payload = customer_payload(customer)
+    if saved is not None:
+        try:
+            value = float(saved)
+            # Legacy uploads sometimes stored labels (0/1) instead of probabilities.
+            if value in LEGACY_LABEL_SCORES:
+                return float(predict_churn(payload))
+            return max(0.0, min(100.0, value))
+        except (TypeError, ValueError):
+            pass
+    try:
+        return float(predict_churn(payload))
+    except Exception:
+        logger.warning("predict_churn failed for customer %s.", getattr(customer, "customer_id", "?"))
+        return 0.0
+
+
+def scored_customers():
+    """Customers whose stored score can be aggregated as-is, annotated with `score`."""
+    return (
+        Customer.objects
+        .exclude(churn_risk_score__isnull=True)
+        .exclude(churn_risk_score__in=LEGACY_LABEL_SCORES)
+        .annotate(score=F("churn_risk_score"))
+    )
+
+
+def unscored_customers():
+    """Customers that still need a model call before they can be aggregated."""
+    return Customer.objects.filter(
+        Q(churn_risk_score__isnull=True) | Q(churn_risk_score__in=LEGACY_LABEL_SCORES)
+    )
@@ -0,0 +1,163 @@
+import csv
+import io
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.models import User
+from core.testing import shared_cache
+from customers import ml_service
+from customers.models import Customer
+from customers.search import LOCAL_SEARCH_CACHE_TTL, SEARCH_CACHE_TTL
+
+from .models import DashboardRollup
+from .rollup import rebuild_rollup
+from .scoring import customer_payload
+
+
+class RiskLevelExportTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Stored 0-100 scores, a rounding edge, a legacy label and no score.
+        scores = [85.0, 55.0, 15.0, 72.0, 69.996, 1.0, None]
+        for i, score in enumerate(scores):
+            Customer.objects.create(
+                customer_id=500 + i, surname=f"Smith {i}" if i % 2 else f"Jones {i}",
+                credit_score=520 + 40 * i, geography="Spain" if i % 3 else "France", gender="Male", age=25 + 5 * i,
+                tenure=i, balance=1500.0 * i, num_of_products=1 + i % 2, has_cr_card=1, is_active_member=i % 2,
+                churn_risk_score=score,
+            )
+        self.client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+
+    def _export(self, query: str) -> list[dict]:
+        response = self.client.get(reverse("risk_level_export") + query)
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(body)))
+
+    def test_export_matches_page_filters(self):
+        for query in ("", "?risk_level=high", "?risk_level=medium", "?risk_level=low", "?geography=Spain",
+                      "?is_active=0", "?q=smith", "?q=50", "?risk_level=high&geography=Spain&is_active=1"):
+            with self.subTest(query):
+                page = self.client.get(reverse("risk_level_page") + query).context
+                expected = {(str(c["customer_id"]), c["score"]) for c in page["customers"]}
+                rows = self._export(query)
+                self.assertEqual({(r["CustomerId"], float(r["ChurnScore"])) for r in rows}, expected)
+                self.assertEqual(len(rows), page["total_customers"])
+
+    def test_stored_scores_stream_highest_first(self):
+        rows = self._export("")
+        self.assertEqual([r["CustomerId"] for r in rows[:4]], ["500", "503", "504", "501"])
+        self.assertEqual(rows[1]["RiskLevel"], "High")
+
+    def test_dashboard_top_customers_rank_stored_scores_without_the_model(self):
+        with mock.patch("dashboard.views.predict_churn_many") as predict:
+            top = self.client.get(reverse("dashboard_page")).context["top_customers"]
+        predict.assert_not_called()
+        # The legacy label (505) and the unscored row (506) wait for rescore_customers.
+        self.assertEqual([c["customer_id"] for c in top], [500, 503, 504, 501, 502])
+        self.assertEqual([c["score"] for c in top], [85.0, 72.0, 70.0, 55.0, 15.0])
+
+
+class RescoreTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for i, score in enumerate([85.0, 0.72, 1.0, None, 12.5]):
+            Customer.objects.create(
+                customer_id=700 + i, surname=f"Rescore {i}", credit_score=480 + 60 * i, geography="Germany",
+                gender="Female", age=30 + 7 * i, tenure=i, balance=2500.0 * i, num_of_products=1 + i % 2,
+                has_cr_card=1, is_active_member=i % 2, churn_risk_score=score,
+            )
+        rebuild_rollup()
+
+    def _rollup(self):
+        fields = ("customers", "high_risk", "score_sum", "at_risk_balance", "multi_product_stable")
+        rows = DashboardRollup.objects.filter(customers__gt=0)
+        return {(row.dimension, row.key): {field: getattr(row, field) for field in fields} for row in rows}
+
+    def test_rescore_saves_model_scores_and_matches_a_fresh_rollup(self):
+        call_command("rescore_customers", stdout=io.StringIO())
+
+        customers = list(Customer.objects.order_by("pk"))
+        expected = ml_service.predict_churn_many([customer_payload(c) for c in customers])
+        self.assertEqual([c.churn_risk_score for c in customers], expected)
+        rescored = self._rollup()
+        rebuild_rollup()
+        self.assertEqual(rescored, self._rollup())
+        self.assertEqual(rescored[(DashboardRollup.DIMENSION_TOTAL, "")]["customers"], 5)
+
+
+class ModelInsightTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # (geography, stored score, churn label); the Germany row still needs the model.
+        rows = [("France", 85.0, 1), ("France", 75.0, 0), ("France", 30.0, 1),
+                ("Spain", 20.0, 0), ("Spain", 60.0, None), ("Germany", None, 1)]
+        for i, (geography, score, label) in enumerate(rows):
+            Customer.objects.create(
+                customer_id=600 + i, surname=f"Insight {i}", credit_score=600, geography=geography, gender="Male",
+                age=40, tenure=3, balance=1000.0, num_of_products=1, has_cr_card=1, is_active_member=1,
+                churn_risk_score=score, churn_label=label,
+            )
+        self.client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+
+    def test_regions_and_confusion_matrix_combine_sql_and_model_scores(self):
+        with mock.patch("dashboard.views.predict_churn_many", side_effect=lambda payloads: [90.0] * len(payloads)) \
+                as predict:
+            context = self.client.get(reverse("model_insight_page")).context
+        predict.assert_called_once()
+
+        self.assertEqual(
+            [(r["name"], r["high_count"], r["pct"]) for r in context["region_data"]],
+            [("France", 2, 66.7), ("Germany", 1, 33.3)],
+        )
+        # tp=2 (85, model 90), tn=1 (20), fp=1 (75), fn=1 (30); the unlabelled row is skipped.
+        self.assertEqual(context["labeled_count"], 5)
+        self.assertEqual((context["accuracy"], context["precision"], context["recall"]), (60.0, 66.7, 66.7))
+
+    def test_empty_scatter_renders_without_rebuilding_the_rollup(self):
+        context = self.client.get(reverse("model_insight_page")).context
+        self.assertEqual(context["insight_data"]["scatter"], {"high": [], "retained": []})
+        self.assertFalse(DashboardRollup.objects.exists())
+
+
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        Customer.objects.create(
+            customer_id=700, surname="Smith", credit_score=600, geography="Spain", gender="Male", age=40,
+            tenure=3, balance=100.0, num_of_products=1, has_cr_card=1, is_active_member=1, churn_risk_score=40.0,
+        )
+        self.client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+
+    def _max_age(self) -> str:
+        cache.clear()
+        response = self.client.get(reverse("dashboard_search") + "?q=smith")
+        self.assertEqual(response.json()["count"], 1)
+        return response["Cache-Control"]
+
+    def test_process_local_cache_uses_the_short_ttl(self):
+        self.assertIn(f"max-age={LOCAL_SEARCH_CACHE_TTL}", self._max_age())
+        with shared_cache():
+            self.assertIn(f"max-age={SEARCH_CACHE_TTL}", self._max_age())
+
+
+class ChartETagTests(TestCase):
+    def test_chart_etag_revalidates_through_gzip(self):
+        web = Client()
+        web.force_login(User.objects.create_user(username="member", password=None))
+        url = reverse("dashboard_chart", args=["bar"])
+        with mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib")):
+            etag = web.get(url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+            self.assertEqual(web.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(web.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(web.get(url, HTTP_IF_MATCH='"bar-stale"').status_code, 412)
@@ -1,13 +1,15 @@
 from django.urls import path
 
-from data_manager.views import UploadDataView
+from data_manager.views import UploadDataView, export_training_data
 from dashboard.views import (
     clear_dataset,
+    dashboard_chart,
     dashboard_page,
     dashboard_search,
     data_management_page,
     engagement_hub_page,
     model_insight_page,
+    risk_level_export,
     risk_level_page,
     settings_page,
 )
@@ -16,12 +18,15 @@ urlpatterns = [
     path("",                        dashboard_page,         name="dashboard_page"),
     path("engagement-hub/",         engagement_hub_page,    name="engagement_hub_page"),
     path("risk-level/",             risk_level_page,        name="risk_level_page"),
+    path("risk-level/export/",      risk_level_export,      name="risk_level_export"),
     path("data-management/",        data_management_page,   name="data_management_page"),
     path("data-management/upload/", UploadDataView.as_view(), name="data_management_upload"),
+    path("data-management/export/", export_training_data,   name="training_data_export"),
     path("model-insight/",          model_insight_page,     name="model_insight_page"),
     path("profile/",                settings_page,          name="profile_page"),
     path("settings/",               settings_page,          name="settings_page"),
     path("search/",                 dashboard_search,       name="dashboard_search"),
+    path("charts/<slug:chart>/",    dashboard_chart,        name="dashboard_chart"),
     path("clear-dataset/",          clear_dataset,          name="clear_dataset"),
 ]
 
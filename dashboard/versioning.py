@@ -0,0 +1,36 @@
+"""
+Data version for conditional GETs on dashboard JSON endpoints.
+
+The version fingerprints every input the dashboard charts are derived
+from: the latest upload, the model artifact, and the rollup/reservoir
+state that upload, rescore and clear rewrite. It costs a few reads of
+tiny tables, so a 304 skips the payload build and the transfer.
+"""
+
+import hashlib
+
+from customers import ml_service
+from dashboard.models import DashboardRollup, ScatterSample
+from data_manager.models import UploadHistory
+
+
+def data_version() -> str:
+    try:
+        model_mtime = ml_service.MODEL_PATH.stat().st_mtime
+    except OSError:
+        model_mtime = None
+
+    parts = [
+        UploadHistory.objects.order_by("-pk").values_list("pk", flat=True).first(),
+        model_mtime,
+        list(
+            DashboardRollup.objects.filter(dimension=DashboardRollup.DIMENSION_TOTAL)
+            .values_list("customers", "high_risk", "score_sum", "at_risk_balance")
+        ),
+    ]
+    for risk_class, seen, points in ScatterSample.objects.order_by("risk_class").values_list(
+        "risk_class", "seen", "points"
+    ):
+        parts.append((risk_class, seen, hashlib.md5(bytes(points)).hexdigest()))
+
+    return hashlib.md5(repr(parts).encode("utf-8")).hexdigest()[:16]
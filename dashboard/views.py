@@ -4,77 +4,62 @@ from functools import wraps
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import CharField, Q
-from django.db.models.functions import Cast
-from django.http import HttpResponseRedirect, JsonResponse
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Round
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
 
+from core.caching import cache_is_shared
+from core.metrics import Histogram, observe_cache
 from core.models import User
+from core.profiling import PROFILE_BUFFER_SIZE, PROFILE_QUERY_PARAM, get_report, recent_reports
+from core.replica import read_from_replica
 from customers.ml_service import (
     get_feature_importance,
     get_model_metrics,
     get_primary_churn_driver,
-    predict_churn,
+    predict_churn_many,
 )
 from customers.models import Customer
+from customers.search import invalidate_search_cache, search_cache_key, search_cache_ttl, search_customers
+from dashboard.models import DashboardRollup
+from dashboard.reservoir import scatter_points
+from dashboard.rollup import TENURE_BUCKETS, read_rollup, rebuild_rollup, reset_rollup
+from dashboard.scoring import (
+    customer_payload,
+    risk_level,
+    safe_score,
+    scored_customers,
+    unscored_customers,
+)
+from dashboard.versioning import data_version
+from data_manager.exports import EXPORT_CHUNK_SIZE, CsvStream
 from data_manager.models import UploadHistory
 
 logger = logging.getLogger(__name__)
 
+_DASHBOARD_SCATTER_CAP = 250
+_INSIGHT_SCATTER_CAP = 300
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-def _risk_level(score: float) -> str:
-    if score >= 70:
-        return "High"
-    if score >= 40:
-        return "Medium"
-    return "Low"
-
+DASHBOARD_VIEW_SECONDS = Histogram(
+    "vigilpay_dashboard_view_seconds",
+    "Time spent in dashboard views, by view.",
+    ["view"],
+)
 
-def _to_payload(customer) -> dict:
-    return {
-        "credit_score": customer.credit_score,
-        "geography": customer.geography,
-        "gender": customer.gender,
-        "age": customer.age,
-        "tenure": customer.tenure,
-        "balance": float(customer.balance or 0),
-        "num_of_products": customer.num_of_products,
-        "has_cr_card": customer.has_cr_card,
-        "is_active_member": customer.is_active_member,
-    }
 
+def _observed(view_name):
+    return DASHBOARD_VIEW_SECONDS.labels(view=view_name).time()
 
-def _safe_score(customer) -> float:
-    """
-    Return a 0-100 churn score. Uses the saved score if available,
-    falls back to the ML model, then falls back to 0.0.
-    Avoids calling predict_churn when we already have a stored value.
-    """
-    saved = customer.churn_risk_score
-    payload = _to_payload(customer)
-    if saved is not None:
-        try:
-            value = float(saved)
-            # Legacy uploads sometimes stored labels (0/1) instead of probabilities.
-            if value in (0.0, 1.0):
-                return float(predict_churn(payload))
-            # Normalise true probability range 0-1 to 0-100.
-            if 0.0 < value < 1.0:
-                value *= 100
-            return max(0.0, min(100.0, value))
-        except (TypeError, ValueError):
-            pass
-    try:
-        return float(predict_churn(payload))
-    except Exception:
-        logger.warning("predict_churn failed for customer %s.", getattr(customer, "customer_id", "?"))
-        return 0.0
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
 
 def _initials(name: str) -> str:
     parts = [p for p in (name or "").strip().split() if p]
@@ -111,7 +96,7 @@ def _score_all_customers(customers: list) -> list:
     """
     scored = []
     for customer in customers:
-        score = round(_safe_score(customer), 2)
+        score = round(safe_score(customer), 2)
         scored.append({
             "customer_id": customer.customer_id,
             "surname": customer.surname,
@@ -124,16 +109,25 @@ def _score_all_customers(customers: list) -> list:
             "num_of_products": customer.num_of_products,
             "is_active_member": int(customer.is_active_member or 0),
             "score": score,
-            "risk_level": _risk_level(score),
-            "risk_class": _risk_level(score).lower(),
+            "risk_level": risk_level(score),
+            "risk_class": risk_level(score).lower(),
             "driver": _safe_driver(customer),
         })
     return scored
 
 
+def _top_customers(limit: int = 5) -> list:
+    """
+    The highest-risk customers, read through the churn_risk_score index.
+    Rows still waiting for a model score are picked up once
+    rescore_customers (or a retraining upload) has scored them.
+    """
+    return _score_all_customers(list(scored_customers().order_by("-churn_risk_score", "pk")[:limit]))
+
+
 def _safe_driver(customer) -> str:
     try:
-        return get_primary_churn_driver(_to_payload(customer))
+        return get_primary_churn_driver(customer_payload(customer))
     except Exception:
         return "Unavailable"
 
@@ -184,12 +178,7 @@ def _safe_dashboard_context() -> dict:
         "inactive_low_balance": 0,
         "multi_product_stable": 0,
         "feature_importance": [],
-        "dashboard_data": {
-            "bar": {"labels": ["Low Risk", "Medium Risk", "High Risk"], "values": [0, 0, 0]},
-            "donut": {"labels": [], "values": []},
-            "scatter": {"high": [], "low": []},
-            "line": {"labels": [f"{i}Y" for i in range(11)], "values": [0] * 11},
-        },
+        "chart_urls": {},
     }
 
 
@@ -218,54 +207,78 @@ def no_500_dashboard(view_func):
 # Dashboard
 # ---------------------------------------------------------------------------
 
+def _dashboard_rollup() -> dict:
+    """Read the rollup, building it first if customers exist but it never was."""
+    rollup = read_rollup()
+    if not rollup and Customer.objects.exists():
+        rebuild_rollup()
+        rollup = read_rollup()
+    return rollup
+
+
+def _chart_bar(rollup) -> dict:
+    bands = rollup.get(DashboardRollup.DIMENSION_RISK_BAND, {})
+    values = [bands[band].customers if band in bands else 0 for band in ("low", "medium", "high")]
+    return {"labels": ["Low Risk", "Medium Risk", "High Risk"], "values": values}
+
+
+def _chart_donut(rollup) -> dict:
+    sorted_geo = sorted(
+        ((key, row.customers) for key, row in rollup.get(DashboardRollup.DIMENSION_GEOGRAPHY, {}).items()),
+        key=lambda x: x[1],
+        reverse=True,
+    )
+    return {"labels": [g[0] for g in sorted_geo[:6]], "values": [g[1] for g in sorted_geo[:6]]}
+
+
+def _chart_scatter(rollup) -> dict:
+    scatter = scatter_points(_DASHBOARD_SCATTER_CAP)
+    return {"high": scatter["high"], "low": scatter["low"]}
+
+
+def _chart_line(rollup) -> dict:
+    tenure = rollup.get(DashboardRollup.DIMENSION_TENURE, {})
+    values = [
+        round(tenure[str(i)].score_sum / tenure[str(i)].customers, 2) if str(i) in tenure else 0
+        for i in range(TENURE_BUCKETS)
+    ]
+    return {"labels": [f"{i}Y" for i in range(TENURE_BUCKETS)], "values": values}
+
+
+_DASHBOARD_CHARTS = {
+    "bar": _chart_bar,
+    "donut": _chart_donut,
+    "scatter": _chart_scatter,
+    "line": _chart_line,
+}
+
+
 @login_required(login_url="login_page")
+@read_from_replica
 @no_500_dashboard
+@_observed("dashboard")
 def dashboard_page(request):
     try:
-        customers = list(Customer.objects.all())
+        rollup = _dashboard_rollup()
     except Exception:
-        logger.exception("Failed to load customers from database.")
+        logger.exception("Failed to load dashboard rollup from database.")
         messages.error(request, "Customer dataset is unavailable. Upload a dataset to continue.")
-        customers = []
+        rollup = {}
 
-    # Score all customers in one pass â€” avoids repeated ML calls per page
-    scored = _score_all_customers(customers)
-    scored.sort(key=lambda c: c["score"], reverse=True)
+    totals = rollup.get(DashboardRollup.DIMENSION_TOTAL, {}).get("") or DashboardRollup()
+    high_band = rollup.get(DashboardRollup.DIMENSION_RISK_BAND, {}).get("high")
 
-    total = len(scored)
-    high   = sum(1 for c in scored if c["score"] >= 70)
-    medium = sum(1 for c in scored if 40 <= c["score"] < 70)
-    low    = total - high - medium
+    total = totals.customers
+    high  = high_band.customers if high_band else 0
 
-    avg_score      = round(sum(c["score"] for c in scored) / total, 2) if total else 0.0
+    avg_score      = round(totals.score_sum / total, 2) if total else 0.0
     churn_rate     = round((high / total) * 100, 2) if total else 0.0
-    at_risk_balance = sum(c["balance"] for c in scored if c["score"] >= 80)
-    active_members = sum(1 for c in scored if c["is_active_member"] == 1)
-
-    # Geography breakdown
-    geo_count = {}
-    for c in scored:
-        geo_count[c["geography"]] = geo_count.get(c["geography"], 0) + 1
-    sorted_geo = sorted(geo_count.items(), key=lambda x: x[1], reverse=True)
-    geo_labels = [g[0] for g in sorted_geo[:6]]
-    geo_values = [g[1] for g in sorted_geo[:6]]
-
-    # Tenure risk trend
-    tenure_sum   = {str(i): 0.0 for i in range(11)}
-    tenure_count = {str(i): 0   for i in range(11)}
-    for customer, row in zip(customers, scored):
-        key = str(max(0, min(10, int(customer.tenure or 0))))
-        tenure_sum[key]   += row["score"]
-        tenure_count[key] += 1
-
-    tenure_values = [
-        round(tenure_sum[str(i)] / tenure_count[str(i)], 2) if tenure_count[str(i)] else 0
-        for i in range(11)
-    ]
+    at_risk_balance = totals.at_risk_balance
+    active_members = totals.active_members
+
+    geo = _chart_donut(rollup)
 
-    # Scatter data (capped for performance)
-    high_points = [{"x": c["age"], "y": c["balance"]} for c in scored if c["score"] >= 50][:250]
-    low_points  = [{"x": c["age"], "y": c["balance"]} for c in scored if c["score"] < 50][:250]
+    top_customers = _top_customers()
 
     try:
         feature_importance = get_feature_importance()
@@ -283,38 +296,124 @@ def dashboard_page(request):
         "active_members": active_members,
         "active_members_compact": _compact_number(active_members),
         "avg_score": avg_score,
-        "top_customers": scored[:5],
-        "highest_geo": geo_labels[0] if geo_labels else "N/A",
-        "highest_geo_count": geo_values[0] if geo_values else 0,
-        "inactive_low_balance": sum(1 for c in scored if c["is_active_member"] == 0 and c["balance"] < 10000),
-        "multi_product_stable": sum(1 for c in scored if c["num_of_products"] >= 2 and c["score"] < 40),
+        "top_customers": top_customers,
+        "highest_geo": geo["labels"][0] if geo["labels"] else "N/A",
+        "highest_geo_count": geo["values"][0] if geo["values"] else 0,
+        "inactive_low_balance": totals.inactive_low_balance,
+        "multi_product_stable": totals.multi_product_stable,
         "feature_importance": feature_importance,
-        "dashboard_data": {
-            "bar":    {"labels": ["Low Risk", "Medium Risk", "High Risk"], "values": [low, medium, high]},
-            "donut":  {"labels": geo_labels, "values": geo_values},
-            "scatter": {"high": high_points, "low": low_points},
-            "line":   {"labels": [f"{i}Y" for i in range(11)], "values": tenure_values},
-        },
+        # Charts are fetched in parallel after the shell renders.
+        "chart_urls": {name: reverse("dashboard_chart", args=[name]) for name in _DASHBOARD_CHARTS},
     }
     return render(request, "core/dashboard.html", context)
 
 
+def _chart_etag(request, chart):
+    return f'"{chart}-{data_version()}"'
+
+
+@login_required(login_url="login_page")
+@read_from_replica
+@condition(etag_func=_chart_etag)
+@_observed("chart")
+def dashboard_chart(request, chart):
+    """JSON payload for one dashboard chart; answers If-None-Match with 304."""
+    builder = _DASHBOARD_CHARTS.get(chart)
+    if builder is None:
+        raise Http404("Unknown chart.")
+    response = JsonResponse(builder(_dashboard_rollup()))
+    # Always revalidate, so a new upload or rescore shows up immediately.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Risk Level
 # ---------------------------------------------------------------------------
 
+_RISK_SCORE_RANGES = {"high": (70, None), "medium": (40, 70), "low": (None, 40)}
+
+_RISK_EXPORT_HEADER = [
+    "CustomerId", "Surname", "Geography", "Gender", "Age", "CreditScore", "Balance",
+    "NumOfProducts", "IsActiveMember", "ChurnScore", "RiskLevel", "TopChurnDriver",
+]
+
+
+def _risk_filters(request) -> tuple:
+    return (
+        request.GET.get("risk_level", "").strip().lower(),
+        request.GET.get("geography", "").strip(),
+        request.GET.get("is_active", "").strip(),
+        request.GET.get("q", "").strip().lower(),
+    )
+
+
+def _filter_customers(queryset, selected_geo, selected_active, query):
+    """SQL form of the risk page's geography, activity and text filters."""
+    if selected_geo:
+        queryset = queryset.filter(geography=selected_geo)
+    if selected_active in {"0", "1"}:
+        queryset = queryset.filter(is_active_member=int(selected_active))
+    if query:
+        queryset = queryset.filter(Q(customer_id_key__contains=query) | Q(surname_key__contains=query))
+    return queryset
+
+
+def _risk_export_row(customer, score: float) -> list:
+    return [
+        customer.customer_id, customer.surname, customer.geography, customer.gender,
+        int(customer.age or 0), customer.credit_score, float(customer.balance or 0),
+        customer.num_of_products, int(customer.is_active_member or 0),
+        score, risk_level(score), _safe_driver(customer),
+    ]
+
+
+def _risk_export_rows(selected_risk, selected_geo, selected_active, query):
+    """
+    Rows matching the risk page's filters, read in chunks. Stored scores
+    are filtered and ordered in SQL, highest first. Customers that still
+    need a model call come last, scored one chunk at a time.
+    """
+    low, high = _RISK_SCORE_RANGES.get(selected_risk, (None, None))
+    scored = _filter_customers(scored_customers(), selected_geo, selected_active, query).annotate(
+        rounded=Round("score", 2)
+    )
+    if low is not None:
+        scored = scored.filter(rounded__gte=low)
+    if high is not None:
+        scored = scored.filter(rounded__lt=high)
+    for customer in scored.order_by("-rounded", "pk").iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield _risk_export_row(customer, float(customer.rounded))
+
+    pending = _filter_customers(unscored_customers(), selected_geo, selected_active, query)
+    for customer, score in _model_scores(pending):
+        score = round(score, 2)
+        if not selected_risk or risk_level(score).lower() == selected_risk:
+            yield _risk_export_row(customer, score)
+
+
+def _model_scores(queryset):
+    """Yield (customer, score) in pk order, one predict_churn_many call per chunk."""
+    chunk = []
+    for customer in queryset.order_by("pk").iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk.append(customer)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield from zip(chunk, predict_churn_many([customer_payload(c) for c in chunk]))
+            chunk = []
+    if chunk:
+        yield from zip(chunk, predict_churn_many([customer_payload(c) for c in chunk]))
+
+
 @login_required(login_url="login_page")
+@read_from_replica
+@_observed("risk_level")
 def risk_level_page(request):
     customers = list(Customer.objects.all())
 
     # Score once upfront â€” no per-row ML calls inside the filter loop
     scored = _score_all_customers(customers)
 
-    # Filters
-    selected_risk   = request.GET.get("risk_level", "").strip().lower()
-    selected_geo    = request.GET.get("geography", "").strip()
-    selected_active = request.GET.get("is_active", "").strip()
-    query           = request.GET.get("q", "").strip().lower()
+    selected_risk, selected_geo, selected_active, query = _risk_filters(request)
 
     rows = [
         c for c in scored
@@ -353,11 +452,24 @@ def risk_level_page(request):
     return render(request, "dashboard/risk_level.html", context)
 
 
+@login_required(login_url="login_page")
+@read_from_replica
+@_observed("risk_level_export")
+def risk_level_export(request):
+    """Stream every customer matching the risk page's filters as CSV."""
+    stream = CsvStream("risk_level", _RISK_EXPORT_HEADER, _risk_export_rows(*_risk_filters(request)))
+    response = StreamingHttpResponse(stream, content_type="text/csv; charset=utf-8")
+    filename = f"vigilpay_risk_register_{timezone.now():%Y%m%d_%H%M}.csv"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Data Management
 # ---------------------------------------------------------------------------
 
 @login_required(login_url="login_page")
+@_observed("data_management")
 def data_management_page(request):
     upload_history = (
         UploadHistory.objects.select_related("uploaded_by")
@@ -370,6 +482,7 @@ def data_management_page(request):
 
 
 @login_required(login_url="login_page")
+@_observed("clear_dataset")
 def clear_dataset(request):
     if request.method != "POST":
         messages.error(request, "Invalid request.")
@@ -384,6 +497,8 @@ def clear_dataset(request):
 
     UploadHistory.objects.all().delete()
     Customer.objects.all().delete()
+    reset_rollup()
+    invalidate_search_cache()
 
     messages.success(
         request,
@@ -397,38 +512,55 @@ def clear_dataset(request):
 # ---------------------------------------------------------------------------
 
 @login_required(login_url="login_page")
+@read_from_replica
+@_observed("model_insights")
 def model_insight_page(request):
-    customers = list(Customer.objects.all())
     latest_upload = UploadHistory.objects.filter(processed=True).order_by("-uploaded_at").first()
 
-    has_data = len(customers) > 0 and latest_upload is not None
+    has_data = latest_upload is not None and Customer.objects.exists()
 
-    scored = []
-    high_points, low_points = [], []
+    scored = scored_customers()
     region_totals, region_high = {}, {}
-    truth_pairs = []
+    confusion = {"tp": 0, "tn": 0, "fp": 0, "fn": 0}
 
-    for customer in customers:
-        score = round(_safe_score(customer), 2)
-        geo = customer.geography or "Unknown"
+    regions = (
+        scored.values("geography")
+        .annotate(total=Count("id"), high=Count("id", filter=Q(score__gte=70)))
+        .order_by()
+    )
+    for row in regions:
+        geo = row["geography"] or "Unknown"
+        region_totals[geo] = region_totals.get(geo, 0) + row["total"]
+        if row["high"]:
+            region_high[geo] = region_high.get(geo, 0) + row["high"]
+
+    labeled = scored.filter(churn_label__isnull=False).aggregate(
+        tp=Count("id", filter=Q(churn_label=1, score__gte=50)),
+        tn=Count("id", filter=Q(churn_label=0, score__lt=50)),
+        fp=Count("id", filter=Q(churn_label=0, score__gte=50)),
+        fn=Count("id", filter=Q(churn_label=1, score__lt=50)),
+    )
+    for key, value in labeled.items():
+        confusion[key] += value or 0
 
-        scored.append({"score": score, "geography": geo})
+    # Filled by uploads, rescore_customers and rebuild_dashboard_rollup;
+    # an empty sample renders as an empty chart rather than a rebuild here.
+    scatter = scatter_points(_INSIGHT_SCATTER_CAP)
 
-        point = {"x": int(customer.age or 0), "y": round(float(customer.balance or 0), 2)}
-        (high_points if score >= 50 else low_points).append(point)
+    # Rows without a usable stored score (not yet rescored, or legacy 0/1
+    # labels) are the only ones that still go through the model.
+    for customer, score in _model_scores(unscored_customers()):
+        score = round(score, 2)
+        geo = customer.geography or "Unknown"
 
         region_totals[geo] = region_totals.get(geo, 0) + 1
         if score >= 70:
             region_high[geo] = region_high.get(geo, 0) + 1
 
-        raw = customer.churn_risk_score
-        if raw is not None:
-            try:
-                raw_float = float(raw)
-                if raw_float in (0.0, 1.0):
-                    truth_pairs.append((int(raw_float), 1 if score >= 50 else 0))
-            except (TypeError, ValueError):
-                pass
+        if customer.churn_label in (0, 1):
+            predicted = 1 if score >= 50 else 0
+            key = ("tp" if predicted else "fn") if customer.churn_label == 1 else ("fp" if predicted else "tn")
+            confusion[key] += 1
 
     # Feature importance
     feature_rows = []
@@ -464,17 +596,14 @@ def model_insight_page(request):
     accuracy = precision = recall = None
     metrics_available = False
     labeled_count = 0
-    if truth_pairs:
-        tp = sum(1 for y, p in truth_pairs if y == 1 and p == 1)
-        tn = sum(1 for y, p in truth_pairs if y == 0 and p == 0)
-        fp = sum(1 for y, p in truth_pairs if y == 0 and p == 1)
-        fn = sum(1 for y, p in truth_pairs if y == 1 and p == 0)
-        total = len(truth_pairs)
-        accuracy  = round(((tp + tn) / total) * 100, 1) if total else 0.0
+    tp, tn, fp, fn = confusion["tp"], confusion["tn"], confusion["fp"], confusion["fn"]
+    total = tp + tn + fp + fn
+    if total:
+        accuracy  = round(((tp + tn) / total) * 100, 1)
         precision = round((tp / (tp + fp)) * 100, 1) if (tp + fp) else 0.0
         recall    = round((tp / (tp + fn)) * 100, 1) if (tp + fn) else 0.0
         metrics_available = True
-        labeled_count = len(truth_pairs)
+        labeled_count = total
     else:
         persisted = get_model_metrics() or {}
         if persisted:
@@ -497,7 +626,7 @@ def model_insight_page(request):
         ),
         "insight_data": {
             "donut":   {"labels": [r["name"] for r in region_data[:6]], "values": [r["pct"] for r in region_data[:6]]},
-            "scatter": {"high": high_points[:300], "retained": low_points[:300]},
+            "scatter": {"high": scatter["high"], "retained": scatter["low"]},
         },
     }
     return render(request, "dashboard/model_insights.html", context)
@@ -508,15 +637,32 @@ def model_insight_page(request):
 # ---------------------------------------------------------------------------
 
 @login_required(login_url="login_page")
+@_observed("settings")
 def settings_page(request):
     can_view_all = request.user.is_staff
     members = User.objects.all().order_by("-created_at") if can_view_all else User.objects.filter(pk=request.user.pk)
-    return render(request, "dashboard/settings.html", {
+    context = {
         "members": members,
         "member_count": members.count(),
         "can_manage_dataset": request.user.is_staff,
         "can_view_all_users": can_view_all,
-    })
+    }
+    if request.user.is_staff:
+        profile_sort = request.GET.get("sort", "cumtime_ms")
+        selected = None
+        try:
+            selected = get_report(int(request.GET.get("profile", "")), profile_sort)
+        except ValueError:
+            pass
+        context.update({
+            "profile_reports": recent_reports(),
+            "profile_report": selected,
+            "profile_sort": profile_sort,
+            "profile_param": PROFILE_QUERY_PARAM,
+            "profile_buffer_size": PROFILE_BUFFER_SIZE,
+            "profile_buffer_shared": cache_is_shared(),
+        })
+    return render(request, "dashboard/settings.html", context)
 
 
 
@@ -525,6 +671,8 @@ def settings_page(request):
 # ---------------------------------------------------------------------------
 
 @login_required(login_url="login_page")
+@read_from_replica
+@_observed("engagement_hub")
 def engagement_hub_page(request):
     """
     Central engagement hub for stakeholders.
@@ -567,40 +715,38 @@ def engagement_hub_page(request):
 # ---------------------------------------------------------------------------
 
 @login_required(login_url="login_page")
+@read_from_replica
+@_observed("search")
 def dashboard_search(request):
     query = request.GET.get("q", "").strip()
 
     if len(query) < 2:
         return JsonResponse({"query": query, "count": 0, "results": []})
 
-    customers = (
-        Customer.objects
-        .annotate(customer_id_str=Cast("customer_id", CharField()))
-        .filter(
-            Q(customer_id_str__icontains=query)
-            | Q(surname__icontains=query)
-            | Q(geography__icontains=query)
-            | Q(gender__icontains=query)
-        )
-        .order_by("-churn_risk_score", "surname")[:8]
-    )
-
-    risk_level_url = reverse("risk_level_page")
-    results = []
-    for customer in customers:
-        score = round(_safe_score(customer), 2)
-        results.append({
-            "customer_id": customer.customer_id,
-            "surname": customer.surname,
-            "geography": customer.geography,
-            "gender": customer.gender,
-            "risk_score": score,
-            "risk_level": _risk_level(score),
-            "driver": _safe_driver(customer),
-            "risk_url": risk_level_url,
-        })
+    cache_key = search_cache_key(query)
+    results = cache.get(cache_key)
+    observe_cache("search", hit=results is not None)
+    if results is None:
+        risk_level_url = reverse("risk_level_page")
+        results = []
+        for customer in search_customers(query):
+            score = round(safe_score(customer), 2)
+            results.append({
+                "customer_id": customer.customer_id,
+                "surname": customer.surname,
+                "geography": customer.geography,
+                "gender": customer.gender,
+                "risk_score": score,
+                "risk_level": risk_level(score),
+                "driver": _safe_driver(customer),
+                "risk_url": risk_level_url,
+            })
+        cache.set(cache_key, results, search_cache_ttl())
+
+    response = JsonResponse({"query": query, "count": len(results), "results": results})
+    patch_cache_control(response, private=True, max_age=search_cache_ttl())
+    return response
 
-    return JsonResponse({"query": query, "count": len(results), "results": results})
 
 
 
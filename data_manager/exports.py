@@ -0,0 +1,98 @@
+"""
+Streaming CSV exports of the Customer table.
+
+Rows are read with QuerySet.iterator(chunk_size), which uses a
+server-side cursor on PostgreSQL. They are encoded one block of
+EXPORT_CHUNK_SIZE rows at a time, optionally gzip-compressed, so memory
+stays flat however many customers match and nothing is staged on disk.
+"""
+
+import csv
+import io
+import logging
+import zlib
+
+from core.metrics import Counter
+from customers.models import Customer
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Same headers as an upload, so an export can be uploaded again to retrain.
+TRAINING_EXPORT_COLUMNS = {
+    "CustomerId": "customer_id",
+    "Surname": "surname",
+    "CreditScore": "credit_score",
+    "Geography": "geography",
+    "Gender": "gender",
+    "Age": "age",
+    "Tenure": "tenure",
+    "Balance": "balance",
+    "NumOfProducts": "num_of_products",
+    "HasCrCard": "has_cr_card",
+    "IsActiveMember": "is_active_member",
+    "Exited": "churn_label",
+}
+
+EXPORT_ROWS = Counter("vigilpay_export_rows_total", "Rows written by streaming CSV exports.", ["export"])
+
+
+class CsvStream:
+    """
+    Iterable of CSV byte blocks: the header, then one block per chunk_size
+    rows. `rows` counts the data rows written so far; it is final once
+    iteration ends.
+    """
+
+    def __init__(self, name: str, header, rows, chunk_size=EXPORT_CHUNK_SIZE, compress=False):
+        self.name = name
+        self.rows = 0
+        self._header = header
+        self._source = rows
+        self._chunk_size = chunk_size
+        self._compress = compress
+
+    def __iter__(self):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self._compress else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self._header)
+        # The header goes out before the first query, so the download starts at once.
+        yield self._drain(buffer, compressor, flush=True)
+        for row in self._source:
+            writer.writerow(row)
+            self.rows += 1
+            if self.rows % self._chunk_size == 0:
+                block = self._drain(buffer, compressor)
+                if block:
+                    yield block
+        block = self._drain(buffer, compressor)
+        if compressor is not None:
+            block += compressor.flush()
+        if block:
+            yield block
+        EXPORT_ROWS.labels(export=self.name).inc(self.rows)
+        logger.info("Export %s streamed %d rows.", self.name, self.rows)
+
+    @staticmethod
+    def _drain(buffer, compressor, flush=False) -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        block = compressor.compress(data)
+        return block + compressor.flush(zlib.Z_SYNC_FLUSH) if flush else block
+
+
+def training_data_stream(queryset=None, compress=True) -> CsvStream:
+    """Customer features and churn labels in the upload CSV format."""
+    fields = list(TRAINING_EXPORT_COLUMNS.values())
+    queryset = Customer.objects.order_by("pk") if queryset is None else queryset
+    rows = (
+        ["" if value is None else value for value in row]
+        for row in queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return CsvStream("training_data", list(TRAINING_EXPORT_COLUMNS), rows, compress=compress)
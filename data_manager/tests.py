@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.models import User
+from core.testing import upload_csv
+from customers import ml_service
+from customers.models import Customer
+from dashboard.models import DashboardRollup
+from dashboard.reservoir import ScatterReservoir
+from dashboard.rollup import rebuild_rollup
+from dashboard.scoring import customer_payload
+
+from .exports import CsvStream
+
+
+class TrainingDataExportTests(TestCase):
+    def test_stream_is_chunked_gzip_and_counts_rows(self):
+        stream = CsvStream("test", ["n"], ([i] for i in range(5)), chunk_size=2, compress=True)
+        blocks = list(stream)
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual(gzip.decompress(b"".join(blocks)).decode(), "n\r\n0\r\n1\r\n2\r\n3\r\n4\r\n")
+        self.assertEqual(stream.rows, 5)
+
+    def test_export_round_trips_the_upload_format(self):
+        Customer.objects.create(
+            customer_id=7, surname="Smith", credit_score=640, geography="Spain", gender="Female", age=40,
+            tenure=2, balance=10.5, num_of_products=1, has_cr_card=1, is_active_member=0, churn_label=None,
+        )
+        staff = User.objects.create_user(username="staff", password=None, is_staff=True)
+        client = Client()
+        self.assertEqual(client.get(reverse("training_data_export")).status_code, 302)
+        client.force_login(User.objects.create_user(username="member", password=None))
+        self.assertEqual(client.get(reverse("training_data_export")).status_code, 403)
+        client.force_login(staff)
+        response = client.get(reverse("training_data_export"))
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        body = gzip.decompress(b"".join(response.streaming_content)).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["CustomerId"], rows[0]["Geography"], rows[0]["Exited"]), ("7", "Spain", ""))
+
+
+class UploadReservoirTests(TestCase):
+    def test_reservoir_is_loaded_and_saved_in_one_transaction(self):
+        depths = {}
+
+        def spy(name):
+            method = getattr(ScatterReservoir, name)
+
+            def wrapped(reservoir, *args):
+                depths.setdefault(name, len(connections["default"].savepoint_ids))
+                return method(reservoir, *args)
+
+            return mock.patch.object(ScatterReservoir, name, wrapped)
+
+        client = Client()
+        client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+        with spy("_load"), spy("save"), mock.patch.object(
+            ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib")
+        ):
+            response = client.post(reverse("data_management_upload"), {
+                "file": SimpleUploadedFile("upload.csv", upload_csv(2), content_type="text/csv"),
+            })
+        self.assertEqual(response.status_code, 200)
+        # _load takes select_for_update only when already inside the save's atomic block.
+        self.assertEqual(depths["_load"], depths["save"])
+
+    def test_retraining_upload_rescores_existing_customers(self):
+        existing = Customer.objects.create(
+            customer_id=41, surname="Stale", credit_score=450, geography="Germany", gender="Male", age=58,
+            tenure=1, balance=0.0, num_of_products=1, has_cr_card=0, is_active_member=0, churn_risk_score=3.0,
+        )
+        rebuild_rollup()
+        lines = upload_csv(3).decode().splitlines()
+        labelled = "\n".join([lines[0] + ",Exited"] + [f"{line},{i % 2}" for i, line in enumerate(lines[1:])])
+
+        client = Client()
+        client.force_login(User.objects.create_user(username="staff", password=None, is_staff=True))
+        with mock.patch.object(ml_service, "MODEL_PATH", Path("/nonexistent/churn_model.joblib")), \
+                mock.patch("data_manager.views.train_churn_model", return_value={"trained": True}):
+            response = client.post(reverse("data_management_upload"), {
+                "file": SimpleUploadedFile("upload.csv", labelled.encode(), content_type="text/csv"),
+            })
+            expected = ml_service.predict_churn_many([customer_payload(existing)])[0]
+        self.assertEqual(response.status_code, 200)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.churn_risk_score, expected)
+        total = DashboardRollup.objects.get(dimension=DashboardRollup.DIMENSION_TOTAL)
+        rebuild_rollup()
+        rebuilt = DashboardRollup.objects.get(dimension=DashboardRollup.DIMENSION_TOTAL)
+        self.assertEqual((total.customers, total.score_sum), (4, rebuilt.score_sum))
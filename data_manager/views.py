@@ -1,14 +1,23 @@
 import csv
+import time
 from io import StringIO
 
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views import View
 
-from customers.ml_service import predict_churn, train_churn_model
+from core.metrics import Counter, Histogram
+from core.replica import read_from_replica
+from customers.ml_service import predict_churn_many, train_churn_model
 from customers.models import Customer
+from customers.search import invalidate_search_cache
+from dashboard.reservoir import ScatterReservoir
+from dashboard.rollup import RollupDelta, rescore_all_customers
+from dashboard.scoring import safe_score
+from data_manager.exports import training_data_stream
 from data_manager.models import UploadHistory
 
 MAX_UPLOAD_SIZE_BYTES = 10 * 1024 * 1024
@@ -28,6 +37,19 @@ REQUIRED_COLUMN_ALIASES = {
     "IsActiveMember": ("isactivemember", "is_active_member"),
 }
 OPTIONAL_AUTOFILL_COLUMNS = {"CustomerId", "Surname"}
+UPLOAD_INSERT_BATCH_SIZE = 1000
+
+UPLOAD_ROWS = Counter("vigilpay_upload_rows_total", "Customer rows ingested from CSV uploads.")
+UPLOAD_SECONDS = Histogram(
+    "vigilpay_upload_seconds",
+    "Wall time of accepted CSV uploads, including training and scoring.",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+UPLOAD_ROWS_PER_SECOND = Histogram(
+    "vigilpay_upload_rows_per_second",
+    "Ingestion throughput of each accepted CSV upload.",
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
 
 
 def _pick(row, *keys, default=None):
@@ -92,7 +114,7 @@ def _validate_row(row, idx):
 @method_decorator(login_required(login_url="login_page"), name="dispatch")
 class UploadDataView(View):
     def post(self, request, *args, **kwargs):
-        
+        started = time.perf_counter()
         uploaded = request.FILES.get("file")
         if not uploaded:
             return JsonResponse({"error": "No file uploaded."}, status=400)
@@ -159,49 +181,68 @@ class UploadDataView(View):
                 "is_active_member": _to_int(_pick(row, "IsActiveMember", "is_active_member"), 1),
                 "has_active_complaint": 0,
             }
-            prepared_rows.append((idx, row, payload))
 
-            label_raw = _pick(row, "Exited", "exited", "churn_risk_score")
-            if label_raw is None:
-                continue
-            label = _to_int(label_raw, -1)
+            label = _to_int(_pick(row, "Exited", "exited", "churn_risk_score"), -1)
             if label in (0, 1):
                 training_samples.append(payload)
                 training_labels.append(label)
+            else:
+                label = None
+            prepared_rows.append((idx, row, payload, label))
 
         model_result = {"trained": False, "reason": "no labels found in upload"}
         if training_labels:
             model_result = train_churn_model(training_samples, training_labels)
 
-        created = 0
+        rollup = RollupDelta()
+        reservoir = ScatterReservoir()
         existing_customer_ids = set(Customer.objects.values_list('customer_id', flat=True))
+        predicted_scores = predict_churn_many([payload for _, _, payload, _ in prepared_rows])
+        customers = []
+        for (idx, row, payload, label), predicted_score in zip(prepared_rows, predicted_scores):
+            customer_id = _to_int(_pick(row, "CustomerId", "customer_id", "customerid"), idx)
+            # Generate a unique customer_id if it already exists
+            original_customer_id = customer_id
+            counter = 1
+            while customer_id in existing_customer_ids:
+                customer_id = f"{original_customer_id}_{counter}"
+                counter += 1
+            existing_customer_ids.add(customer_id)
+
+            customer = Customer(
+                customer_id=customer_id,
+                surname=str(_pick(row, "Surname", "surname", default=f"Customer {idx}")),
+                credit_score=payload["credit_score"],
+                geography=payload["geography"],
+                gender=payload["gender"],
+                age=payload["age"],
+                tenure=payload["tenure"],
+                balance=payload["balance"],
+                num_of_products=payload["num_of_products"],
+                has_cr_card=payload["has_cr_card"],
+                is_active_member=payload["is_active_member"],
+                churn_risk_score=predicted_score,
+                churn_label=label,
+            )
+            # bulk_create skips save(), which keeps the search keys current.
+            customer.refresh_search_keys()
+            customers.append(customer)
+        created = len(customers)
+
         with transaction.atomic():
-            for idx, row, payload in prepared_rows:
-                customer_id = _to_int(_pick(row, "CustomerId", "customer_id", "customerid"), idx)
-                # Generate a unique customer_id if it already exists
-                original_customer_id = customer_id
-                counter = 1
-                while customer_id in existing_customer_ids:
-                    customer_id = f"{original_customer_id}_{counter}"
-                    counter += 1
-                existing_customer_ids.add(customer_id)
-                
-                predicted_score = predict_churn(payload)
-                Customer.objects.create(
-                    customer_id=customer_id,
-                    surname=str(_pick(row, "Surname", "surname", default=f"Customer {idx}")),
-                    credit_score=payload["credit_score"],
-                    geography=payload["geography"],
-                    gender=payload["gender"],
-                    age=payload["age"],
-                    tenure=payload["tenure"],
-                    balance=payload["balance"],
-                    num_of_products=payload["num_of_products"],
-                    has_cr_card=payload["has_cr_card"],
-                    is_active_member=payload["is_active_member"],
-                    churn_risk_score=predicted_score,
-                )
-                created += 1
+            Customer.objects.bulk_create(customers, batch_size=UPLOAD_INSERT_BATCH_SIZE)
+            if model_result.get("trained"):
+                # A new model invalidates every stored score and rollup contribution.
+                rescore_all_customers()
+            else:
+                # The first offer() loads the reservoir with select_for_update,
+                # so it must run inside the block that saves it.
+                for customer in customers:
+                    score = safe_score(customer)
+                    rollup.add(customer, score)
+                    reservoir.offer(customer, score)
+                reservoir.save()
+                rollup.apply()
 
             UploadHistory.objects.create(
                 file_name=uploaded.name,
@@ -209,6 +250,13 @@ class UploadDataView(View):
                 row_count=created,
                 uploaded_by=request.user,
             )
+        invalidate_search_cache()
+
+        elapsed = time.perf_counter() - started
+        UPLOAD_ROWS.inc(created)
+        UPLOAD_SECONDS.observe(elapsed)
+        if elapsed > 0:
+            UPLOAD_ROWS_PER_SECOND.observe(created / elapsed)
 
         return JsonResponse(
             {
@@ -217,3 +265,15 @@ class UploadDataView(View):
             },
             status=200,
         )
+
+
+@login_required(login_url="login_page")
+@read_from_replica
+def export_training_data(request):
+    """Stream every customer's features and churn label as a gzipped CSV."""
+    if not request.user.is_staff:
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    response = StreamingHttpResponse(training_data_stream(), content_type="application/gzip")
+    filename = f"vigilpay_training_data_{timezone.now():%Y%m%d_%H%M}.csv.gz"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -244,31 +244,22 @@
   const RED = '#8C1515';
   const GOLD = '#C9A84C';
 
-  let dashboardData = null;
-  const dataNode = document.getElementById('dashboard-data');
-  if (dataNode) {
+  let chartUrls = {};
+  const urlsNode = document.getElementById('dashboard-chart-urls');
+  if (urlsNode) {
     try {
-      dashboardData = JSON.parse(dataNode.textContent);
+      chartUrls = JSON.parse(urlsNode.textContent) || {};
     } catch (_e) {
-      dashboardData = null;
+      chartUrls = {};
     }
   }
 
-  const barLabels = dashboardData?.bar?.labels || ['Low Risk', 'Medium Risk', 'High Risk'];
-  const barValues = dashboardData?.bar?.values || [0, 0, 0];
-  const donutLabels = dashboardData?.donut?.labels || [];
-  const donutValues = dashboardData?.donut?.values || [];
-  const scatterHigh = dashboardData?.scatter?.high || [];
-  const scatterLow = dashboardData?.scatter?.low || [];
-  const lineLabels = dashboardData?.line?.labels || [];
-  const lineValues = dashboardData?.line?.values || [];
-
-  new Chart(document.getElementById('chartBar'), {
+  const barChart = new Chart(document.getElementById('chartBar'), {
     type: 'bar',
     data: {
-      labels: barLabels,
+      labels: ['Low Risk', 'Medium Risk', 'High Risk'],
       datasets: [{
-        data: barValues,
+        data: [0, 0, 0],
         backgroundColor: ['rgba(5,150,105,0.15)', 'rgba(201,168,76,0.25)', 'rgba(140,21,21,0.2)'],
         borderColor: ['#059669', GOLD, RED],
         borderWidth: 2, borderRadius: 8, borderSkipped: false,
@@ -284,12 +275,12 @@
     }
   });
 
-  new Chart(document.getElementById('chartDonut'), {
+  const donutChart = new Chart(document.getElementById('chartDonut'), {
     type: 'doughnut',
     data: {
-      labels: donutLabels,
+      labels: [],
       datasets: [{
-        data: donutValues,
+        data: [],
         backgroundColor: [RED, GOLD, '#374151', '#0f766e', '#7c3aed', '#2563eb'],
         borderColor: '#fff', borderWidth: 3, hoverOffset: 6,
       }]
@@ -303,11 +294,11 @@
     }
   });
 
-  new Chart(document.getElementById('chartScatter'), {
+  const scatterChart = new Chart(document.getElementById('chartScatter'), {
     type: 'scatter',
     data: { datasets: [
-      { label: 'Higher Risk', data: scatterHigh, backgroundColor: 'rgba(140,21,21,0.55)', pointRadius: 4, pointHoverRadius: 6 },
-      { label: 'Lower Risk', data: scatterLow, backgroundColor: 'rgba(196,187,176,0.5)', pointRadius: 3, pointHoverRadius: 5 }
+      { label: 'Higher Risk', data: [], backgroundColor: 'rgba(140,21,21,0.55)', pointRadius: 4, pointHoverRadius: 6 },
+      { label: 'Lower Risk', data: [], backgroundColor: 'rgba(196,187,176,0.5)', pointRadius: 3, pointHoverRadius: 5 }
     ]},
     options: {
       responsive: true, maintainAspectRatio: false,
@@ -319,12 +310,12 @@
     }
   });
 
-  new Chart(document.getElementById('chartLine'), {
+  const lineChart = new Chart(document.getElementById('chartLine'), {
     type: 'line',
     data: {
-      labels: lineLabels,
+      labels: [],
       datasets: [{
-        data: lineValues,
+        data: [],
         borderColor: RED, backgroundColor: 'rgba(140,21,21,0.07)',
         fill: true, tension: 0.42,
         pointBackgroundColor: RED, pointBorderColor: '#fff',
@@ -341,6 +332,40 @@
     }
   });
 
+  // Each chart is fetched on its own; the server answers 304 while the
+  // dataset is unchanged, so revisits reuse the browser's cached payload.
+  const applyChart = {
+    bar: data => {
+      barChart.data.labels = data.labels || [];
+      barChart.data.datasets[0].data = data.values || [];
+    },
+    donut: data => {
+      donutChart.data.labels = data.labels || [];
+      donutChart.data.datasets[0].data = data.values || [];
+    },
+    scatter: data => {
+      scatterChart.data.datasets[0].data = data.high || [];
+      scatterChart.data.datasets[1].data = data.low || [];
+    },
+    line: data => {
+      lineChart.data.labels = data.labels || [];
+      lineChart.data.datasets[0].data = data.values || [];
+    },
+  };
+  const charts = { bar: barChart, donut: donutChart, scatter: scatterChart, line: lineChart };
+
+  Object.entries(chartUrls).forEach(([name, url]) => {
+    if (!applyChart[name]) return;
+    fetch(url, { credentials: 'same-origin', headers: { Accept: 'application/json' } })
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => {
+        if (!data) return;
+        applyChart[name](data);
+        charts[name].update();
+      })
+      .catch(() => {});
+  });
+
 const io = new IntersectionObserver(entries => {
   entries.forEach(e => {
     if (e.isIntersecting) {